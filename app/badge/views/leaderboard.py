@@ -1,4 +1,4 @@
-from django.db.models import Count, Q
+from django.db.models import Count, Prefetch, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins
 from rest_framework.viewsets import GenericViewSet
@@ -40,14 +40,15 @@ class LeaderboardViewSet(mixins.ListModelMixin, GenericViewSet):
             )
 
         return (
-            User.objects.annotate(number_of_badges=number_of_badges)
+            User.objects.with_profile()
+            .annotate(number_of_badges=number_of_badges)
             .filter(number_of_badges__gt=0)
             .order_by("-number_of_badges", "first_name")
         )
 
 
 class LeaderboardForBadgeViewSet(mixins.ListModelMixin, GenericViewSet):
-    queryset = UserBadge.objects.select_related("user").order_by("created_at")
+    queryset = UserBadge.objects.order_by("created_at")
     serializer_class = LeaderboardForBadgeSerializer
     permission_classes = [IsMember]
     pagination_class = BasePagination
@@ -60,4 +61,6 @@ class LeaderboardForBadgeViewSet(mixins.ListModelMixin, GenericViewSet):
     ]
 
     def get_queryset(self):
-        return self.queryset.filter(badge__id=self.kwargs["id"])
+        return self.queryset.filter(badge__id=self.kwargs["id"]).prefetch_related(
+            Prefetch("user", queryset=User.objects.with_profile())
+        )
@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+# How long a token and user snapshot is kept in the shared cache. Also bounds how long
+# a snapshot can hold an old group type, as saving a group does not invalidate it.
+AUTH_CACHE_TIMEOUT = 60
+# How long a process keeps its own copy, which signals in other processes can't invalidate
+LOCAL_AUTH_CACHE_TIMEOUT = 5
+LOCAL_AUTH_CACHE_SIZE = 1024
+
+# Left out of the snapshot, and loaded from the database if it is accessed
+DEFERRED_USER_FIELDS = ("password",)
+
+
+class LocalLRUCache:
+    """A thread-safe LRU cache in the memory of the process, where entries expire"""
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_auth_cache = LocalLRUCache(LOCAL_AUTH_CACHE_SIZE, LOCAL_AUTH_CACHE_TIMEOUT)
+
+
+def get_token_key(token):
+    return f"auth:token:{token}"
+
+
+def get_user_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def _get(key):
+    value = local_auth_cache.get(key)
+    if value is None:
+        value = cache.get(key)
+        if value is not None:
+            local_auth_cache.set(key, value)
+    return value
+
+
+def _set(key, value):
+    cache.set(key, value, AUTH_CACHE_TIMEOUT)
+    local_auth_cache.set(key, value)
+
+
+def _delete(key):
+    cache.delete(key)
+    local_auth_cache.delete(key)
+
+
+def create_user_snapshot(user):
+    """
+    Returns the field values of the user and the (group slug, membership type,
+    group type) of each of the memberships of the user
+    """
+    return {
+        "user": {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname not in DEFERRED_USER_FIELDS
+        },
+        "memberships": list(
+            user.memberships.values_list("group_id", "membership_type", "group__type")
+        ),
+    }
+
+
+def get_user_snapshot(token):
+    """
+    Returns the snapshot of the user who owns the token, or None if the token
+    does not exist. The database is only queried when the token is not cached.
+    """
+    user_id = _get(get_token_key(token))
+    snapshot = _get(get_user_key(user_id)) if user_id else None
+    if snapshot is not None:
+        return snapshot
+
+    token_instance = Token.objects.select_related("user").filter(key=token).first()
+    if token_instance is None:
+        return None
+
+    snapshot = create_user_snapshot(token_instance.user)
+    _set(get_token_key(token), token_instance.user_id)
+    _set(get_user_key(token_instance.user_id), snapshot)
+    return snapshot
+
+
+def get_user_from_snapshot(snapshot):
+    """Returns a new user instance, as if it was fetched from the database"""
+    from django.contrib.auth import get_user_model
+
+    values = snapshot["user"]
+    return get_user_model().from_db(
+        DEFAULT_DB_ALIAS, list(values.keys()), list(values.values())
+    )
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **_kwargs):
+    _delete(get_token_key(instance.key))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_changed_user(sender, instance, **_kwargs):
+    _delete(get_user_key(instance.pk))
+
+
+@receiver(post_save, sender="group.Membership")
+@receiver(post_delete, sender="group.Membership")
+def invalidate_changed_membership(sender, instance, **_kwargs):
+    _delete(get_user_key(instance.user_id))
@@ -56,6 +56,10 @@ class LoggingMethodMixin:
             if isinstance(instance, list) or isinstance(instance, QuerySet)
             else [instance]
         )
+        if not self.request.user:
+            return
+
+        log_entries = []
         for instance in instances:
             message = f'{action_message} {force_str(instance._meta.verbose_name)}: "{force_str(instance)}".'
 
@@ -64,15 +68,18 @@ class LoggingMethodMixin:
                 changes = self._changed_fields(instance, validated_data)
                 message += changes if len(changes) else "No changes"
 
-            if self.request.user:
-                LogEntry.objects.log_action(
+            log_entries.append(
+                LogEntry(
                     user_id=self.request.user.user_id,
                     content_type_id=ContentType.objects.get_for_model(instance).pk,
-                    object_id=instance.pk,
-                    object_repr=str(instance),
+                    object_id=str(instance.pk),
+                    object_repr=str(instance)[:200],
                     action_flag=operation,
                     change_message=message,
                 )
+            )
+        # Logs all the instances of a bulk operation in one query
+        LogEntry.objects.bulk_create(log_entries)
 
     def _log_on_create(self, serializer):
         """Log the up-to-date serializer.data."""
@@ -1,14 +1,96 @@
 from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
+from app.util.utils import CaseInsensitiveBooleanQueryParam
+
+
+def get_cursor_ordering(view):
+    """
+    Returns the ordering the view is paginated by with a cursor,
+    or None if the view, or its current action, does not support it.
+    """
+    if hasattr(view, "get_cursor_ordering"):
+        return view.get_cursor_ordering()
+    return getattr(view, "cursor_ordering", None)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginates on the position of the last row of the page instead of an OFFSET,
+    and does not count the rows unless ?count=true is given. next and previous
+    are cursors, which are passed back as ?cursor=.
+
+    The ordering is read from cursor_ordering, or get_cursor_ordering(), on the view.
+    Only the first field is used for the position, and rows which share its value
+    are skipped with an offset, which rows added while paging can shift. The first
+    field must therefore be unique, like a primary key, or only repeat in short
+    runs, like a timestamp. A name is not.
+    """
+
+    page_size = 25
+    ordering = ("-created_at",)
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if CaseInsensitiveBooleanQueryParam(
+            request.query_params.get(self.count_query_param)
+        ).value:
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = get_cursor_ordering(view) or self.ordering
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+    def encode_cursor(self, cursor):
+        url = super().encode_cursor(cursor)
+        return parse_qs(urlparse(url).query)[self.cursor_query_param][0]
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
 
 class BasePagination(PageNumberPagination):
+    """
+    Page number pagination. Views with a cursor_ordering can instead be paginated
+    with KeysetPagination by passing ?cursor= or ?pagination=cursor.
+    """
+
     page_size = 25
     page_size_query_param = "None"
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request, view):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def use_keyset(self, request, view):
+        if not get_cursor_ordering(view):
+            return False
+        return (
+            KeysetPagination.cursor_query_param in request.query_params
+            or request.query_params.get("pagination") == "cursor"
+        )
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+
         return Response(
             OrderedDict(
                 [
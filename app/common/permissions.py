@@ -1,11 +1,12 @@
 from django.db import models
-from rest_framework.authtoken.models import Token
 from rest_framework.permissions import BasePermission
 
-from dry_rest_permissions.generics import DRYPermissions
-from sentry_sdk import capture_exception
+from dry_rest_permissions.generics import DRYPermissions, DRYPermissionsField
 
+from app.common.auth_cache import get_user_from_snapshot, get_user_snapshot
 from app.common.enums import AdminGroup
+from app.common.enums import NativeGroupType as GroupType
+from app.common.enums import NativeMembershipType as MembershipType
 
 
 class BasePermissionModel(models.Model):
@@ -43,42 +44,143 @@ class BasicViewPermission(DRYPermissions):
         return super().has_object_permission(request, view, obj)
 
 
-def check_has_access(groups_with_access, request):
+class GroupAccess:
+    """
+    The group memberships of the user of a request, loaded once per request,
+    which answer the access checks of the request in memory
+    """
+
+    def __init__(self, user_id, memberships):
+        """
+        user_id -> The user the memberships belong to\n
+        memberships -> (group slug, membership type, group type) of each membership
+        """
+        self.user_id = user_id
+        self.memberships = {
+            slug.lower(): (membership_type, group_type)
+            for slug, membership_type, group_type in memberships
+        }
+
+    def _get_membership(self, group):
+        return self.memberships.get(str(getattr(group, "pk", group)).lower())
+
+    def has_access(self, groups):
+        """Checks if the user is a member of any of the groups"""
+        return any(self._get_membership(group) for group in groups)
+
+    def has_full_access(self, groups):
+        """Checks if the user is a member of all the groups"""
+        return all(self._get_membership(group) for group in groups)
+
+    def is_member(self, group):
+        return self._get_membership(group) is not None
+
+    def is_leader(self, group):
+        membership = self._get_membership(group)
+        return membership is not None and membership[0] == MembershipType.LEADER
+
+    def is_leader_of_any(self):
+        return any(
+            membership_type == MembershipType.LEADER
+            for membership_type, _group_type in self.memberships.values()
+        )
+
+    def has_events_access(self, group=None):
+        """
+        Checks if the user has a membership which gives access to manage events,
+        in the given group if any. Mirrors `User.memberships_with_events_access`.
+        """
+        if group is not None:
+            membership = self._get_membership(group)
+            memberships = [membership] if membership else []
+        else:
+            memberships = self.memberships.values()
+
+        return any(
+            group_type in (GroupType.SUBGROUP, GroupType.BOARD)
+            or (
+                membership_type == MembershipType.LEADER
+                and group_type
+                in (GroupType.COMMITTEE, GroupType.INTERESTGROUP, GroupType.SPORTSTEAM)
+            )
+            for membership_type, group_type in memberships
+        )
+
+
+def get_group_access(request):
+    """Returns the group access of the user of the request, loaded once per request"""
     set_user_id(request)
-    user = request.user
+    group_access = getattr(request, "group_access", None)
+    if group_access is None or group_access.user_id != request.id:
+        memberships = (
+            request.user.memberships.values_list(
+                "group_id", "membership_type", "group__type"
+            )
+            if request.user
+            else []
+        )
+        group_access = GroupAccess(request.id, memberships)
+        request.group_access = group_access
+    return group_access
+
+
+def get_request_cached(request, key, load):
+    """
+    Returns the value loaded for the key once per request.
+    Used for permission checks and lookups which do not change during a request.
+    """
+    cache = getattr(request, "permission_cache", None)
+    if cache is None:
+        cache = request.permission_cache = {}
+    if key not in cache:
+        cache[key] = load()
+    return cache[key]
+
+
+class PermissionsField(DRYPermissionsField):
+    """
+    DRYPermissionsField which evaluates the global permissions once per request
+    instead of once per object. Together with the group access of the request,
+    this serializes the permissions of a whole page with a constant number of queries.
+    """
+
+    def to_representation(self, value):
+        request = self.context["request"]
+        model = self.parent.Meta.model
+        results = {}
+        for action, method_names in self.action_method_map.items():
+            global_method_name = method_names.get("global", None)
+            if not self.object_only and global_method_name is not None:
+                results[action] = get_request_cached(
+                    request,
+                    (model, global_method_name),
+                    lambda: getattr(model, global_method_name)(request),
+                )
+            object_method_name = method_names.get("object", None)
+            if (
+                not self.global_only
+                and results.get(action, True)
+                and object_method_name is not None
+            ):
+                results[action] = getattr(value, object_method_name)(request)
+        return results
 
-    if not user:
+
+def check_has_access(groups_with_access, request):
+    set_user_id(request)
+    if not request.user:
         return False
 
-    try:
-        groups = map(str, groups_with_access)
-        return (
-            user
-            and user.memberships.filter(
-                group__slug__iregex=r"(" + "|".join(groups) + ")"
-            ).exists()
-        )
-    except Exception as e:
-        capture_exception(e)
-    return False
+    return get_group_access(request).has_access(groups_with_access)
 
 
 def check_has_full_access(groups_with_access: list[str], request):
     """Check if user has access to all groups"""
     set_user_id(request)
-    user = request.user
-
-    if not user:
+    if not request.user:
         return False
 
-    try:
-        groups = map(str, groups_with_access)
-        return user and user.memberships.filter(
-            group__slug__iregex=r"(" + "|".join(groups) + ")"
-        ).count() == len(groups_with_access)
-    except Exception as e:
-        capture_exception(e)
-    return False
+    return get_group_access(request).has_full_access(groups_with_access)
 
 
 def set_user_id(request):
@@ -95,13 +197,14 @@ def set_user_id(request):
     if token is None:
         return None
 
-    try:
-        user = Token.objects.get(key=token).user
-    except Token.DoesNotExist:
+    snapshot = get_user_snapshot(token)
+    if snapshot is None:
         return
 
+    user = get_user_from_snapshot(snapshot)
     request.id = user.user_id
     request.user = user
+    request.group_access = GroupAccess(user.user_id, snapshot["memberships"])
 
 
 class IsLeader(BasePermission):
@@ -113,11 +216,9 @@ class IsLeader(BasePermission):
         set_user_id(request)
         # Check if session-token is provided
         group_slug = group_slug if group_slug else view.kwargs["slug"]
-        user = request.user
-        memberships = user.memberships.all() if user else []
-        for membership in memberships:
-            if membership.group.slug == group_slug:
-                return membership.is_leader()
+        if not request.user:
+            return False
+        return get_group_access(request).is_leader(group_slug)
 
 
 class IsMember(BasePermission):
@@ -0,0 +1,141 @@
+from unittest.mock import patch
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+
+import pytest
+
+from app.common.auth_cache import (
+    LocalLRUCache,
+    get_user_snapshot,
+    local_auth_cache,
+)
+from app.common.permissions import set_user_id
+from app.content.factories import UserFactory
+from app.group.factories import GroupFactory, MembershipFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_local_auth_cache():
+    local_auth_cache.clear()
+
+
+@pytest.fixture()
+def user():
+    return UserFactory()
+
+
+@pytest.fixture()
+def token(user):
+    return Token.objects.get(user=user).key
+
+
+def get_request(token):
+    return APIRequestFactory().get("/", HTTP_X_CSRF_TOKEN=token)
+
+
+@pytest.mark.django_db
+def test_set_user_id_does_not_query_when_the_token_is_cached(
+    user, token, django_assert_num_queries
+):
+    set_user_id(get_request(token))
+
+    request = get_request(token)
+    with django_assert_num_queries(0):
+        set_user_id(request)
+
+    assert request.id == user.user_id
+    assert request.user == user
+    assert request.user.first_name == user.first_name
+
+
+@pytest.mark.django_db
+def test_set_user_id_does_not_set_user_for_unknown_token():
+    request = get_request("unknown")
+
+    set_user_id(request)
+
+    assert request.id is None
+    assert request.user is None
+
+
+@pytest.mark.django_db
+def test_deleted_token_is_not_accepted(token):
+    set_user_id(get_request(token))
+
+    Token.objects.filter(key=token).delete()
+    request = get_request(token)
+    set_user_id(request)
+
+    assert request.user is None
+
+
+@pytest.mark.django_db
+def test_updated_user_is_not_read_from_the_cache(user, token):
+    set_user_id(get_request(token))
+
+    user.first_name = "Updated"
+    user.save()
+    request = get_request(token)
+    set_user_id(request)
+
+    assert request.user.first_name == "Updated"
+
+
+@pytest.mark.django_db
+def test_memberships_are_updated_when_a_membership_changes(user, token):
+    assert get_user_snapshot(token)["memberships"] == []
+
+    membership = MembershipFactory(user=user, group=GroupFactory())
+
+    assert get_user_snapshot(token)["memberships"] == [
+        (membership.group_id, membership.membership_type, membership.group.type)
+    ]
+
+    membership.delete()
+
+    assert get_user_snapshot(token)["memberships"] == []
+
+
+@pytest.mark.django_db
+def test_password_is_loaded_when_needed(user, token):
+    request = get_request(token)
+    set_user_id(request)
+
+    assert request.user.password == user.password
+
+
+@pytest.mark.django_db
+def test_saving_the_cached_user_does_not_overwrite_the_password(user, token):
+    user.set_password("password")
+    user.save()
+    request = get_request(token)
+    set_user_id(request)
+
+    request.user.first_name = "Updated"
+    request.user.save()
+
+    user.refresh_from_db()
+    assert user.first_name == "Updated"
+    assert user.check_password("password")
+
+
+def test_local_lru_cache_evicts_the_least_recently_used_entry():
+    cache = LocalLRUCache(maxsize=2, timeout=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_local_lru_cache_entries_expire():
+    cache = LocalLRUCache(maxsize=2, timeout=5)
+
+    with patch("app.common.auth_cache.monotonic", return_value=0):
+        cache.set("a", 1)
+    with patch("app.common.auth_cache.monotonic", return_value=10):
+        assert cache.get("a") is None
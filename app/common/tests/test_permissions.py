@@ -0,0 +1,122 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+import pytest
+from dry_rest_permissions.generics import DRYPermissionsField
+
+from app.common.enums import AdminGroup
+from app.common.enums import NativeGroupType as GroupType
+from app.common.enums import NativeMembershipType as MembershipType
+from app.common.permissions import GroupAccess, PermissionsField, set_user_id
+from app.content.factories import UserFactory
+from app.group.factories import GroupFactory, MembershipFactory
+from app.group.models import Group
+
+
+@pytest.fixture()
+def group_access():
+    return GroupAccess(
+        "user",
+        [
+            ("index", MembershipType.MEMBER, GroupType.SUBGROUP),
+            ("kok", MembershipType.LEADER, GroupType.COMMITTEE),
+            ("plask", MembershipType.MEMBER, GroupType.INTERESTGROUP),
+        ],
+    )
+
+
+def test_has_access_matches_group_names_case_insensitively(group_access):
+    assert group_access.has_access([AdminGroup.INDEX])
+    assert group_access.has_access([AdminGroup.HS, "Plask"])
+
+
+def test_has_access_does_not_match_part_of_a_slug(group_access):
+    assert not group_access.has_access(["ind", "dex"])
+
+
+def test_has_full_access_requires_all_groups(group_access):
+    assert group_access.has_full_access([AdminGroup.INDEX, "kok"])
+    assert not group_access.has_full_access([AdminGroup.INDEX, AdminGroup.HS])
+
+
+def test_is_leader(group_access):
+    assert group_access.is_leader("kok")
+    assert not group_access.is_leader("plask")
+    assert not group_access.is_leader("hs")
+
+
+@pytest.mark.parametrize(
+    ("group", "expected_access"),
+    [("index", True), ("kok", True), ("plask", False), ("hs", False)],
+)
+def test_has_events_access_in_group(group_access, group, expected_access):
+    """Subgroup members and committee leaders have access, interest group members not"""
+    assert group_access.has_events_access(group) == expected_access
+
+
+def test_has_events_access_without_events_memberships():
+    group_access = GroupAccess(
+        "user", [("plask", MembershipType.MEMBER, GroupType.INTERESTGROUP)]
+    )
+
+    assert not group_access.has_events_access()
+
+
+class GroupPermissionsSerializer(serializers.ModelSerializer):
+    permissions = PermissionsField(actions=["write", "read", "group_form"])
+
+    class Meta:
+        model = Group
+        fields = ("slug", "permissions")
+
+
+class DRYGroupPermissionsSerializer(GroupPermissionsSerializer):
+    permissions = DRYPermissionsField(actions=["write", "read", "group_form"])
+
+
+def get_request(user):
+    token = Token.objects.get(user=user).key
+    request = Request(
+        APIRequestFactory().get("/", HTTP_X_CSRF_TOKEN=token),
+        parser_context={"kwargs": {}},
+    )
+    set_user_id(request)
+    return request
+
+
+def get_serialized_permissions(serializer_class, groups, user):
+    return serializer_class(
+        groups, many=True, context={"request": get_request(user)}
+    ).data
+
+
+@pytest.mark.django_db
+def test_permissions_field_matches_dry_permissions_field():
+    user = UserFactory()
+    groups = GroupFactory.create_batch(3)
+    MembershipFactory(user=user, group=groups[0], membership_type=MembershipType.LEADER)
+    MembershipFactory(user=user, group=groups[1])
+
+    assert get_serialized_permissions(
+        GroupPermissionsSerializer, groups, user
+    ) == get_serialized_permissions(DRYGroupPermissionsSerializer, groups, user)
+
+
+@pytest.mark.django_db
+def test_permissions_field_uses_a_fixed_number_of_queries():
+    user = UserFactory()
+    groups = GroupFactory.create_batch(5)
+    for group in groups:
+        MembershipFactory(user=user, group=group)
+    get_serialized_permissions(GroupPermissionsSerializer, groups[:1], user)
+
+    with CaptureQueriesContext(connection) as one_group:
+        get_serialized_permissions(GroupPermissionsSerializer, groups[:1], user)
+    with CaptureQueriesContext(connection) as five_groups:
+        get_serialized_permissions(GroupPermissionsSerializer, groups, user)
+
+    assert len(five_groups) == len(one_group)
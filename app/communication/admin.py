@@ -11,6 +11,7 @@ from app.communication.models import (
 class MailAdmin(admin.ModelAdmin):
     list_filter = (
         "users__user_id",
+        "status",
         "eta",
     )
 
@@ -25,3 +25,9 @@ class UserNotificationSettingType(models.TextChoices):
     @classmethod
     def get_kontres_and_blitzed(cls):
         return [cls.KONTRES, cls.BLITZED]
+
+
+class MailStatus(models.TextChoices):
+    PENDING = "PENDING", "Venter"
+    SENT = "SENT", "Sendt"
+    FAILED = "FAILED", "Feilet"
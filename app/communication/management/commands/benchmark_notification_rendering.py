@@ -0,0 +1,76 @@
+from datetime import timedelta
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.template.loader import render_to_string
+from django.test import override_settings
+
+from app.util.mail_creator import MAIL_TEMPLATE, MailCreator
+from app.util.utils import datetime_format, now
+
+
+def template_datetime_format(date_time):
+    """How datetime_format used to format dates, by compiling a template per call"""
+    return Template("{{ date_to_format }}").render(
+        Context(dict(date_to_format=date_time))
+    )
+
+
+def render_mail(mail, cached):
+    if cached:
+        return mail.generate_string()
+    return render_to_string(
+        MAIL_TEMPLATE, context={"content": mail.content, "title": mail.title}
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the cost of rendering a registration notification, with the "
+        "template based date formatting and mail rendering and with the current ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=1000)
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        """Measured without DEBUG, as in production, where the mail template is cached"""
+        start_date = now() + timedelta(days=10)
+        sign_off_deadline = now() + timedelta(days=8)
+
+        def render_notification(format_date, cached):
+            mail = (
+                MailCreator('Du har fått plass på "Benchmark"')
+                .add_paragraph("Hei, Benchmark!")
+                .add_paragraph(
+                    f"Arrangementet starter {format_date(start_date)} og vil være på Benchmark."
+                )
+                .add_paragraph(
+                    f"Du kan melde deg av innen {format_date(sign_off_deadline)}."
+                )
+                .add_event_button(1)
+            )
+            return render_mail(mail, cached)
+
+        before = render_notification(template_datetime_format, cached=False)
+        after = render_notification(datetime_format, cached=True)
+        if before != after:
+            self.stdout.write(self.style.ERROR("The rendered mails are not identical"))
+
+        for title, format_date, cached in (
+            ("before", template_datetime_format, False),
+            ("after", datetime_format, True),
+        ):
+            timings = []
+            for _ in range(options["iterations"]):
+                start = perf_counter()
+                render_notification(format_date, cached)
+                timings.append((perf_counter() - start) * 1000 * 1000)
+
+            self.stdout.write(
+                f"{title}: median {median(timings):.0f}µs, "
+                f"mean {sum(timings) / len(timings):.0f}µs per notification"
+            )
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0013_delete_warning"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mail",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="mail",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Venter"),
+                    ("SENT", "Sendt"),
+                    ("FAILED", "Feilet"),
+                ],
+                default="PENDING",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mail",
+            index=models.Index(
+                fields=["status", "eta"], name="communicati_status_b1a47c_idx"
+            ),
+        ),
+    ]
@@ -1,8 +1,10 @@
 import uuid
+from datetime import timedelta
 
 from django.db import models
 from django.utils.timezone import now
 
+from app.communication.enums import MailStatus
 from app.content.models import User
 from app.util.models import BaseModel
 
@@ -18,29 +20,58 @@ class Mail(BaseModel):
     subject = models.CharField(max_length=200)
     body = models.TextField(default="")
     users = models.ManyToManyField(User, related_name="emails", blank=True)
+    status = models.CharField(
+        max_length=20, choices=MailStatus.choices, default=MailStatus.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    MAX_ATTEMPTS = 3
 
     class Meta:
         verbose_name = "Mail"
         verbose_name_plural = "Mails"
         ordering = ["-eta"]
+        indexes = [models.Index(fields=["status", "eta"])]
 
-    def send(self, connection):
+    @staticmethod
+    def get_recipient_emails(mails):
+        """Returns the emails of the users of each mail, fetched in a single query"""
+        recipients = {mail.id: [] for mail in mails}
+        for mail_id, email in Mail.users.through.objects.filter(
+            mail__in=mails
+        ).values_list("mail_id", "user__email"):
+            recipients[mail_id].append(email)
+        return recipients
+
+    def send(self, connection, emails=None):
+        """
+        Sends the mail and records whether it was sent. A mail which fails is
+        retried later with a backoff, until it has failed MAX_ATTEMPTS times.
+        """
         from app.communication.notifier import send_html_email
 
-        emails = [user.email for user in self.users.all()]
+        if emails is None:
+            emails = list(self.users.values_list("email", flat=True))
         is_success = send_html_email(
             to_mails=emails,
             html=self.body,
             subject=self.subject,
             connection=connection,
         )
+
+        self.attempts += 1
         if is_success:
-            self.delete()
+            self.status = MailStatus.SENT
+        elif self.attempts >= self.MAX_ATTEMPTS:
+            self.status = MailStatus.FAILED
+        else:
+            self.eta = now() + timedelta(minutes=5 * self.attempts)
+        self.save(update_fields=["status", "attempts", "eta", "updated_at"])
 
         return is_success
 
     def __str__(self):
         return (
             f"\"{self.subject}\", to {self.users.all()[0] if self.users.count() == 1 else f'{self.users.count()} users'}, "
-            f"{'sent' if self.sent else 'eta'} {self.eta}"
+            f"{self.get_status_display()} {self.eta}"
         )
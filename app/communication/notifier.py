@@ -1,7 +1,9 @@
 import os
-from typing import Optional
+from typing import Iterable, Optional, Union
 
 from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import Exists, OuterRef, QuerySet
 from django.utils.html import strip_tags
 
 from sentry_sdk import capture_exception
@@ -16,12 +18,12 @@ from app.util.utils import chunk_list
 class Notify:
     def __init__(
         self,
-        users: list[User],
+        users: Union[QuerySet, Iterable[User]],
         title: str,
         notification_type: UserNotificationSettingType,
     ):
         """
-        users -> The users to be notified\n
+        users -> The users to be notified, as a list or a queryset which is never fully loaded\n
         title -> Title of the notification\n
         notification_type -> Type of notification
         """
@@ -84,58 +86,161 @@ class Notify:
 
         return self
 
-    def _send_mail(self):
-        from app.communication.models.mail import Mail
-
-        if len(self.users) > 0:
-            mail = Mail.objects.create(
-                subject=self.title, body=self.mail.generate_string()
+    def _get_recipients(self):
+        """
+        Returns the user_id, slack_user_id and which channels each user wants
+        for the notification type, resolved for all users in a single query.
+        """
+        from app.communication.models.user_notification_setting import (
+            UserNotificationSetting,
+        )
+
+        if isinstance(self.users, QuerySet):
+            users = self.users
+        else:
+            user_ids = [user.user_id for user in self.users if user is not None]
+            if not user_ids:
+                return []
+            users = User.objects.filter(user_id__in=user_ids)
+
+        settings = UserNotificationSetting.objects.filter(
+            user=OuterRef("pk"), notification_type=self.notification_type
+        )
+        return list(
+            users.order_by()
+            .annotate(
+                email_opt_out=Exists(settings.filter(email=False)),
+                website_opt_out=Exists(settings.filter(website=False)),
+                slack_opt_out=Exists(settings.filter(slack=False)),
             )
+            .values_list(
+                "user_id",
+                "slack_user_id",
+                "email_opt_out",
+                "website_opt_out",
+                "slack_opt_out",
+            )
+            .distinct()
+        )
 
-            for user in self.users:
-                if not user.user_notification_settings.filter(
-                    notification_type=self.notification_type, email=False
-                ).exists():
-                    mail.users.add(user)
-
-    def _send_slack(self):
-        for user in filter(lambda user: bool(user.slack_user_id), self.users):
-            if not user.user_notification_settings.filter(
-                notification_type=self.notification_type, slack=False
-            ).exists():
-                self.slack.send(user.slack_user_id)
+    def _send_mail(self, recipients):
+        from app.communication.models.mail import Mail
 
-    def _send_notification(self):
+        user_ids = [
+            user_id
+            for user_id, _, email_opt_out, _, _ in recipients
+            if not email_opt_out
+        ]
+        if not user_ids:
+            return 0
+
+        mail = Mail.objects.create(subject=self.title, body=self.mail.generate_string())
+        Mail.users.through.objects.bulk_create(
+            [Mail.users.through(mail=mail, user_id=user_id) for user_id in user_ids],
+            batch_size=1000,
+        )
+        return len(user_ids)
+
+    def _send_slack(self, recipients):
+        messages_sent = 0
+        for _, slack_user_id, _, _, slack_opt_out in recipients:
+            if slack_user_id and not slack_opt_out:
+                self.slack.send(slack_user_id)
+                messages_sent += 1
+        return messages_sent
+
+    def _send_notification(self, recipients):
         from app.communication.models.notification import Notification
 
-        bulk_inserts = []
-
-        for user in self.users:
-            if not user.user_notification_settings.filter(
-                notification_type=self.notification_type, website=False
-            ).exists():
-                bulk_inserts.append(
-                    Notification(
-                        user=user,
-                        title=self.notification_title,
-                        description="\n\n".join(self.notification_description),
-                        link=self.notification_link,
-                    )
-                )
+        description = "\n\n".join(self.notification_description)
+        bulk_inserts = [
+            Notification(
+                user_id=user_id,
+                title=self.notification_title,
+                description=description,
+                link=self.notification_link,
+            )
+            for user_id, _, _, website_opt_out, _ in recipients
+            if not website_opt_out
+        ]
 
         if bulk_inserts:
             Notification.objects.bulk_create(bulk_inserts, batch_size=1000)
+        return len(bulk_inserts)
 
     def send(self, mail=True, website=True, slack=True):
-        """Send the created mails, notifications and Slack-messages"""
-        if mail:
-            self._send_mail()
+        """
+        Send the created mails, notifications and Slack-messages
 
-        if website:
-            self._send_notification()
+        returns -> The number of recipients and deliveries per channel
+        """
+        recipients = self._get_recipients()
+
+        return {
+            "recipients": len(recipients),
+            "mails": self._send_mail(recipients) if mail else 0,
+            "notifications": self._send_notification(recipients) if website else 0,
+            "slack_messages": self._send_slack(recipients) if slack else 0,
+        }
+
+    def _get_recipient_ids(self):
+        if isinstance(self.users, QuerySet):
+            return list(
+                self.users.order_by().values_list("user_id", flat=True).distinct()
+            )
+        return list(
+            dict.fromkeys(user.user_id for user in self.users if user is not None)
+        )
+
+    def to_payload(self, user_ids, mail=True, website=True, slack=True):
+        """Returns the notification as JSON serializable data for a Celery task"""
+        return {
+            "user_ids": user_ids,
+            "title": self.title,
+            "notification_type": self.notification_type,
+            "mail_content": self.mail.content,
+            "slack_blocks": self.slack.blocks,
+            "notification_description": self.notification_description,
+            "notification_link": self.notification_link,
+            "channels": {"mail": mail, "website": website, "slack": slack},
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        notify = cls(
+            User.objects.filter(user_id__in=payload["user_ids"]),
+            payload["title"],
+            payload["notification_type"],
+        )
+        notify.mail.content = payload["mail_content"]
+        notify.slack.blocks = payload["slack_blocks"]
+        notify.notification_description = payload["notification_description"]
+        notify.notification_link = payload["notification_link"]
+        return notify
+
+    def send_async(self, mail=True, website=True, slack=True):
+        """
+        Queue the mails, notifications and Slack-messages as a single Celery task
+        for all the users, so the request does not wait for rendering and Slack.
+        The task is queued once the current transaction commits, so nothing is
+        sent for changes which are rolled back. Falls back to sending right away
+        if the task can't be queued.
+        """
+        user_ids = self._get_recipient_ids()
+        if not user_ids:
+            return
 
-        if slack:
-            self._send_slack()
+        payload = self.to_payload(user_ids, mail, website, slack)
+        transaction.on_commit(lambda: self._queue(payload, mail, website, slack))
+
+    def _queue(self, payload, mail, website, slack):
+        from app.communication.tasks import send_notification
+
+        try:
+            send_notification.delay(payload)
+        except Exception as enqueue_error:
+            capture_exception(enqueue_error)
+            self.send(mail, website, slack)
 
 
 def send_html_email(
@@ -1,26 +1,70 @@
+from time import perf_counter
+
 from django.db import transaction
 
 from app.celery import app
 from app.util.tasks import BaseTask
 
+MAIL_BATCH_SIZE = 50
+# Sent and failed mails are kept this long, to see what was sent and why it failed
+MAIL_RETENTION_DAYS = 30
+
 
 @app.task(bind=True, base=BaseTask)
 def send_due_mails(self, *_args, **_kwargs):
+    """
+    Sends due mails in batches. Each batch is claimed with SKIP LOCKED in its own
+    transaction, so several workers can drain the queue in parallel without
+    sending a mail twice, and a slow mail only locks the rows of its own batch.
+    """
+    from datetime import timedelta
+
     from django.core.mail import get_connection
 
+    from app.communication.enums import MailStatus
     from app.communication.models.mail import Mail
     from app.util.utils import now
 
-    mails = Mail.objects.select_for_update().filter(eta__lt=now())
     total_mails = 0
     mails_sent = 0
-    with transaction.atomic():
-        # We don't have to make a connection here. If we don't a new connection is created per email.
-        with get_connection() as connection:
-            for mail in mails:
-                is_success = mail.send(connection)
-                if is_success:
-                    mails_sent += 1
-                total_mails += 1
+    # We don't have to make a connection here. If we don't a new connection is created per email.
+    with get_connection() as connection:
+        while True:
+            with transaction.atomic():
+                mails = list(
+                    Mail.objects.select_for_update(skip_locked=True)
+                    .filter(status=MailStatus.PENDING, eta__lt=now())
+                    .order_by("eta")[:MAIL_BATCH_SIZE]
+                )
+                if not mails:
+                    break
+
+                recipients = Mail.get_recipient_emails(mails)
+                for mail in mails:
+                    is_success = mail.send(connection, recipients[mail.id])
+                    if is_success:
+                        mails_sent += 1
+                    total_mails += 1
 
     self.logger.info(f"Successfully sent: {mails_sent}/{total_mails} mails")
+
+    Mail.objects.filter(
+        status__in=(MailStatus.SENT, MailStatus.FAILED),
+        eta__lt=now() - timedelta(days=MAIL_RETENTION_DAYS),
+    ).delete()
+
+
+@app.task(bind=True, base=BaseTask)
+def send_notification(self, payload, *_args, **_kwargs):
+    from app.communication.notifier import Notify
+
+    start = perf_counter()
+    metrics = Notify.from_payload(payload).send(**payload["channels"])
+
+    self.logger.info(
+        f'Delivered "{payload["title"]}" to {metrics["recipients"]} users in '
+        f'{(perf_counter() - start) * 1000:.0f}ms: {metrics["mails"]} mails, '
+        f'{metrics["notifications"]} notifications, '
+        f'{metrics["slack_messages"]} Slack messages'
+    )
+    return metrics
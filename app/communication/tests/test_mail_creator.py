@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from django.template import Context, Template
+from django.template.loader import render_to_string
+
+import pytest
+
+from app.util.mail_creator import MailCreator, get_mail_template
+from app.util.utils import datetime_format, now
+
+
+def template_datetime_format(date_time):
+    return Template("{{ date_to_format }}").render(
+        Context(dict(date_to_format=date_time))
+    )
+
+
+@pytest.mark.parametrize(
+    "date_time",
+    [
+        now(),
+        now() + timedelta(days=180),
+        datetime(2024, 1, 1, 12, 30),
+        datetime(2024, 1, 1).date(),
+        None,
+    ],
+)
+def test_datetime_format_is_identical_to_rendering_a_template(date_time):
+    assert datetime_format(date_time) == template_datetime_format(date_time)
+
+
+def test_generate_string_is_identical_to_render_to_string():
+    mail = (
+        MailCreator("Test mail")
+        .add_paragraph("This is a <b>test</b>")
+        .add_event_button(1)
+    )
+
+    assert mail.generate_string() == render_to_string(
+        "mail_creator.html", context={"content": mail.content, "title": mail.title}
+    )
+
+
+def test_mail_template_is_only_looked_up_once():
+    MailCreator("First mail").generate_string()
+    MailCreator("Second mail").generate_string()
+
+    assert get_mail_template.cache_info().currsize == 1
+    assert get_mail_template.cache_info().hits >= 1
@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+from django.db import transaction
+
 import pytest
 
 from app.communication.enums import UserNotificationSettingType
@@ -8,6 +10,7 @@ from app.communication.models.mail import Mail
 from app.communication.models.notification import Notification
 from app.communication.notifier import Notify
 from app.content.factories import UserFactory
+from app.content.models import User
 
 
 @pytest.mark.django_db
@@ -102,3 +105,155 @@ def test_slack_message_is_sent_only_when_wanted(mock_slack_message):
     ).add_paragraph("This is a test").send()
 
     assert mock_slack_message.call_count == 2
+
+
+@pytest.mark.django_db
+def test_notify_accepts_a_queryset_of_users():
+    """Notify should resolve the users of a queryset without them being loaded first"""
+    NOTIFICATION_TYPE = UserNotificationSettingType.EVENT_INFO
+
+    user1 = UserFactory(first_name="Queryset")
+    user2 = UserFactory(first_name="Queryset")
+    UserNotificationSettingFactory(
+        user=user2, email=False, notification_type=NOTIFICATION_TYPE
+    )
+    UserFactory(first_name="Other")
+
+    Notify(
+        User.objects.filter(first_name="Queryset"),
+        "Test notification",
+        NOTIFICATION_TYPE,
+    ).add_paragraph("This is a test").send()
+
+    assert list(Mail.objects.get().users.all()) == [user1]
+    assert set(Notification.objects.values_list("user", flat=True)) == {
+        user1.user_id,
+        user2.user_id,
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("recipients", [1, 10, 50])
+@patch("app.communication.slack.Slack.send")
+def test_notify_query_count_does_not_grow_with_recipients(
+    mock_slack_message, recipients, django_assert_num_queries
+):
+    """
+    Opt-outs for all channels are resolved in one query, and the mail users and
+    notifications are inserted in bulk, so the number of queries is constant.
+    """
+    NOTIFICATION_TYPE = UserNotificationSettingType.EVENT_INFO
+
+    users = UserFactory.create_batch(recipients, slack_user_id="12")
+    for user in users[1::3]:
+        UserNotificationSettingFactory(
+            user=user,
+            email=False,
+            slack=False,
+            notification_type=NOTIFICATION_TYPE,
+        )
+
+    notify = Notify(users, "Test notification", NOTIFICATION_TYPE).add_paragraph(
+        "This is a test"
+    )
+
+    # Recipients, the mail, its users and the notifications
+    with django_assert_num_queries(4):
+        notify.send()
+
+    opted_out = len(users[1::3])
+    assert Mail.objects.get().users.count() == recipients - opted_out
+    assert Notification.objects.count() == recipients
+    assert mock_slack_message.call_count == recipients - opted_out
+
+
+@pytest.mark.django_db
+def test_send_async_queues_a_single_task_for_all_users(
+    django_capture_on_commit_callbacks,
+):
+    """All the users of a notification should be delivered to by one task"""
+    users = UserFactory.create_batch(5)
+
+    with patch(
+        "app.communication.tasks.send_notification.delay"
+    ) as mock_delay, django_capture_on_commit_callbacks(execute=True):
+        Notify(
+            users, "Test notification", UserNotificationSettingType.OTHER
+        ).add_paragraph("This is a test").send_async()
+
+    mock_delay.assert_called_once()
+    (payload,) = mock_delay.call_args.args
+    assert payload["user_ids"] == [user.user_id for user in users]
+    assert Mail.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_send_async_queues_identical_notifications_again(
+    django_capture_on_commit_callbacks,
+):
+    """A repeated action, like a second identical fine, should notify again"""
+    user = UserFactory()
+
+    with patch(
+        "app.communication.tasks.send_notification.delay"
+    ) as mock_delay, django_capture_on_commit_callbacks(execute=True):
+        for _ in range(3):
+            Notify(
+                [user], "Test notification", UserNotificationSettingType.OTHER
+            ).add_paragraph("This is a test").send_async()
+
+    assert mock_delay.call_count == 3
+
+
+@pytest.mark.django_db
+def test_send_async_delivers_the_notification(django_capture_on_commit_callbacks):
+    """The queued task should create the same mail and notifications as send"""
+    user = UserFactory()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Notify(
+            [user], "Test notification", UserNotificationSettingType.OTHER
+        ).add_paragraph("This is a test").add_link("Link", "/link/").send_async()
+
+    assert list(Mail.objects.get().users.all()) == [user]
+    notification = Notification.objects.get(user=user)
+    assert notification.description == "This is a test"
+    assert notification.link == "/link/"
+
+
+@pytest.mark.django_db
+def test_send_async_waits_for_the_transaction_to_commit(
+    django_capture_on_commit_callbacks,
+):
+    """Nothing should be sent for changes which are rolled back"""
+    user = UserFactory()
+
+    with patch(
+        "app.communication.tasks.send_notification.delay"
+    ) as mock_delay, django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(ValueError), transaction.atomic():
+            Notify(
+                [user], "Test notification", UserNotificationSettingType.OTHER
+            ).add_paragraph("This is a test").send_async()
+            raise ValueError
+
+    mock_delay.assert_not_called()
+    assert not Mail.objects.exists()
+    assert not Notification.objects.exists()
+
+
+@pytest.mark.django_db
+def test_send_async_sends_right_away_if_the_task_can_not_be_queued(
+    django_capture_on_commit_callbacks,
+):
+    user = UserFactory()
+
+    with patch(
+        "app.communication.tasks.send_notification.delay",
+        side_effect=Exception("Broker is unavailable"),
+    ), django_capture_on_commit_callbacks(execute=True):
+        Notify(
+            [user], "Test notification", UserNotificationSettingType.OTHER
+        ).add_paragraph("This is a test").send_async()
+
+    assert Notification.objects.filter(user=user).exists()
@@ -3,8 +3,15 @@ from unittest.mock import patch
 
 import pytest
 
+from app.communication.enums import MailStatus
 from app.communication.factories import MailFactory
-from app.communication.tasks import send_due_mails
+from app.communication.models.mail import Mail
+from app.communication.tasks import (
+    MAIL_BATCH_SIZE,
+    MAIL_RETENTION_DAYS,
+    send_due_mails,
+)
+from app.content.factories import UserFactory
 from app.util.utils import now
 
 
@@ -28,3 +35,76 @@ def test_mail_is_not_sent_when_not_due(mock_send_html_email):
     send_due_mails()
 
     assert not mock_send_html_email.called
+
+
+@pytest.mark.django_db
+@patch("app.communication.notifier.send_html_email", return_value=True)
+def test_sent_mail_is_kept_as_sent_and_not_sent_again(mock_send_html_email):
+    """Mail should be marked as sent instead of deleted, and not be sent twice"""
+    user = UserFactory()
+    mail = MailFactory(users=(user,))
+
+    send_due_mails()
+    send_due_mails()
+
+    mail.refresh_from_db()
+    assert mail.status == MailStatus.SENT
+    mock_send_html_email.assert_called_once()
+    assert mock_send_html_email.call_args.kwargs["to_mails"] == [user.email]
+
+
+@pytest.mark.django_db
+@patch("app.communication.notifier.send_html_email", return_value=False)
+def test_failed_mail_is_retried_later(mock_send_html_email):
+    """Mail which failed should be retried later, and not again in the same run"""
+    mail = MailFactory()
+
+    send_due_mails()
+
+    mail.refresh_from_db()
+    assert mock_send_html_email.call_count == 1
+    assert mail.status == MailStatus.PENDING
+    assert mail.attempts == 1
+    assert mail.eta > now()
+
+
+@pytest.mark.django_db
+@patch("app.communication.notifier.send_html_email", return_value=False)
+def test_mail_is_marked_as_failed_after_max_attempts(mock_send_html_email):
+    mail = MailFactory(attempts=Mail.MAX_ATTEMPTS - 1)
+
+    send_due_mails()
+
+    mail.refresh_from_db()
+    assert mail.status == MailStatus.FAILED
+
+
+@pytest.mark.django_db
+@patch("app.communication.notifier.send_html_email", return_value=True)
+def test_due_mails_are_sent_in_batches(mock_send_html_email):
+    """All due mails should be sent, also when there are more than a batch"""
+    MailFactory.create_batch(MAIL_BATCH_SIZE + 5, users=(UserFactory(),))
+
+    send_due_mails()
+
+    assert mock_send_html_email.call_count == MAIL_BATCH_SIZE + 5
+    assert not Mail.objects.filter(status=MailStatus.PENDING).exists()
+
+
+@pytest.mark.django_db
+def test_old_sent_and_failed_mails_are_deleted():
+    """Sent and failed mails should only be kept for a while, pending ones until sent"""
+    old = now() - timedelta(days=MAIL_RETENTION_DAYS + 1)
+    old_sent_mail = MailFactory(status=MailStatus.SENT, eta=old)
+    old_failed_mail = MailFactory(status=MailStatus.FAILED, eta=old)
+    recent_sent_mail = MailFactory(
+        status=MailStatus.SENT, eta=now() - timedelta(days=1)
+    )
+
+    with patch("app.communication.notifier.send_html_email", return_value=False):
+        send_due_mails()
+
+    remaining = Mail.objects.values_list("id", flat=True)
+    assert old_sent_mail.id not in remaining
+    assert old_failed_mail.id not in remaining
+    assert recent_sent_mail.id in remaining
@@ -18,6 +18,7 @@ class NotificationViewSet(BaseViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [BasicViewPermission]
     pagination_class = BasePagination
+    cursor_ordering = ("-created_at", "id")
 
     def get_queryset(self):
         return self.request.user.notifications.all().order_by("-created_at")
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def send_notifications_eagerly(monkeypatch):
+    """Run queued notifications right away, as there is no Celery worker in tests"""
+    from app.communication.tasks import send_notification
+
+    monkeypatch.setattr(
+        send_notification,
+        "delay",
+        lambda *args, **kwargs: send_notification.apply(args=args, kwargs=kwargs),
+    )
@@ -0,0 +1,97 @@
+import tracemalloc
+from time import perf_counter
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from app.content.views.photon_table_export import (
+    MAX_LIMIT,
+    read_page,
+    stream_rows,
+)
+
+TABLE = "photon_export_benchmark"
+INSERT_BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills a synthetic table and reads pages of it at increasing depths with "
+        "offset and keyset paging, then streams the whole table as NDJSON. "
+        "Creates and drops its own table, do not run it against production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=1_000_000, help="Number of rows in the table"
+        )
+        parser.add_argument(
+            "--depths",
+            type=float,
+            nargs="+",
+            default=[0, 0.25, 0.5, 0.75, 0.99],
+            help="Positions of the pages read, as fractions of the table",
+        )
+
+    def handle(self, *args, **options):
+        self.create_table(options["rows"])
+        try:
+            for depth in options["depths"]:
+                offset = int(options["rows"] * depth)
+                offset_latency = self.time(lambda: read_page(TABLE, MAX_LIMIT, offset))
+                # The ids are 1 to rows, so the row at offset comes after the id offset
+                keyset_latency = self.time(
+                    lambda: read_page(TABLE, MAX_LIMIT, after=[offset])
+                )
+                self.stdout.write(
+                    f"Page at row {offset}: offset {offset_latency:.1f}ms, "
+                    f"keyset {keyset_latency:.1f}ms"
+                )
+
+            self.report_stream()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {connection.ops.quote_name(TABLE)}")
+            cache.delete_many([f"photon:{TABLE}:primary_key", f"photon:{TABLE}:count"])
+
+    def create_table(self, size):
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {quote_name(TABLE)} (id INTEGER PRIMARY KEY, "
+                "title VARCHAR(200), amount INTEGER, created_at DATETIME)"
+            )
+            for start in range(1, size + 1, INSERT_BATCH_SIZE):
+                cursor.executemany(
+                    f"INSERT INTO {quote_name(TABLE)} VALUES (%s, %s, %s, %s)",
+                    [
+                        (number, f"Row {number}", number % 100, "2024-01-01 12:00:00")
+                        for number in range(
+                            start, min(start + INSERT_BATCH_SIZE, size + 1)
+                        )
+                    ],
+                )
+
+    def time(self, run):
+        start = perf_counter()
+        run()
+        return (perf_counter() - start) * 1000
+
+    def report_stream(self):
+        tracemalloc.start()
+        start = perf_counter()
+        size = 0
+        lines = 0
+        for chunk in stream_rows(TABLE):
+            size += len(chunk.encode())
+            lines += chunk.count("\n")
+        latency = perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f"Stream of {lines - 1} rows: {latency:.1f}s, "
+            f"{size / 1024 / 1024:.0f}MB sent, "
+            f"peak memory {peak_memory / 1024 / 1024:.1f}MB"
+        )
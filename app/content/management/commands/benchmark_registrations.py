@@ -0,0 +1,330 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from statistics import mean, quantiles
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app.common.enums import NativeGroupType as GroupType
+from app.common.enums import NativeMembershipType as MembershipType
+from app.communication.models.mail import Mail
+from app.content.models import Event, PriorityPool, Strike, User
+from app.content.util.registration_utils import get_prioritized_user_ids
+from app.content.util.seat_ledger import SeatLedger
+from app.forms.enums import NativeEventFormType as EventFormType
+from app.forms.models.forms import EventForm, Submission
+from app.group.models import Group, Membership
+from app.util.utils import now
+
+MODES = ("lock", "ledger")
+
+
+def get_row_lock_status():
+    """Returns the InnoDB row lock counters, or None if the database is not MySQL"""
+    if connection.vendor != "mysql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SHOW GLOBAL STATUS WHERE Variable_name IN "
+            "('Innodb_row_lock_waits', 'Innodb_row_lock_time')"
+        )
+        return {name: int(value) for name, value in cursor.fetchall()}
+
+
+def timed_request(send):
+    """Sends a request and returns its status code, latency in ms and query count"""
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    try:
+        with connection.execute_wrapper(count_query):
+            start = perf_counter()
+            response = send()
+            latency = (perf_counter() - start) * 1000
+    finally:
+        connection.close()
+
+    return response.status_code, latency, len(queries)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires a burst of concurrent sign-ups, followed by a storm of unregistrations, "
+        "at a new event with priority pools, strikes and a survey. Reports latency "
+        "percentiles, row lock waits, queries per request and whether the final "
+        "waiting list is correct, for the event lock and the seat ledger admission modes. "
+        "Creates and deletes its own data, do not run it against production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--registrations", type=int, default=500)
+        parser.add_argument("--limit", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--unregistrations",
+            type=int,
+            default=50,
+            help="Number of participants that unregister after the burst",
+        )
+        parser.add_argument(
+            "--priority-share",
+            type=float,
+            default=0.25,
+            help="Share of the users in the priority pool of the event",
+        )
+        parser.add_argument(
+            "--strike-share",
+            type=float,
+            default=0.1,
+            help="Share of the users with an active strike",
+        )
+        parser.add_argument(
+            "--without-survey",
+            action="store_true",
+            help="Do not require a survey answer to sign up",
+        )
+        parser.add_argument("--mode", choices=(*MODES, "both"), default="both")
+
+    def handle(self, *args, **options):
+        modes = MODES if options["mode"] == "both" else (options["mode"],)
+
+        if "ledger" in modes:
+            if SeatLedger.get_connection() is None:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "The cache is not Redis, so the ledger mode falls back to the event lock"
+                    )
+                )
+            if options["priority_share"] > 0:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "Events with priority pools always use the event lock, "
+                        "use --priority-share 0 to measure the ledger"
+                    )
+                )
+
+        for mode in modes:
+            with override_settings(REGISTRATION_SEAT_LEDGER=mode == "ledger"):
+                self.run(mode, options)
+
+    def run(self, mode, options):
+        event, users = self.seed(options)
+        try:
+            prioritized_user_ids = get_prioritized_user_ids(
+                event, [user.user_id for user in users]
+            )
+
+            registration_url = reverse(
+                "registration-list", kwargs={"event_id": event.pk}
+            )
+            self.report(
+                f"{mode}, sign-up burst",
+                event,
+                prioritized_user_ids,
+                *self.burst(
+                    users,
+                    lambda client, user: client.post(
+                        registration_url, {}, format="json"
+                    ),
+                    options["concurrency"],
+                ),
+            )
+
+            participants = [
+                user
+                for user in users
+                if event.registrations.filter(user=user, is_on_wait=False).exists()
+            ][: options["unregistrations"]]
+            self.report(
+                f"{mode}, unregistration storm",
+                event,
+                prioritized_user_ids,
+                *self.burst(
+                    participants,
+                    lambda client, user: client.delete(
+                        reverse(
+                            "registration-detail",
+                            kwargs={"event_id": event.pk, "user_id": user.user_id},
+                        )
+                    ),
+                    options["concurrency"],
+                ),
+            )
+        finally:
+            self.clean_up(event, users)
+
+    def seed(self, options):
+        start = now()
+        prefix = uuid.uuid4().hex[:6]
+        event = Event.objects.create(
+            title=f"Registration benchmark {prefix}",
+            start_date=start + timedelta(days=10),
+            end_date=start + timedelta(days=11),
+            sign_up=True,
+            limit=options["limit"],
+            start_registration_at=start - timedelta(days=1),
+            end_registration_at=start + timedelta(days=9),
+            sign_off_deadline=start + timedelta(days=8),
+        )
+
+        users = User.objects.bulk_create(
+            User(
+                user_id=f"bm{prefix}{number}",
+                first_name="Benchmark",
+                last_name=str(number),
+                email=f"bm{prefix}{number}@example.com",
+                accepts_event_rules=True,
+            )
+            for number in range(options["registrations"])
+        )
+        Token.objects.bulk_create(
+            Token(user=user, key=Token.generate_key()) for user in users
+        )
+
+        prioritized_users = users[: int(len(users) * options["priority_share"])]
+        if prioritized_users:
+            group = Group.objects.create(
+                name=f"Benchmark {prefix}",
+                slug=f"benchmark-{prefix}",
+                type=GroupType.STUDYYEAR,
+            )
+            Membership.objects.bulk_create(
+                Membership(
+                    user=user, group=group, membership_type=MembershipType.MEMBER
+                )
+                for user in prioritized_users
+            )
+            PriorityPool.objects.create(event=event).groups.add(group)
+
+        # Spread the users with strikes over both prioritized and other users
+        strike_step = (
+            round(1 / options["strike_share"]) if options["strike_share"] > 0 else 0
+        )
+        if strike_step:
+            Strike.objects.bulk_create(
+                Strike(user=user, description="Benchmark strike", strike_size=1)
+                for user in users[::strike_step]
+            )
+
+        if not options["without_survey"]:
+            survey = EventForm.objects.create(
+                event=event, title="Benchmark survey", type=EventFormType.SURVEY
+            )
+            Submission.objects.bulk_create(
+                Submission(form=survey, user=user) for user in users
+            )
+
+        return event, users
+
+    def burst(self, users, send, concurrency):
+        tokens = dict(
+            Token.objects.filter(user__in=users).values_list("user_id", "key")
+        )
+
+        def request(user):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            client.credentials(HTTP_X_CSRF_TOKEN=tokens[user.user_id])
+            return timed_request(lambda: send(client, user))
+
+        lock_status_before = get_row_lock_status()
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(request, users))
+        elapsed = perf_counter() - start
+        lock_status_after = get_row_lock_status()
+
+        lock_status = (
+            {
+                name: lock_status_after[name] - lock_status_before[name]
+                for name in lock_status_after
+            }
+            if lock_status_before is not None
+            else None
+        )
+        return results, elapsed, lock_status
+
+    def report(self, title, event, prioritized_user_ids, results, elapsed, lock_status):
+        status_codes = {}
+        for status_code, _, _ in results:
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+
+        latencies = [latency for _, latency, _ in results]
+        query_counts = [query_count for _, _, query_count in results]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write(
+            f"  {len(results)} requests in {elapsed:.2f}s "
+            f"({len(results) / elapsed:.1f} requests/sec), status codes {status_codes}"
+        )
+        if len(latencies) > 1:
+            percentiles = quantiles(latencies, n=100, method="inclusive")
+            self.stdout.write(
+                f"  latency p50 {percentiles[49]:.1f}ms, p95 {percentiles[94]:.1f}ms, "
+                f"p99 {percentiles[98]:.1f}ms"
+            )
+        if query_counts:
+            self.stdout.write(
+                f"  queries per request mean {mean(query_counts):.1f}, max {max(query_counts)}"
+            )
+        if lock_status is not None:
+            self.stdout.write(
+                f"  row lock waits {lock_status['Innodb_row_lock_waits']}, "
+                f"total row lock time {lock_status['Innodb_row_lock_time']}ms"
+            )
+
+        problems = self.check_waiting_list(event, prioritized_user_ids)
+        self.stdout.write(
+            f"  {event.list_count} participants, {event.waiting_list_count} on the waiting list"
+        )
+        for problem in problems:
+            self.stdout.write(self.style.ERROR(f"  {problem}"))
+        if not problems:
+            self.stdout.write(self.style.SUCCESS("  waiting list is correct"))
+
+    def check_waiting_list(self, event, prioritized_user_ids):
+        """Returns the ways the final registrations break the waiting list rules"""
+        event.refresh_from_db()
+        registrations = list(event.registrations.values_list("user_id", "is_on_wait"))
+        participants = {
+            user_id for user_id, is_on_wait in registrations if not is_on_wait
+        }
+        waiting_list = {user_id for user_id, is_on_wait in registrations if is_on_wait}
+
+        problems = []
+        if (event.list_count, event.waiting_list_count) != (
+            len(participants),
+            len(waiting_list),
+        ):
+            problems.append(
+                f"stored counters ({event.list_count}, {event.waiting_list_count}) do not "
+                f"match the registrations ({len(participants)}, {len(waiting_list)})"
+            )
+        if event.limit and len(participants) > event.limit:
+            problems.append(f"{len(participants)} participants exceed the limit")
+        if waiting_list and len(participants) < event.limit:
+            problems.append("users are on the waiting list while there are free spots")
+        if (waiting_list & prioritized_user_ids) and (
+            participants - prioritized_user_ids
+        ):
+            problems.append(
+                "prioritized users are on the waiting list while other users have a spot"
+            )
+        return problems
+
+    def clean_up(self, event, users):
+        user_ids = [user.user_id for user in users]
+        Mail.objects.filter(users__in=user_ids).delete()
+        Group.objects.filter(event_priority_pools__event=event).delete()
+        event.delete()
+        User.objects.filter(user_id__in=user_ids).delete()
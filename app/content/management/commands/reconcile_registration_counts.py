@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from app.content.models import Event
+
+
+class Command(BaseCommand):
+    help = "Recounts registrations and fixes events with drifted registration counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the events with drifted counters",
+        )
+
+    def get_drifted_events(self):
+        return (
+            Event.objects.annotate(
+                list_count_actual=Count(
+                    "registrations", filter=Q(registrations__is_on_wait=False)
+                ),
+                waiting_list_count_actual=Count(
+                    "registrations", filter=Q(registrations__is_on_wait=True)
+                ),
+            )
+            .exclude(
+                cached_list_count=F("list_count_actual"),
+                cached_waiting_list_count=F("waiting_list_count_actual"),
+            )
+            .order_by("pk")
+        )
+
+    def handle(self, *args, **options):
+        fixed = 0
+        for event in self.get_drifted_events():
+            self.stdout.write(
+                f"Event {event.pk}: list {event.cached_list_count} -> {event.list_count_actual}, "
+                f"waiting list {event.cached_waiting_list_count} -> {event.waiting_list_count_actual}"
+            )
+            if not options["dry_run"] and event.refresh_registration_counts():
+                fixed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} event(s)"))
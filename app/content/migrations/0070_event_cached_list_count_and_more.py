@@ -0,0 +1,40 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_registrations(apps, schema_editor):
+    Event = apps.get_model("content", "Event")
+    events = Event.objects.annotate(
+        list_count=Count("registrations", filter=Q(registrations__is_on_wait=False)),
+        waiting_list_count=Count(
+            "registrations", filter=Q(registrations__is_on_wait=True)
+        ),
+    ).filter(Q(list_count__gt=0) | Q(waiting_list_count__gt=0))
+
+    for event in events.iterator():
+        Event.objects.filter(pk=event.pk).update(
+            cached_list_count=event.list_count,
+            cached_waiting_list_count=event.waiting_list_count,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0069_delete_minute"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="cached_list_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="cached_waiting_list_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            count_registrations, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -2,16 +2,24 @@ from datetime import timedelta
 
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
 from app.common.enums import AdminGroup
 from app.common.permissions import (
     BasePermissionModel,
     check_has_access,
+    get_group_access,
     set_user_id,
 )
 from app.content.models import Category
 from app.content.models.user import User
+from app.content.util.event_response_cache import (
+    bump_event_list_version,
+    bump_event_version,
+)
 from app.emoji.models.reaction import Reaction
 from app.forms.enums import NativeEventFormType
 from app.group.models.group import Group
@@ -74,6 +82,10 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
     sign_off_deadline = models.DateTimeField(blank=True, null=True, default=None)
     only_allow_prioritized = models.BooleanField(default=False)
 
+    """ Registration counters, maintained by Registration """
+    cached_list_count = models.IntegerField(default=0, editable=False)
+    cached_waiting_list_count = models.IntegerField(default=0, editable=False)
+
     """ Cronjob fields """
     runned_post_event_actions = models.BooleanField(default=False)
     runned_sign_off_deadline_reminder = models.BooleanField(default=False)
@@ -83,12 +95,28 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
     emojis_allowed = models.BooleanField(default=False)
     reactions = GenericRelation(Reaction)
 
+    REGISTRATION_COUNT_FIELDS = ("cached_list_count", "cached_waiting_list_count")
+
     class Meta:
         ordering = ("start_date",)
 
     def __str__(self):
         return f"{self.title} - starting {self.start_date} at {self.location}"
 
+    def save(self, *args, **kwargs):
+        # The registration counters are only written through
+        # update_registration_counts, so a stale instance must not overwrite them.
+        if not self._state.adding and not args and "update_fields" not in kwargs:
+            deferred_fields = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.REGISTRATION_COUNT_FIELDS
+                and field.attname not in deferred_fields
+            ]
+        return super().save(*args, **kwargs)
+
     @property
     def website_url(self):
         return f"/arrangementer/{self.id}/"
@@ -106,7 +134,7 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
     @property
     def list_count(self):
         """Number of users registered to attend the event"""
-        return self.get_participants().count()
+        return self.cached_list_count
 
     @property
     def has_participants(self):
@@ -116,7 +144,47 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
     @property
     def waiting_list_count(self):
         """Number of users on the waiting list"""
-        return self.get_waiting_list().count()
+        return self.cached_waiting_list_count
+
+    def update_registration_counts(self, list_delta=0, waiting_list_delta=0):
+        """Applies a change in participants and waiting list to the stored counters"""
+        if not list_delta and not waiting_list_delta:
+            return
+
+        Event.objects.filter(pk=self.pk).update(
+            cached_list_count=F("cached_list_count") + list_delta,
+            cached_waiting_list_count=F("cached_waiting_list_count")
+            + waiting_list_delta,
+        )
+        self.cached_list_count += list_delta
+        self.cached_waiting_list_count += waiting_list_delta
+
+    def refresh_registration_counts(self):
+        """
+        Recounts the registrations of the event and stores the result.
+        Returns True if the stored counters had drifted from the actual count.
+        """
+        with transaction.atomic():
+            Event.objects.select_for_update().filter(pk=self.pk).exists()
+            counts = self.registrations.aggregate(
+                list_count=Count("pk", filter=Q(is_on_wait=False)),
+                waiting_list_count=Count("pk", filter=Q(is_on_wait=True)),
+            )
+            has_drifted = (
+                Event.objects.filter(pk=self.pk)
+                .exclude(
+                    cached_list_count=counts["list_count"],
+                    cached_waiting_list_count=counts["waiting_list_count"],
+                )
+                .update(
+                    cached_list_count=counts["list_count"],
+                    cached_waiting_list_count=counts["waiting_list_count"],
+                )
+            )
+
+        self.cached_list_count = counts["list_count"]
+        self.cached_waiting_list_count = counts["waiting_list_count"]
+        return bool(has_drifted)
 
     def move_users_from_waiting_list_to_queue(self, count):
         """Moves the first x users from waiting list to queue"""
@@ -173,14 +241,14 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
         return now() >= self.end_date
 
     def has_waiting_list(self):
-        return self.has_limit() and (self.is_full or self.get_waiting_list().exists())
+        return self.has_limit() and (self.is_full or self.waiting_list_count > 0)
 
     def has_limit(self):
         return self.limit != 0
 
     @property
     def is_full(self):
-        return self.has_limit() and self.get_participants().count() >= self.limit
+        return self.has_limit() and self.list_count >= self.limit
 
     def has_priorities(self):
         return self.priority_pools.exists()
@@ -193,9 +261,6 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
     def survey(self):
         return self.forms.filter(type=NativeEventFormType.SURVEY).first()
 
-    def check_request_user_has_access_through_organizer(self, user, organizer):
-        return user.memberships_with_events_access.filter(group=organizer).exists()
-
     def has_object_statistics_permission(self, request):
         return self.has_object_write_permission(request)
 
@@ -210,10 +275,9 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
         if request.user is None:
             return False
 
+        group_access = get_group_access(request)
         has_access_to_new_organizer = (
-            self.check_request_user_has_access_through_organizer(
-                request.user, request.data["organizer"]
-            )
+            group_access.has_events_access(request.data["organizer"])
             if request.data.get("organizer", None)
             and request.data["organizer"] != self.organizer
             else True
@@ -221,13 +285,11 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
 
         has_access_to_current_and_new_organizer = (
             (
-                self.check_request_user_has_access_through_organizer(
-                    request.user, self.organizer
-                )
+                group_access.has_events_access(self.organizer)
                 and has_access_to_new_organizer
             )
             if self.organizer
-            else request.user.memberships_with_events_access.exists()
+            else group_access.has_events_access()
         )
 
         return (
@@ -239,15 +301,14 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
     def has_write_permission(cls, request):
         if request.user is None:
             return False
+        group_access = get_group_access(request)
         return (
             (
                 check_has_access(cls.write_access, request)
-                or cls.check_request_user_has_access_through_organizer(
-                    cls, request.user, request.data["organizer"]
-                )
+                or group_access.has_events_access(request.data["organizer"])
             )
             if request.data.get("organizer", None)
-            else request.user.memberships_with_events_access.exists()
+            else group_access.has_events_access()
         )
 
     @classmethod
@@ -335,3 +396,16 @@ class Event(BaseModel, OptionalImage, BasePermissionModel):
             raise ValidationError(
                 "End date for event cannot be before the event start_date."
             )
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_responses(sender, instance, **_kwargs):
+    bump_event_version(instance.pk, include_list=True)
+
+
+@receiver(m2m_changed, sender=Event.favorite_users.through)
+def invalidate_event_lists_on_favorite(sender, action, **_kwargs):
+    """The event lists can be filtered by the favorites of the user"""
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_event_list_version()
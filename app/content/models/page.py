@@ -1,6 +1,9 @@
 import uuid
 
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 
 from mptt.models import MPTTModel, TreeForeignKey
@@ -9,6 +12,42 @@ from ordered_model.models import OrderedModel, OrderedModelManager
 from app.common.enums import AdminGroup
 from app.common.permissions import BasePermissionModel
 from app.util.models import BaseModel, OptionalImage
+from app.util.utils import bump_cache_version, get_cache_version
+
+PAGE_PATHS_VERSION_KEY = "pages:paths_version"
+PAGE_PATHS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class PagePaths:
+    """
+    The path of every page in the tree, built from a single query, which answers
+    path lookups in both directions without walking the tree.
+    """
+
+    def __init__(self, pages):
+        """pages -> (page_id, parent_id, slug) of every page"""
+        children = {}
+        for page_id, parent_id, slug in pages:
+            children.setdefault(parent_id, []).append((page_id, slug))
+
+        self.root_count = len(children.get(None, []))
+        self.paths = {}
+        unvisited = [(page_id, "") for page_id, _ in children.get(None, [])]
+        while unvisited:
+            page_id, path = unvisited.pop()
+            self.paths[page_id] = path
+            unvisited.extend(
+                (child_id, f"{path}{slug}/")
+                for child_id, slug in children.get(page_id, [])
+            )
+        self.page_ids = {path: page_id for page_id, path in self.paths.items()}
+
+    def get_page_id(self, path):
+        path = path.strip("/")
+        return self.page_ids.get(f"{path}/" if path else "")
+
+    def get_path(self, page_id):
+        return self.paths.get(page_id)
 
 
 class Page(MPTTModel, OptionalImage, BaseModel, BasePermissionModel, OrderedModel):
@@ -33,29 +72,61 @@ class Page(MPTTModel, OptionalImage, BaseModel, BasePermissionModel, OrderedMode
         self.slug = slugify(self.title)
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def get_paths():
+        """Returns the paths of all pages, cached until a page is saved or deleted"""
+        key = f"pages:paths:{get_cache_version(PAGE_PATHS_VERSION_KEY)}"
+        paths = cache.get(key)
+        if paths is None:
+            paths = PagePaths(
+                Page.objects.order_by().values_list("page_id", "parent_id", "slug")
+            )
+            cache.set(key, paths, PAGE_PATHS_CACHE_TIMEOUT)
+        return paths
+
     @staticmethod
     def get_by_path(path):
-        node = Page.objects.get(parent=None)
-        if path == "":
-            return node
-        page_list = path.split("/")
-        if page_list[-1] == "":
-            page_list.remove("")
-        for page in page_list:
-            node = next(child for child in node.get_children() if child.slug == page)
-        if node.slug != page_list[-1]:
+        paths = Page.get_paths()
+        if path == "" or paths.root_count != 1:
+            # Raises DoesNotExist or MultipleObjectsReturned if the tree has no single root
+            node = Page.objects.get(parent=None)
+            if path == "":
+                return node
+
+        page_id = paths.get_page_id(path)
+        if page_id is None:
             raise Page.DoesNotExist
-        return node
+        return Page.objects.get(page_id=page_id)
 
     def get_path(self):
+        path = Page.get_paths().get_path(self.page_id)
+        if path is not None:
+            return path
+
         family = self.get_ancestors(include_self=True)[1:]
         path = ""
         for member in family:
             path += f"{member.slug}/"
         return path
 
+    def get_tree(self):
+        """
+        Returns the children of every page below this page by the id of their parent,
+        loaded with a single query of the MPTT range of this page
+        """
+        children = {}
+        for page in self.get_descendants().order_by("order"):
+            children.setdefault(page.parent_id, []).append(page)
+        return children
+
     def __str__(self):
         return f"{self.page_id} {self.title}"
 
     def get_children(self):
         return super().get_children().order_by("order")
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def invalidate_page_paths(sender, **_kwargs):
+    bump_cache_version(PAGE_PATHS_VERSION_KEY)
@@ -1,6 +1,9 @@
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
 from app.content.models import Event
+from app.content.util.event_response_cache import bump_event_version
 from app.group.models import Group
 from app.util.models import BaseModel
 
@@ -17,3 +20,26 @@ class PriorityPool(BaseModel):
 
     def __str__(self):
         return "Priority Pool: " + ", ".join(self.groups.values_list("name", flat=True))
+
+
+@receiver(post_save, sender=PriorityPool)
+@receiver(post_delete, sender=PriorityPool)
+def invalidate_event_responses(sender, instance, **_kwargs):
+    bump_event_version(instance.event_id)
+
+
+@receiver(m2m_changed, sender=PriorityPool.groups.through)
+def invalidate_event_responses_of_groups(
+    sender, instance, action, reverse, pk_set, **_kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        bump_event_version(instance.event_id)
+        return
+
+    # The groups were changed from the group side, where pk_set holds the priority pools
+    for event_id in PriorityPool.objects.filter(pk__in=pk_set or ()).values_list(
+        "event_id", flat=True
+    ):
+        bump_event_version(event_id)
@@ -3,6 +3,8 @@ from datetime import timedelta
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from sentry_sdk import capture_exception
 
@@ -19,7 +21,14 @@ from app.content.exceptions import (
 from app.content.models.event import Event
 from app.content.models.strike import create_strike
 from app.content.models.user import User
-from app.content.util.registration_utils import get_payment_expiredate
+from app.content.util.registration_utils import (
+    bump_registration_version,
+    get_payment_expiredate,
+    get_prioritized_user_ids,
+    get_wait_queue_numbers,
+    partition_by_priority,
+)
+from app.content.util.seat_ledger import SeatLedger
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.payment.util.order_utils import check_if_order_is_paid, has_paid_order
 from app.util import now
@@ -49,6 +58,19 @@ class Registration(BaseModel, BasePermissionModel):
         verbose_name = "Registration"
         verbose_name_plural = "Registrations"
 
+    # Waiting list state as stored in the database, used to keep the
+    # registration counters on the event in sync on save.
+    _stored_is_on_wait = None
+
+    # Set when the seat ledger has already decided if a new registration gets a spot
+    seat_reserved = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stored_is_on_wait = dict(zip(field_names, values)).get("is_on_wait")
+        return instance
+
     @classmethod
     def has_retrieve_permission(cls, _request):
         return True
@@ -193,14 +215,10 @@ class Registration(BaseModel, BasePermissionModel):
             )
             moved_registration = None
             if waiting_list:
-                moved_registration = next(
-                    (
-                        waitlist_registration
-                        for waitlist_registration in waiting_list
-                        if waitlist_registration.is_prioritized
-                    ),
-                    waiting_list[0],
+                prioritized, not_prioritized = partition_by_priority(
+                    event, waiting_list
                 )
+                moved_registration = (prioritized or not_prioritized)[0]
                 moved_registration.is_on_wait = False
                 if event.is_paid_event:
                     moved_registration.payment_expiredate = get_payment_expiredate()
@@ -218,8 +236,10 @@ class Registration(BaseModel, BasePermissionModel):
                     "updated_at",
                 ]
             )
+            registration.update_event_registration_counts()
 
             if moved_registration:
+                moved_registration.event = event
                 moved_registration.save()
 
             self.is_on_wait = registration.is_on_wait
@@ -258,15 +278,33 @@ class Registration(BaseModel, BasePermissionModel):
         if not self.registration_id:
             self.create()
 
-        if (
-            self.event.is_full
-            and not self.is_on_wait
-            and self in self.event.get_waiting_list()
-        ):
+        if self.event.is_full and not self.is_on_wait and self._stored_is_on_wait:
             raise EventIsFullError()
 
         self.send_notification_and_mail()
-        return super().save(*args, **kwargs)
+        registration = super().save(*args, **kwargs)
+        self.update_event_registration_counts()
+        return registration
+
+    def update_event_registration_counts(self):
+        """Moves this registration between the counters of the event after a save"""
+        if self._stored_is_on_wait == self.is_on_wait:
+            return
+
+        list_delta = 0 if self.is_on_wait else 1
+        waiting_list_delta = 1 if self.is_on_wait else 0
+        if self._stored_is_on_wait is not None:
+            list_delta -= 0 if self._stored_is_on_wait else 1
+            waiting_list_delta -= 1 if self._stored_is_on_wait else 0
+
+        self.event.update_registration_counts(list_delta, waiting_list_delta)
+        self._stored_is_on_wait = self.is_on_wait
+
+        if self.seat_reserved:
+            # The seat ledger counted this registration when it was admitted
+            list_delta -= 1
+            self.seat_reserved = None
+        SeatLedger(self.event).adjust(list_delta)
 
     def create(self):
         if self.event.enforces_previous_strikes and not self.created_by_admin:
@@ -275,7 +313,9 @@ class Registration(BaseModel, BasePermissionModel):
 
         self.clean()
 
-        self.is_on_wait = self.event.is_full
+        self.is_on_wait = (
+            self.event.is_full if self.seat_reserved is None else not self.seat_reserved
+        )
 
         if self.should_swap_with_non_prioritized_user():
             self.swap_users()
@@ -317,7 +357,7 @@ class Registration(BaseModel, BasePermissionModel):
             "Husk at du må melde deg på igjen hvis du ønsker plass på ventelisten."
         ).add_event_link(
             self.event.pk
-        ).send()
+        ).send_async()
 
     def send_notification_and_mail(self):
         has_not_attended = not self.has_attended
@@ -332,7 +372,7 @@ class Registration(BaseModel, BasePermissionModel):
                 f"Du kan melde deg av innen {datetime_format(self.event.sign_off_deadline)}."
             ).add_event_link(
                 self.event.pk
-            ).send()
+            ).send_async()
         elif self.is_on_wait and has_not_attended:
             Notify(
                 [self.user],
@@ -346,7 +386,7 @@ class Registration(BaseModel, BasePermissionModel):
                 f"PS. De vanlige reglene for prikker gjelder også for venteliste, husk derfor å melde deg av arrangementet innen {datetime_format(self.event.sign_off_deadline)} dersom du ikke kan møte."
             ).add_event_link(
                 self.event.pk
-            ).send()
+            ).send_async()
 
     def send_notification_and_mail_for_refund(self, order):
         Notify(
@@ -374,20 +414,7 @@ class Registration(BaseModel, BasePermissionModel):
         if self.created_by_admin:
             return True
 
-        if self.user.number_of_strikes >= 3 and self.event.enforces_previous_strikes:
-            return False
-
-        user_groups = set(self.user.group_members.values_list("slug", flat=True))
-        pools = self.event.priority_pools.prefetch_related("groups").all()
-
-        for pool in pools:
-            pool_groups = set(pool.groups.values_list("slug", flat=True))
-            is_in_priority_pool = pool_groups.issubset(user_groups) and len(pool_groups)
-
-            if is_in_priority_pool:
-                return True
-
-        return False
+        return self.user_id in get_prioritized_user_ids(self.event, [self.user_id])
 
     @property
     def wait_queue_number(self):
@@ -395,43 +422,16 @@ class Registration(BaseModel, BasePermissionModel):
         if not self.is_on_wait:
             return None
 
-        # Retrieve all registrations for the event that are on the waitlist and order them by creation time.
-        waiting_list_registrations = self.event.registrations.filter(
-            is_on_wait=True
-        ).order_by("created_at")
-
-        # Separate the waiting list registrations into prioritized and non-prioritized groups.
-        prioritized_registrations = [
-            reg for reg in waiting_list_registrations if reg.is_prioritized
-        ]
-        non_prioritized_registrations = [
-            reg for reg in waiting_list_registrations if not reg.is_prioritized
-        ]
-
-        # If the registration is prioritized, calculate its queue position among other prioritized registrations.
-        if self.is_prioritized:
-            if self in prioritized_registrations:
-                queue_position = prioritized_registrations.index(self) + 1
-            else:
-                return None
-        else:
-            # For non-prioritized registrations, calculate queue position considering all prioritized registrations first.
-            if self in non_prioritized_registrations:
-                queue_position = (
-                    len(prioritized_registrations)
-                    + non_prioritized_registrations.index(self)
-                    + 1
-                )
-            else:
-                return None
-
-        return queue_position
+        # Prioritized registrations are ahead of the others, each group ordered by creation time.
+        return get_wait_queue_numbers(self.event).get(self.registration_id)
 
     def swap_users(self):
         """Swaps a user with a spot with a prioritized user, if such user exists"""
-        for registration in self.event.get_participants().order_by("-created_at"):
-            if not registration.is_prioritized:
-                return self.swap_places_with(registration)
+        _, non_prioritized_registrations = partition_by_priority(
+            self.event, self.event.get_participants().order_by("-created_at")
+        )
+        if non_prioritized_registrations:
+            return self.swap_places_with(non_prioritized_registrations[0])
 
     def swap_places_with(self, other_registration):
         """Puts own self on the list and other_registration on wait"""
@@ -440,18 +440,16 @@ class Registration(BaseModel, BasePermissionModel):
         self.is_on_wait = False
 
     def move_from_waiting_list_to_queue(self):
-        registrations_in_waiting_list = self.event.get_waiting_list().order_by(
-            "created_at"
+        prioritized_registrations, non_prioritized_registrations = (
+            partition_by_priority(
+                self.event, self.event.get_waiting_list().order_by("created_at")
+            )
+        )
+        registrations_in_waiting_list = (
+            prioritized_registrations + non_prioritized_registrations
         )
         if registrations_in_waiting_list:
-            registration_move_to_queue = next(
-                (
-                    registration
-                    for registration in registrations_in_waiting_list
-                    if registration.is_prioritized
-                ),
-                registrations_in_waiting_list[0],
-            )
+            registration_move_to_queue = registrations_in_waiting_list[0]
             registration_move_to_queue.is_on_wait = False
 
             if self.event.is_paid_event:
@@ -460,17 +458,17 @@ class Registration(BaseModel, BasePermissionModel):
             return registration_move_to_queue
 
     def move_from_queue_to_waiting_list(self):
-        registrations_in_queue = self.event.get_participants().order_by("-created_at")
+        prioritized_registrations, non_prioritized_registrations = (
+            partition_by_priority(
+                self.event, self.event.get_participants().order_by("-created_at")
+            )
+        )
+        registrations_in_queue = (
+            non_prioritized_registrations + prioritized_registrations
+        )
 
         if registrations_in_queue:
-            registration_move_to_waiting_list = next(
-                (
-                    registration
-                    for registration in registrations_in_queue
-                    if not registration.is_prioritized
-                ),
-                registrations_in_queue[0],
-            )
+            registration_move_to_waiting_list = registrations_in_queue[0]
             registration_move_to_waiting_list.is_on_wait = True
             return registration_move_to_waiting_list
 
@@ -524,3 +522,30 @@ class Registration(BaseModel, BasePermissionModel):
 
         forms = EventForm.objects.filter(query)
         return Submission.objects.filter(form__in=forms, user=self.user)
+
+
+@receiver(post_delete, sender=Registration)
+def remove_registration_from_event_counts(sender, instance, **_kwargs):
+    """Decrements the counters on the event, also when deleted through a cascade"""
+    event = (
+        instance.event
+        if Registration.event.is_cached(instance)
+        else Event(pk=instance.event_id)
+    )
+    # The counters follow the stored row, which an unsaved change may differ from
+    is_on_wait = (
+        instance.is_on_wait
+        if instance._stored_is_on_wait is None
+        else instance._stored_is_on_wait
+    )
+    if is_on_wait:
+        event.update_registration_counts(waiting_list_delta=-1)
+    else:
+        event.update_registration_counts(list_delta=-1)
+        SeatLedger(event).adjust(-1)
+
+
+@receiver(post_save, sender=Registration)
+@receiver(post_delete, sender=Registration)
+def invalidate_registration_version(sender, instance, **_kwargs):
+    bump_registration_version(instance.event_id)
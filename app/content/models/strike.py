@@ -99,7 +99,7 @@ class Strike(BaseModel, BasePermissionModel):
                 self.description
             ).add_paragraph(
                 "Prikken varer i 20 dager. Ta kontakt med arrangøren om du er uenig. Konsekvenser kan sees i arrangementsreglene. Du kan finne dine aktive prikker og mer info om dem i profilen."
-            ).send()
+            ).send_async()
         super(Strike, self).save(*args, **kwargs)
 
     @property
@@ -8,7 +8,8 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
-from django.db.models import Q
+from django.db.models import OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
@@ -21,7 +22,36 @@ from app.util.models import BaseModel, OptionalImage
 from app.util.utils import disable_for_loaddata, now
 
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    def with_profile(self):
+        """
+        Annotates the sum of active strikes and prefetches the study and studyyear
+        memberships, which the user serializers read without querying per user.
+        """
+        from app.content.models.strike import Strike
+        from app.group.models import Membership
+
+        active_strikes = (
+            Strike.objects.active(user=OuterRef("pk"))
+            .order_by()
+            .values("user")
+            .annotate(total=Sum("strike_size"))
+            .values("total")
+        )
+        return self.annotate(
+            _number_of_strikes=Coalesce(Subquery(active_strikes), 0)
+        ).prefetch_related(
+            Prefetch(
+                "memberships",
+                queryset=Membership.objects.filter(
+                    group__type__in=[GroupType.STUDY, GroupType.STUDYYEAR]
+                ).select_related("group"),
+                to_attr="_study_memberships",
+            )
+        )
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     use_in_migrations = True
 
     def create_user(self, user_id, password, **extra_fields):
@@ -131,15 +161,29 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel, OptionalImage):
 
     @property
     def number_of_strikes(self):
+        if hasattr(self, "_number_of_strikes"):
+            return self._number_of_strikes
         return self.strikes.sum_active()
 
     @property
     def study(self):
-        return self.memberships.filter(group__type=GroupType.STUDY).first()
+        return self._get_membership_of_group_type(GroupType.STUDY)
 
     @property
     def studyyear(self):
-        return self.memberships.filter(group__type=GroupType.STUDYYEAR).first()
+        return self._get_membership_of_group_type(GroupType.STUDYYEAR)
+
+    def _get_membership_of_group_type(self, group_type):
+        if hasattr(self, "_study_memberships"):
+            return next(
+                (
+                    membership
+                    for membership in self._study_memberships
+                    if membership.group.type == group_type
+                ),
+                None,
+            )
+        return self.memberships.filter(group__type=group_type).first()
 
     objects = UserManager()
 
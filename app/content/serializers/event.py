@@ -1,9 +1,10 @@
+from django.db.models import Count, Exists, F, OuterRef, Q
 from rest_framework import serializers
 
-from dry_rest_permissions.generics import DRYPermissionsField
 from sentry_sdk import capture_exception
 
 from app.common.enums import NativeGroupType as GroupType
+from app.common.permissions import PermissionsField
 from app.common.serializers import BaseModelSerializer
 from app.content.models import Event, PriorityPool
 from app.content.serializers.category import SimpleCategorySerializer
@@ -13,7 +14,7 @@ from app.content.serializers.priority_pool import (
 )
 from app.content.serializers.user import DefaultUserSerializer
 from app.emoji.serializers.reaction import ReactionSerializer
-from app.group.models.group import Group
+from app.group.models.membership import Membership
 from app.group.serializers.group import SimpleGroupSerializer
 from app.payment.enums import OrderStatus
 from app.payment.models.paid_event import PaidEvent
@@ -26,7 +27,7 @@ class EventSerializer(serializers.ModelSerializer):
     evaluation = serializers.PrimaryKeyRelatedField(many=False, read_only=True)
     survey = serializers.PrimaryKeyRelatedField(many=False, read_only=True)
     organizer = SimpleGroupSerializer(read_only=True)
-    permissions = DRYPermissionsField(
+    permissions = PermissionsField(
         actions=["write", "read"], object_only=True, read_only=True
     )
     paid_information = serializers.SerializerMethodField(
@@ -284,61 +285,84 @@ class EventStatisticsSerializer(BaseModelSerializer):
         )
 
     def get_has_attended_count(self, obj, *_args, **_kwargs):
-        return obj.registrations.filter(is_on_wait=False, has_attended=True).count()
+        return self._get_counts(obj)["has_attended_count"]
 
     def get_has_allergy_count(self, obj, *args, **kwargs):
-        return (
-            obj.registrations.exclude(user__allergy__isnull=True)
-            .filter(is_on_wait=False)
-            .exclude(user__allergy__exact="")
-            .count()
-        )
+        return self._get_counts(obj)["has_allergy_count"]
 
     def get_studyyears(self, obj, *args, **kwargs):
-        return filter(
-            lambda studyyear: studyyear["amount"] > 0,
-            map(
-                lambda group: {
-                    "studyyear": group.name,
-                    "amount": obj.registrations.filter(
-                        user__memberships__group=group, is_on_wait=False
-                    ).count(),
-                },
-                Group.objects.filter(type=GroupType.STUDYYEAR),
-            ),
-        )
+        return [
+            {"studyyear": group["name"], "amount": group["amount"]}
+            for group in self._get_group_counts(obj)
+            if group["type"] == GroupType.STUDYYEAR
+        ]
 
     def get_studies(self, obj, *_args, **_kwargs):
-        return filter(
-            lambda study: study["amount"] > 0,
-            map(
-                lambda group: {
-                    "study": group.name,
-                    "amount": obj.registrations.filter(
-                        user__memberships__group=group, is_on_wait=False
-                    ).count(),
-                },
-                Group.objects.filter(type=GroupType.STUDY),
-            ),
-        )
+        return [
+            {"study": group["name"], "amount": group["amount"]}
+            for group in self._get_group_counts(obj)
+            if group["type"] == GroupType.STUDY
+        ]
 
     def get_allow_photo_count(self, obj, *args, **kwargs):
-        return obj.registrations.filter(allow_photo=False, is_on_wait=False).count()
+        return self._get_counts(obj)["allow_photo_count"]
 
     def get_has_not_paid_count(self, obj, *args, **kwargs):
-        if obj.is_paid_event:
-            registrations = obj.registrations.filter(is_on_wait=False).count()
-            orders = obj.orders.filter(status=OrderStatus.SALE, event=obj).count()
-            return registrations - orders
-        return 0
+        return self._get_counts(obj)["has_not_paid_count"]
 
     def get_suspicious_payment_count(self, obj, *args, **kwargs):
-        if not obj.is_paid_event:
-            return 0
+        return self._get_counts(obj)["suspicious_payment_count"]
+
+    def _get_counts(self, obj):
+        """Counts the participants of the event in a single query"""
+        if hasattr(self, "_counts"):
+            return self._counts
+
+        from app.payment.models import Order
         from app.payment.util.order_utils import annotate_suspicious_payment
 
-        return (
-            annotate_suspicious_payment(obj.registrations.filter(is_on_wait=False))
-            .filter(_has_suspicious_payment=True)
-            .count()
+        participants = obj.registrations.filter(is_on_wait=False)
+        counts = {
+            "has_attended_count": Count("pk", filter=Q(has_attended=True)),
+            "has_allergy_count": Count(
+                "pk", filter=Q(user__allergy__isnull=False) & ~Q(user__allergy="")
+            ),
+            "allow_photo_count": Count("pk", filter=Q(allow_photo=False)),
+        }
+        if obj.is_paid_event:
+            participants = annotate_suspicious_payment(participants)
+            has_sale_order = Exists(
+                Order.objects.filter(
+                    event=OuterRef("event_id"),
+                    user=OuterRef("user_id"),
+                    status=OrderStatus.SALE,
+                )
+            )
+            counts["has_not_paid_count"] = Count("pk", filter=~has_sale_order)
+            counts["suspicious_payment_count"] = Count(
+                "pk", filter=Q(_has_suspicious_payment=True)
+            )
+
+        self._counts = {
+            "has_not_paid_count": 0,
+            "suspicious_payment_count": 0,
+            **participants.aggregate(**counts),
+        }
+        return self._counts
+
+    def _get_group_counts(self, obj):
+        """Counts the participants of each study and studyyear in a single grouped query"""
+        if hasattr(self, "_group_counts"):
+            return self._group_counts
+
+        self._group_counts = list(
+            Membership.objects.filter(
+                group__type__in=[GroupType.STUDY, GroupType.STUDYYEAR],
+                user__registrations__event=obj,
+                user__registrations__is_on_wait=False,
+            )
+            .values("group__slug")
+            .annotate(name=F("group__name"), type=F("group__type"), amount=Count("pk"))
+            .order_by("group__slug")
         )
+        return self._group_counts
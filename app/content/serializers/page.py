@@ -51,4 +51,11 @@ class PageTreeSerializer(serializers.ModelSerializer):
         fields = ["slug", "title", "order", "children"]
 
     def get_children(self, obj):
-        return [PageTreeSerializer(page).data for page in obj.get_children()]
+        # The whole tree is loaded at once by the root, and passed down to its children
+        tree = self.context.get("tree")
+        if tree is None:
+            tree = obj.get_tree()
+        return [
+            PageTreeSerializer(page, context={**self.context, "tree": tree}).data
+            for page in tree.get(obj.page_id, [])
+        ]
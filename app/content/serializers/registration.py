@@ -6,16 +6,17 @@ from app.content.serializers.user import (
     DefaultUserSerializer,
     UserListSerializer,
 )
-from app.content.util.registration_utils import get_payment_expiredate
+from app.content.util.registration_utils import (
+    get_payment_expiredate,
+    get_wait_queue_numbers,
+)
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.forms.serializers.submission import SubmissionInRegistrationSerializer
-from app.payment.enums import OrderStatus
 from app.payment.serializers.order import OrderEventRegistrationSerializer
 from app.payment.util.order_utils import (
     has_paid_order,
     is_suspicious_registration,
 )
-from app.payment.util.payment_utils import get_payment_order_status
 
 
 class RegistrationSerializer(BaseModelSerializer):
@@ -47,21 +48,25 @@ class RegistrationSerializer(BaseModelSerializer):
         )
 
     def get_survey_submission(self, obj):
-        submissions = obj.get_submissions(type=EventFormType.SURVEY).first()
-        return SubmissionInRegistrationSerializer(submissions).data
+        if hasattr(obj.user, "_survey_submissions"):
+            submission = next(iter(obj.user._survey_submissions), None)
+        else:
+            submission = obj.get_submissions(type=EventFormType.SURVEY).first()
+        return SubmissionInRegistrationSerializer(submission).data
 
     def get_has_unanswered_evaluation(self, obj):
+        if hasattr(obj, "_has_unanswered_evaluation"):
+            return obj._has_unanswered_evaluation
         return obj.user.has_unanswered_evaluations_for(obj.event)
 
-    def get_has_paid_order(self, obj):
-        orders = obj.event.orders.filter(user=obj.user)
-
-        if orders and (order := orders.first()).status == OrderStatus.INITIATE:
-            order_status = get_payment_order_status(order.order_id)
-            order.status = order_status
-            order.save()
+    def _get_orders(self, obj):
+        if hasattr(obj.user, "_event_orders"):
+            return obj.user._event_orders
+        return obj.event.orders.filter(user=obj.user)
 
-        return has_paid_order(orders)
+    def get_has_paid_order(self, obj):
+        # The local status is kept up to date by the Vipps callback and reconcile_order_statuses
+        return has_paid_order(self._get_orders(obj))
 
     def get_has_suspicious_payment(self, obj):
         if hasattr(obj, "_has_suspicious_payment"):
@@ -69,8 +74,9 @@ class RegistrationSerializer(BaseModelSerializer):
         return is_suspicious_registration(obj)
 
     def get_payment_orders(self, obj):
-        orders = obj.event.orders.filter(user=obj.user)
-        return OrderEventRegistrationSerializer(orders, many=True, read_only=True).data
+        return OrderEventRegistrationSerializer(
+            self._get_orders(obj), many=True, read_only=True
+        ).data
 
     def create(self, validated_data):
         event = validated_data["event"]
@@ -81,9 +87,17 @@ class RegistrationSerializer(BaseModelSerializer):
         return super().create(validated_data)
 
     def get_wait_queue_number(self, obj):
-        if obj.is_on_wait:
+        if not obj.is_on_wait:
+            return None
+        if self.parent is None:
             return obj.wait_queue_number
-        return None
+
+        # A list of registrations shares one computation of the waiting list per event
+        if not hasattr(self, "_wait_queue_numbers"):
+            self._wait_queue_numbers = {}
+        if obj.event_id not in self._wait_queue_numbers:
+            self._wait_queue_numbers[obj.event_id] = get_wait_queue_numbers(obj.event)
+        return self._wait_queue_numbers[obj.event_id].get(obj.registration_id)
 
 
 class PublicRegistrationSerializer(BaseModelSerializer):
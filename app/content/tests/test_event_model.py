@@ -2,11 +2,13 @@ from datetime import timedelta
 from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 
 import pytest
 
 from app.content.factories import EventFactory, RegistrationFactory
 from app.content.factories.priority_pool_factory import PriorityPoolFactory
+from app.content.models import Event, Registration
 from app.util.utils import now
 
 
@@ -280,3 +282,100 @@ def test_check_start_registration_is_after_deadline(event):
 
     with pytest.raises(ValidationError):
         event.check_start_registration_is_after_deadline()
+
+
+@pytest.mark.django_db
+def test_registration_counts_are_stored_on_event(event):
+    """Should keep the stored counters in sync when registrations are created."""
+    event.limit = 2
+    event.save()
+    RegistrationFactory.create_batch(3, event=event)
+
+    stored_event = Event.objects.get(pk=event.pk)
+
+    assert stored_event.list_count == 2
+    assert stored_event.waiting_list_count == 1
+
+
+@pytest.mark.django_db
+def test_registration_counts_when_registration_is_deleted(event):
+    """Should move the first user on the waiting list up when a participant is deleted."""
+    event.limit = 1
+    event.save()
+    registration = RegistrationFactory(event=event)
+    RegistrationFactory(event=event)
+
+    registration.delete()
+
+    stored_event = Event.objects.get(pk=event.pk)
+
+    assert stored_event.list_count == 1
+    assert stored_event.waiting_list_count == 0
+
+
+@pytest.mark.django_db
+def test_registration_counts_when_user_is_deleted(event):
+    """Should decrement the counters when registrations are deleted through a cascade."""
+    registration = RegistrationFactory(event=event)
+
+    registration.user.delete()
+
+    assert Event.objects.get(pk=event.pk).list_count == 0
+
+
+@pytest.mark.django_db
+def test_registration_counts_when_unsaved_registration_is_deleted(event):
+    """Should decrement the counter of the stored row, not of an unsaved change."""
+    RegistrationFactory(event=event)
+    registration = Registration.objects.get(event=event)
+
+    registration.is_on_wait = True
+    registration.delete()
+
+    stored_event = Event.objects.get(pk=event.pk)
+
+    assert stored_event.list_count == 0
+    assert stored_event.waiting_list_count == 0
+
+
+@pytest.mark.django_db
+def test_save_of_stale_event_does_not_overwrite_registration_counts(event):
+    """Should not write the in-memory counters of an event on save."""
+    stale_event = Event.objects.get(pk=event.pk)
+    RegistrationFactory(event=event)
+
+    stale_event.title = "Updated title"
+    stale_event.save()
+
+    stored_event = Event.objects.get(pk=event.pk)
+
+    assert stored_event.title == "Updated title"
+    assert stored_event.list_count == 1
+
+
+@pytest.mark.django_db
+def test_refresh_registration_counts_fixes_drift(event):
+    """Should recount the registrations and report that the counters had drifted."""
+    RegistrationFactory.create_batch(2, event=event)
+    Event.objects.filter(pk=event.pk).update(
+        cached_list_count=10, cached_waiting_list_count=3
+    )
+
+    assert event.refresh_registration_counts()
+    assert not event.refresh_registration_counts()
+
+    stored_event = Event.objects.get(pk=event.pk)
+
+    assert stored_event.list_count == 2
+    assert stored_event.waiting_list_count == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_registration_counts_command(event):
+    """Should fix the counters of every event that has drifted."""
+    RegistrationFactory(event=event)
+    Event.objects.filter(pk=event.pk).update(cached_list_count=0)
+
+    call_command("reconcile_registration_counts")
+
+    assert Event.objects.get(pk=event.pk).list_count == 1
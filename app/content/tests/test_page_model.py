@@ -1,6 +1,7 @@
 import pytest
 
 from app.content.factories.page_factory import PageFactory, ParentPageFactory
+from app.content.models import Page
 
 
 @pytest.mark.django_db
@@ -33,3 +34,43 @@ def test_pages_reorder_with_initial_wrong_order():
 
     assert not page_created_first == first_child
     assert not page_created_second == second_child
+
+
+@pytest.mark.django_db
+def test_get_by_path_finds_nested_pages():
+    """Test that pages are found by their full path, with or without a trailing slash"""
+    root = ParentPageFactory()
+    parent = PageFactory(parent=root, title="Parent")
+    child = PageFactory(parent=parent, title="Child")
+
+    assert Page.get_by_path("") == root
+    assert Page.get_by_path("parent/child/") == child
+    assert Page.get_by_path("parent/child") == child
+    assert child.get_path() == "parent/child/"
+
+
+@pytest.mark.django_db
+def test_get_by_path_raises_for_unknown_path():
+    root = ParentPageFactory()
+    PageFactory(parent=root, title="Parent")
+
+    with pytest.raises(Page.DoesNotExist):
+        Page.get_by_path("parent/unknown/")
+
+
+@pytest.mark.django_db
+def test_moving_a_page_updates_the_paths_of_its_descendants():
+    root = ParentPageFactory()
+    parent = PageFactory(parent=root, title="Parent")
+    other = PageFactory(parent=root, title="Other")
+    child = PageFactory(parent=parent, title="Child")
+    assert child.get_path() == "parent/child/"
+
+    parent.refresh_from_db()
+    parent.parent = Page.objects.get(page_id=other.page_id)
+    parent.save()
+
+    assert Page.get_by_path("other/parent/child/") == child
+    assert child.get_path() == "other/parent/child/"
+    with pytest.raises(Page.DoesNotExist):
+        Page.get_by_path("parent/child/")
@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
+from django.db import transaction
 
 import pytest
 
@@ -12,6 +13,8 @@ from app.content.factories import (
     StrikeFactory,
     UserFactory,
 )
+from app.content.util.event_response_cache import get_event_version
+from app.content.util.registration_utils import get_registration_version
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.forms.models.forms import Submission
 from app.forms.tests.form_factories import EventFormFactory, SubmissionFactory
@@ -620,3 +623,72 @@ def test_wait_queue_number_is_correct_when_not_first_in_wait_list(
     assert registration_not_in_priority_pool.wait_queue_number is None
     assert second_registration_not_in_priority_pool.wait_queue_number == 1
     assert third_registration_not_in_priority_pool.wait_queue_number == 2
+
+
+def test_wait_queue_number_puts_prioritized_registrations_first(
+    event_with_priority_pool,
+    priority_group,
+    user_not_in_priority_pool,
+    user_in_priority_pool,
+):
+    other_user_in_priority_pool = UserFactory()
+    _add_user_to_group(other_user_in_priority_pool, priority_group)
+    RegistrationFactory(
+        event=event_with_priority_pool, user=other_user_in_priority_pool
+    )
+    registration_not_in_priority_pool = RegistrationFactory(
+        event=event_with_priority_pool, user=user_not_in_priority_pool
+    )
+    registration_in_priority_pool = RegistrationFactory(
+        event=event_with_priority_pool, user=user_in_priority_pool
+    )
+
+    assert registration_in_priority_pool.wait_queue_number == 1
+    assert registration_not_in_priority_pool.wait_queue_number == 2
+
+
+@pytest.mark.parametrize("waiting_list_size", [2, 20])
+def test_wait_queue_number_runs_constant_number_of_queries(
+    event_with_priority_pool,
+    priority_group,
+    waiting_list_size,
+    django_assert_max_num_queries,
+):
+    for _ in range(waiting_list_size + 1):
+        user = UserFactory()
+        _add_user_to_group(user, priority_group)
+        StrikeFactory(user=user, strike_size=1)
+        registration = RegistrationFactory(event=event_with_priority_pool, user=user)
+
+    with django_assert_max_num_queries(4):
+        assert registration.wait_queue_number == waiting_list_size
+
+
+def test_registration_rolled_back_keeps_the_cache_versions(
+    django_capture_on_commit_callbacks,
+):
+    """Responses built while the registration was uncommitted must not be cached as current"""
+    event = EventFactory()
+    registration_version = get_registration_version(event.pk)
+    event_version = get_event_version(event.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(ValueError), transaction.atomic():
+            RegistrationFactory(event=event)
+            raise ValueError
+
+    assert get_registration_version(event.pk) == registration_version
+    assert get_event_version(event.pk) == event_version
+
+
+def test_registration_bumps_the_cache_versions_once_committed(
+    django_capture_on_commit_callbacks,
+):
+    event = EventFactory()
+    registration_version = get_registration_version(event.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        RegistrationFactory(event=event)
+        assert get_registration_version(event.pk) == registration_version
+
+    assert get_registration_version(event.pk) > registration_version
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import pytest
+
+from app.content.factories import EventFactory
+from app.content.util.seat_ledger import LEDGER_TIMEOUT, SeatLedger
+
+
+@pytest.fixture()
+def redis(monkeypatch, settings):
+    settings.REGISTRATION_SEAT_LEDGER = True
+    connection = fakeredis.FakeStrictRedis()
+    monkeypatch.setattr(SeatLedger, "get_connection", staticmethod(lambda: connection))
+    return connection
+
+
+def get_ledger(limit, list_count=0):
+    return SeatLedger(
+        EventFactory.build(id=1, limit=limit, cached_list_count=list_count)
+    )
+
+
+def test_reserve_takes_the_last_seat_and_then_wait_lists(redis):
+    ledger = get_ledger(limit=2, list_count=1)
+
+    assert ledger.reserve("first") is True
+    assert ledger.reserve("second") is False
+    assert int(redis.get(ledger.seats_key)) == 2
+
+
+def test_reserve_wait_lists_when_the_event_is_full(redis):
+    ledger = get_ledger(limit=3, list_count=3)
+
+    assert ledger.reserve("user") is False
+
+
+def test_reserve_admits_everyone_without_a_limit(redis):
+    ledger = get_ledger(limit=0, list_count=100)
+
+    assert all(ledger.reserve(f"user{number}") for number in range(5))
+
+
+def test_concurrent_reserves_admit_exactly_the_seats_left(redis):
+    ledger = get_ledger(limit=10, list_count=4)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(ledger.reserve, [f"u{n}" for n in range(40)]))
+
+    assert results.count(True) == 6
+    assert results.count(False) == 34
+
+
+def test_seat_counter_expires(redis):
+    ledger = get_ledger(limit=10)
+
+    ledger.reserve("user")
+
+    assert 0 < redis.ttl(ledger.seats_key) <= LEDGER_TIMEOUT
+    assert redis.keys() == [ledger.seats_key.encode()]
+
+
+def test_release_gives_back_a_seat_and_missing_counters_are_left_unseeded(redis):
+    ledger = get_ledger(limit=1)
+
+    ledger.release()
+    assert not redis.exists(ledger.seats_key)
+
+    assert ledger.reserve("first") is True
+    ledger.release()
+    assert ledger.reserve("second") is True
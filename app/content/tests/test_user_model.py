@@ -1,8 +1,19 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
 import pytest
 
-from app.content.factories import RegistrationFactory, UserFactory
+from app.common.enums import NativeGroupType as GroupType
+from app.content.factories import (
+    RegistrationFactory,
+    StrikeFactory,
+    UserFactory,
+)
+from app.content.models import Strike, User
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.forms.tests.form_factories import EventFormFactory, SubmissionFactory
+from app.util.test_utils import add_user_to_group_with_name
 
 pytestmark = pytest.mark.django_db
 
@@ -64,3 +75,33 @@ def test_has_unanswered_evaluations_when_has_unanswered_evaluations_returns_fals
     has_unanswered_evaluations = user.has_unanswered_evaluations()
 
     assert has_unanswered_evaluations
+
+
+def test_with_profile_annotates_the_same_study_studyyear_and_strikes_as_the_user(
+    user,
+):
+    """The profile of a user should be the same whether it is annotated or queried."""
+    add_user_to_group_with_name(user, "Dataingeniør", GroupType.STUDY)
+    add_user_to_group_with_name(user, "2023", GroupType.STUDYYEAR)
+    StrikeFactory(user=user, strike_size=2)
+    StrikeFactory(user=user, strike_size=1)
+    expired_strike = StrikeFactory(user=user, strike_size=3)
+    Strike.objects.filter(id=expired_strike.id).update(
+        created_at=timezone.now() - timedelta(days=60)
+    )
+
+    annotated_user = User.objects.with_profile().get(user_id=user.user_id)
+
+    assert annotated_user.number_of_strikes == user.number_of_strikes == 3
+    assert annotated_user.study == user.study
+    assert annotated_user.studyyear == user.studyyear
+    assert annotated_user.study.group.type == GroupType.STUDY
+    assert annotated_user.studyyear.group.type == GroupType.STUDYYEAR
+
+
+def test_with_profile_when_user_has_no_study_or_strikes(user):
+    annotated_user = User.objects.with_profile().get(user_id=user.user_id)
+
+    assert annotated_user.number_of_strikes == 0
+    assert annotated_user.study is None
+    assert annotated_user.studyyear is None
@@ -17,6 +17,7 @@ from app.content.views import (
     UserViewSet,
     accept_form,
     photon_table_export,
+    photon_table_stream,
     photon_user_export,
     register_with_feide,
     send_email,
@@ -59,5 +60,6 @@ urlpatterns = [
     # remove once the migration is complete.
     path("migration/photon-user-export/", photon_user_export),
     path("migration/photon-table-export/", photon_table_export),
+    path("migration/photon-table-stream/", photon_table_stream),
     re_path(r"users/(?P<user_id>[^/.]+)/events.ics", UserCalendarEvents()),
 ]
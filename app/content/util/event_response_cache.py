@@ -0,0 +1,96 @@
+import hashlib
+import json
+from time import time
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+from app.common.permissions import get_group_access
+from app.util.utils import bump_cache_version, get_cache_version
+
+# Bounds how long changes which do not bump a version take to show,
+# like a renamed organizer or an event which has expired since
+EVENT_RESPONSE_CACHE_TIMEOUT = 60
+
+EVENT_LIST_VERSION_KEY = "events:list_version"
+
+
+def get_event_version_key(event_id):
+    return f"event:{event_id}:version"
+
+
+def get_event_version(event_id):
+    return get_cache_version(get_event_version_key(event_id))
+
+
+def get_event_list_version():
+    return get_cache_version(EVENT_LIST_VERSION_KEY)
+
+
+def bump_event_version(event_id, include_list=False):
+    """
+    Invalidates the cached responses of the event, and of the event lists if the
+    event itself changed. The versions are bumped once the transaction commits,
+    so responses built from uncommitted rows are not cached under them.
+    """
+    transaction.on_commit(lambda: bump_cache_version(get_event_version_key(event_id)))
+    if include_list:
+        bump_event_list_version()
+
+
+def bump_event_list_version():
+    transaction.on_commit(lambda: bump_cache_version(EVENT_LIST_VERSION_KEY))
+
+
+def get_cached_response_data(key, build):
+    """
+    Returns the cached response data and the timestamp of when it was built.
+    On a miss the data is built and cached.
+    """
+    cached = cache.get(key)
+    if cached is None:
+        cached = (build(), int(time()))
+        cache.set(key, cached, EVENT_RESPONSE_CACHE_TIMEOUT)
+    return cached
+
+
+def set_viewer_is_member(request, event_data):
+    """Sets whether the requesting user is a member of the organizer, which differs per user"""
+    organizer = event_data.get("organizer")
+    if not organizer:
+        return event_data
+
+    event_data["organizer"] = {
+        **organizer,
+        "viewer_is_member": bool(request.user)
+        and get_group_access(request).is_member(organizer["slug"]),
+    }
+    return event_data
+
+
+def get_etag(data):
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.md5(content.encode()).hexdigest()
+
+
+def get_conditional_event_response(request, response, last_modified):
+    """
+    Adds the ETag and Last-Modified headers to the response, and returns
+    304 Not Modified instead if the client already has this version.
+    The ETag is computed from the per-user data, so users never share a 304.
+    """
+    etag = quote_etag(get_etag(response.data))
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    patch_vary_headers(response, ("X-CSRF-Token",))
+    return get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=response
+    )
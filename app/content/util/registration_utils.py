@@ -1,7 +1,42 @@
+from collections import defaultdict
 from datetime import timedelta
 
+from django.db import transaction
+from django.db.models import (
+    BooleanField,
+    Exists,
+    ExpressionWrapper,
+    OuterRef,
+    Prefetch,
+    Q,
+    Sum,
+)
 from django.utils import timezone
 
+from app.util.utils import bump_cache_version, get_cache_version
+
+
+def get_registration_version_key(event_id):
+    return f"event:{event_id}:registration_version"
+
+
+def get_registration_version(event_id):
+    """
+    Returns a number which changes whenever a registration or an order of the
+    event changes, used to key caches of data derived from the registrations.
+    """
+    return get_cache_version(get_registration_version_key(event_id))
+
+
+def bump_registration_version(event_id):
+    """
+    Bumps the version once the transaction commits, so data read from
+    registrations which are not committed yet is never cached under the new version
+    """
+    transaction.on_commit(
+        lambda: bump_cache_version(get_registration_version_key(event_id))
+    )
+
 
 def get_payment_expiredate(event=None):
     if not event:
@@ -12,3 +47,148 @@ def get_payment_expiredate(event=None):
         minutes=event.paid_information.paytime.minute,
         seconds=event.paid_information.paytime.second,
     )
+
+
+def get_prioritized_user_ids(event, user_ids):
+    """
+    Returns the subset of user_ids that are prioritized on the event.
+    A user is prioritized if they are a member of every group in at least one
+    priority pool, and do not have too many strikes when the event enforces them.
+    Resolved in at most three queries regardless of the number of users.
+    """
+    from app.content.models.priority_pool import PriorityPool
+    from app.content.models.strike import Strike
+    from app.group.models import Membership
+
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+
+    pools = defaultdict(set)
+    for pool_id, slug in PriorityPool.groups.through.objects.filter(
+        prioritypool__event=event
+    ).values_list("prioritypool_id", "group__slug"):
+        pools[pool_id].add(slug)
+
+    if not pools:
+        return set()
+
+    if event.enforces_previous_strikes:
+        user_ids -= set(
+            Strike.objects.active(user_id__in=user_ids)
+            .order_by()
+            .values("user_id")
+            .annotate(total=Sum("strike_size"))
+            .filter(total__gte=3)
+            .values_list("user_id", flat=True)
+        )
+
+    pool_slugs = set().union(*pools.values())
+    user_slugs = defaultdict(set)
+    for user_id, slug in Membership.objects.filter(
+        user_id__in=user_ids, group__slug__in=pool_slugs
+    ).values_list("user_id", "group__slug"):
+        user_slugs[user_id].add(slug)
+
+    return {
+        user_id
+        for user_id, slugs in user_slugs.items()
+        if any(pool.issubset(slugs) for pool in pools.values())
+    }
+
+
+def partition_by_priority(event, registrations):
+    """
+    Splits the registrations of an event into prioritized and non-prioritized
+    registrations, keeping the order of the given registrations.
+    """
+    registrations = list(registrations)
+    prioritized_user_ids = get_prioritized_user_ids(
+        event,
+        (
+            registration.user_id
+            for registration in registrations
+            if not registration.created_by_admin
+        ),
+    )
+
+    prioritized, not_prioritized = [], []
+    for registration in registrations:
+        if (
+            registration.created_by_admin
+            or registration.user_id in prioritized_user_ids
+        ):
+            prioritized.append(registration)
+        else:
+            not_prioritized.append(registration)
+
+    return prioritized, not_prioritized
+
+
+def get_wait_queue_numbers(event):
+    """Returns the position in the waiting list of the event for each registration id"""
+    prioritized, not_prioritized = partition_by_priority(
+        event, event.get_waiting_list().order_by("created_at")
+    )
+    return {
+        registration.registration_id: number
+        for number, registration in enumerate(prioritized + not_prioritized, start=1)
+    }
+
+
+def prefetch_registration_list(queryset, event_id):
+    """
+    Annotates and prefetches everything RegistrationSerializer reads for the
+    registrations of an event, so listing them costs the same number of queries
+    regardless of the number of registrations.
+    """
+    from app.content.models.user import User
+    from app.forms.enums import NativeEventFormType as EventFormType
+    from app.forms.models.forms import Answer, EventForm, Submission
+    from app.payment.models import Order
+
+    users = User.objects.with_profile().prefetch_related(
+        Prefetch(
+            "orders",
+            queryset=Order.objects.filter(event_id=event_id),
+            to_attr="_event_orders",
+        ),
+        Prefetch(
+            "submissions",
+            queryset=Submission.objects.filter(
+                form__eventform__event_id=event_id,
+                form__eventform__type=EventFormType.SURVEY,
+            ).prefetch_related(
+                Prefetch(
+                    "answers",
+                    queryset=Answer.objects.select_related("field").prefetch_related(
+                        "selected_options"
+                    ),
+                )
+            ),
+            to_attr="_survey_submissions",
+        ),
+    )
+
+    unanswered_evaluations = EventForm.objects.filter(
+        event=OuterRef("event_id"),
+        type=EventFormType.EVALUATION,
+        event__end_date__gte=timezone.now() - timedelta(days=30),
+    ).exclude(
+        Exists(
+            Submission.objects.filter(
+                form=OuterRef("pk"), user=OuterRef(OuterRef("user_id"))
+            )
+        )
+    )
+
+    return (
+        queryset.select_related("event")
+        .prefetch_related(Prefetch("user", queryset=users))
+        .annotate(
+            _has_unanswered_evaluation=ExpressionWrapper(
+                Q(has_attended=True) & Exists(unanswered_evaluations),
+                output_field=BooleanField(),
+            )
+        )
+    )
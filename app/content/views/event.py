@@ -1,6 +1,9 @@
+import hashlib
 from datetime import datetime
+from time import time
 
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status
@@ -31,11 +34,24 @@ from app.content.serializers import (
     EventStatisticsSerializer,
     PublicRegistrationSerializer,
 )
+from app.content.util.event_response_cache import (
+    get_cached_response_data,
+    get_conditional_event_response,
+    get_event_list_version,
+    get_event_version,
+    set_viewer_is_member,
+)
 from app.content.util.event_utils import cache_registration_start_time
+from app.content.util.registration_utils import get_registration_version
 from app.group.models.group import Group
 from app.payment.models.paid_event import PaidEvent
 from app.util.utils import midday, now, yesterday
 
+# Registrations bump the version the statistics are cached under, but allergies,
+# studies and study years are read from the users and their memberships, which do
+# not. Edits to those show up once this timeout has passed.
+STATISTICS_CACHE_TIMEOUT = 30
+
 
 class EventViewSet(BaseViewSet, ActionMixin):
     serializer_class = EventSerializer
@@ -99,11 +115,39 @@ class EventViewSet(BaseViewSet, ActionMixin):
             )
         return self.queryset.filter(end_date__gte=time).filter(category=category)
 
+    def get_cursor_ordering(self):
+        if not hasattr(self, "action") or self.action != "list":
+            return None
+        if self.request.query_params.get("expired", "false").lower() == "true":
+            return ("-start_date", "id")
+        return ("start_date", "id")
+
     def get_serializer_class(self):
         if hasattr(self, "action") and self.action == "list":
             return EventListSerializer
         return super().get_serializer_class()
 
+    def list(self, request, *args, **kwargs):
+        """Return the events, cached per filter and page until an event changes."""
+        list_events = super().list
+        if "user_favorite" in request.query_params:
+            # The favorites are filtered by the requesting user, so they can't be shared
+            data = list_events(request, *args, **kwargs).data
+            last_modified = int(time())
+        else:
+            cache_key = (
+                f"events:list:{get_event_list_version()}:"
+                f"{hashlib.md5(request.build_absolute_uri().encode()).hexdigest()}"
+            )
+            data, last_modified = get_cached_response_data(
+                cache_key, lambda: list_events(request, *args, **kwargs).data
+            )
+        for event_data in data["results"] if isinstance(data, dict) else data:
+            set_viewer_is_member(request, event_data)
+        return get_conditional_event_response(
+            request, Response(data, status=status.HTTP_200_OK), last_modified
+        )
+
     def retrieve(self, request, pk):
         """Return detailed information about the event with the specified pk."""
         try:
@@ -111,6 +155,18 @@ class EventViewSet(BaseViewSet, ActionMixin):
             serializer = EventSerializer(
                 event, context={"request": request}, many=False
             )
+            cache_key = (
+                f"event:{event.pk}:response:{int(event.updated_at.timestamp())}:"
+                f"{get_event_version(event.pk)}:{get_registration_version(event.pk)}"
+            )
+            data, last_modified = get_cached_response_data(
+                cache_key, lambda: serializer.data
+            )
+            # The permissions and membership of the organizer differ per user
+            data["permissions"] = serializer.fields["permissions"].to_representation(
+                event
+            )
+            set_viewer_is_member(request, data)
             # Only cache the start time if it is a datetime object
             if event.start_registration_at is not None and isinstance(
                 event.start_registration_at, datetime
@@ -118,7 +174,9 @@ class EventViewSet(BaseViewSet, ActionMixin):
                 cache_registration_start_time(
                     event.id, int(event.start_registration_at.timestamp())
                 )
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return get_conditional_event_response(
+                request, Response(data, status=status.HTTP_200_OK), last_modified
+            )
         except Event.DoesNotExist as event_not_exist:
             capture_exception(event_not_exist)
             return Response(
@@ -214,7 +272,9 @@ class EventViewSet(BaseViewSet, ActionMixin):
     )
     def get_public_event_registrations(self, request, pk, *_args, **_kwargs):
         event = get_object_or_404(Event, id=pk)
-        registrations = event.get_participants()
+        registrations = event.get_participants().prefetch_related(
+            Prefetch("user", queryset=User.objects.with_profile())
+        )
         return self.paginate_response(
             data=registrations,
             serializer=PublicRegistrationSerializer,
@@ -236,7 +296,7 @@ class EventViewSet(BaseViewSet, ActionMixin):
             users = User.objects.filter(registrations__in=event.get_participants())
             Notify(users, title, UserNotificationSettingType.OTHER).add_paragraph(
                 f"Arrangøren av {event.title} har en melding til deg: {message}"
-            ).add_event_link(event.pk).send()
+            ).add_event_link(event.pk).send_async()
 
             return Response(
                 {
@@ -283,8 +343,14 @@ class EventViewSet(BaseViewSet, ActionMixin):
     @action(detail=True, methods=["get"], url_path="statistics")
     def statistics(self, request, *_args, **_kwargs):
         event = self.get_object()
-        serializer = EventStatisticsSerializer(event, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        cache_key = f"event:{event.pk}:statistics:{get_registration_version(event.pk)}"
+        statistics = cache.get(cache_key)
+        if statistics is None:
+            statistics = EventStatisticsSerializer(
+                event, context={"request": request}
+            ).data
+            cache.set(cache_key, statistics, STATISTICS_CACHE_TIMEOUT)
+        return Response(statistics, status=status.HTTP_200_OK)
 
     @action(
         detail=True,
@@ -1,8 +1,11 @@
 import base64
 import datetime
 import decimal
+import json
 
+from django.core.cache import cache
 from django.db import connection
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -48,22 +51,39 @@ EXCLUDED_COLUMNS = {
 }
 
 MAX_LIMIT = 1000
+STREAM_BATCH_SIZE = 1000
+
+# The schema doesn't change during the migration, while the counts only tell
+# Photon roughly how far it has come, so both are cached between pages
+PRIMARY_KEY_CACHE_TIMEOUT = 60 * 60
+COUNT_CACHE_TIMEOUT = 60 * 5
 
 
 def _primary_key_columns(table):
-    """Primary key column names, for deterministic LIMIT/OFFSET paging."""
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = %s
-              AND CONSTRAINT_NAME = 'PRIMARY'
-            ORDER BY ORDINAL_POSITION
-            """,
-            [table],
-        )
-        return [row[0] for row in cursor.fetchall()]
+    """Primary key column names, for deterministic paging."""
+
+    def get_primary_key_columns():
+        with connection.cursor() as cursor:
+            return connection.introspection.get_primary_key_columns(cursor, table)
+
+    return cache.get_or_set(
+        f"photon:{table}:primary_key",
+        lambda: get_primary_key_columns() or [],
+        PRIMARY_KEY_CACHE_TIMEOUT,
+    )
+
+
+def _row_count(table):
+    """Counting scans the whole table, so the count may lag slightly behind."""
+
+    def count_rows():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}"  # nosec
+            )
+            return cursor.fetchone()[0]
+
+    return cache.get_or_set(f"photon:{table}:count", count_rows, COUNT_CACHE_TIMEOUT)
 
 
 def _jsonable(value):
@@ -79,30 +99,110 @@ def _jsonable(value):
     return value
 
 
-@api_view(["GET"])
-def photon_table_export(request):
+def _exported_columns(table, description):
+    """Indexes and names of the columns of a result which may be exported."""
+    excluded = EXCLUDED_COLUMNS.get(table, set())
+    keep = [
+        index for index, column in enumerate(description) if column[0] not in excluded
+    ]
+    return keep, [description[index][0] for index in keep]
+
+
+def _order_sql(table):
+    keys = _primary_key_columns(table)
+    if not keys:
+        return ""
+    return " ORDER BY " + ", ".join(connection.ops.quote_name(key) for key in keys)
+
+
+def read_page(table, limit, offset=0, after=None):
     """
-    Read-only, paged bulk export of one migration table, for the one-time
-    move to Photon (the new backend). Photon has no access to this database,
-    so it consumes this endpoint instead of a direct SQL connection — the
-    JSON rows stand in for the `SELECT *` its migration phases would run.
+    Reads a page of the table in primary key order. With after, the page starts
+    right after that primary key, which the database seeks to through the
+    index, instead of reading and skipping offset rows.
 
-    Locked to superusers who are also in HS/Index, same as the user export,
-    and like it this should be removed once the migration is done.
+    Returns the columns, the rows and the primary key of the last row, or None
+    if the table has been read to its end.
+    """
+    keys = _primary_key_columns(table)
+    quote_name = connection.ops.quote_name
+    if after is None:
+        where_sql, page_sql, params = "", " LIMIT %s OFFSET %s", [limit, offset]
+    else:
+        where_sql = " WHERE ({}) > ({})".format(
+            ", ".join(quote_name(key) for key in keys), ", ".join(["%s"] * len(keys))
+        )
+        page_sql, params = " LIMIT %s", [*after, limit]
 
-    Query params: table (required), offset, limit (max 1000).
-    Header: X-Csrf-Token — the caller's auth token.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT * FROM {quote_name(table)}{where_sql}{_order_sql(table)}"  # nosec
+            + page_sql,
+            params,
+        )
+        keep, columns = _exported_columns(table, cursor.description)
+        names = [column[0] for column in cursor.description]
+        result = cursor.fetchall()
+
+    rows = [[_jsonable(row[index]) for index in keep] for row in result]
+    last_key = None
+    if keys and len(result) == limit:
+        last_key = [_jsonable(result[-1][names.index(key)]) for key in keys]
+    return columns, rows, last_key
+
+
+def _server_side_cursor():
+    """
+    A cursor which reads the rows from the database as they are fetched. The
+    MySQL driver otherwise buffers the whole result in memory on execute.
+    """
+    connection.ensure_connection()
+    if connection.vendor == "mysql":
+        from MySQLdb.cursors import SSCursor
+
+        return connection.connection.cursor(SSCursor)
+    return connection.connection.cursor()
+
+
+def stream_rows(table):
+    """
+    Yields the table as NDJSON in primary key order: a line with the table and
+    columns, then a JSON array per row, read in batches from an unbuffered cursor.
+    """
+    cursor = _server_side_cursor()
+    try:
+        cursor.execute(
+            f"SELECT * FROM {connection.ops.quote_name(table)}{_order_sql(table)}"  # nosec
+        )
+        keep, columns = _exported_columns(table, cursor.description)
+        yield json.dumps({"table": table, "columns": columns}) + "\n"
+        while rows := cursor.fetchmany(STREAM_BATCH_SIZE):
+            yield "".join(
+                json.dumps(
+                    [_jsonable(row[index]) for index in keep], ensure_ascii=False
+                )
+                + "\n"
+                for row in rows
+            )
+    finally:
+        cursor.close()
+
+
+def _get_table(request):
+    """
+    Returns the requested table, or a response explaining why it can't be
+    exported to this request.
     """
     set_user_id(request)
 
     if request.user is None:
-        return Response(
+        return None, Response(
             {"detail": "Manglende autentiseringsinformasjon."},
             status=status.HTTP_401_UNAUTHORIZED,
         )
 
     if not (is_admin_user(request) and request.user.is_superuser):
-        return Response(
+        return None, Response(
             {"detail": "Krever superbruker i HS/Index."},
             status=status.HTTP_403_FORBIDDEN,
         )
@@ -113,11 +213,44 @@ def photon_table_export(request):
     requested = request.query_params.get("table", "")
     table = next((name for name in ALLOWED_TABLES if name == requested), None)
     if table is None:
-        return Response(
+        return None, Response(
             {"detail": f"Ukjent tabell. Gyldige: {sorted(ALLOWED_TABLES)}"},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    return table, None
+
+
+def _parse_after(table, value):
+    """after is the primary key to continue after, as a JSON array or value."""
+    after = json.loads(value)
+    if not isinstance(after, list):
+        after = [after]
+    if not after or len(after) != len(_primary_key_columns(table)):
+        raise ValueError
+    return after
+
+
+@api_view(["GET"])
+def photon_table_export(request):
+    """
+    Read-only, paged bulk export of one migration table, for the one-time
+    move to Photon (the new backend). Photon has no access to this database,
+    so it consumes this endpoint instead of a direct SQL connection — the
+    JSON rows stand in for the `SELECT *` its migration phases would run.
+
+    Locked to superusers who are also in HS/Index, same as the user export,
+    and like it this should be removed once the migration is done.
+
+    Query params: table (required), offset or after, limit (max 1000).
+    after is the primary key of the last row of the previous page, as returned
+    in next, and unlike offset it doesn't get slower further into the table.
+    Header: X-Csrf-Token — the caller's auth token.
+    """
+    table, error_response = _get_table(request)
+    if error_response is not None:
+        return error_response
+
     try:
         offset = max(int(request.query_params.get("offset", 0)), 0)
         limit = min(
@@ -129,33 +262,50 @@ def photon_table_export(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    order_by = _primary_key_columns(table)
-    order_sql = " ORDER BY " + ", ".join(f"`{c}`" for c in order_by) if order_by else ""
-
-    with connection.cursor() as cursor:
-        cursor.execute(f"SELECT COUNT(*) FROM `{table}`")  # nosec — allowlisted
-        (total,) = cursor.fetchone()
+    after = None
+    if "after" in request.query_params:
+        try:
+            after = _parse_after(table, request.query_params["after"])
+        except ValueError:
+            return Response(
+                {"detail": "after må være primærnøkkelen til en rad, som i next."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        cursor.execute(
-            f"SELECT * FROM `{table}`{order_sql} LIMIT %s OFFSET %s",  # nosec
-            [limit, offset],
-        )
-        excluded = EXCLUDED_COLUMNS.get(table, set())
-        keep = [
-            index
-            for index, column in enumerate(cursor.description)
-            if column[0] not in excluded
-        ]
-        columns = [cursor.description[index][0] for index in keep]
-        rows = [[_jsonable(row[index]) for index in keep] for row in cursor.fetchall()]
+    columns, rows, last_key = read_page(table, limit, offset, after)
 
     return Response(
         {
             "table": table,
-            "count": total,
-            "offset": offset,
+            "count": _row_count(table),
+            "offset": offset if after is None else None,
+            "after": after,
             "limit": limit,
+            "next": last_key,
             "columns": columns,
             "rows": rows,
         }
     )
+
+
+@api_view(["GET"])
+def photon_table_stream(request):
+    """
+    The whole of one migration table in a single response, as NDJSON: a line
+    with the table and its columns, then a JSON array per row. The rows are
+    sent as they are read, so memory use doesn't grow with the table.
+
+    Same access and tables as photon_table_export.
+
+    Query params: table (required).
+    Header: X-Csrf-Token — the caller's auth token.
+    """
+    table, error_response = _get_table(request)
+    if error_response is not None:
+        return error_response
+
+    response = StreamingHttpResponse(
+        stream_rows(table), content_type="application/x-ndjson"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{table}.ndjson"'
+    return response
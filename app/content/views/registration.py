@@ -29,6 +29,11 @@ from app.content.util.event_utils import (
     get_cached_registration_start_time,
     start_payment_countdown,
 )
+from app.content.util.registration_utils import (
+    get_payment_expiredate,
+    prefetch_registration_list,
+)
+from app.content.util.seat_ledger import SeatLedger
 from app.payment.enums import OrderStatus
 from app.payment.models.order import Order
 from app.payment.util.order_utils import (
@@ -50,11 +55,12 @@ class RegistrationViewSet(APIRegistrationErrorsMixin, BaseViewSet):
 
     def get_queryset(self):
         event_id = self.kwargs.get("event_id", None)
-        return annotate_suspicious_payment(
-            Registration.objects.filter(event__pk=event_id).select_related(
-                "event", "user"
-            )
-        )
+        registrations = Registration.objects.filter(event__pk=event_id)
+        if self.action == "list":
+            registrations = prefetch_registration_list(registrations, event_id)
+        else:
+            registrations = registrations.select_related("event", "user")
+        return annotate_suspicious_payment(registrations)
 
     def _is_own_registration(self):
         user_id = self.kwargs.get("user_id", None)
@@ -92,20 +98,12 @@ class RegistrationViewSet(APIRegistrationErrorsMixin, BaseViewSet):
                     {"detail": "Påmeldingen har ikke åpnet enda"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-        with transaction.atomic():
-            event = Event.objects.select_for_update().get(pk=event_id)
-
-            # Only cache the start time if it is a datetime object
-            if event.start_registration_at is not None and isinstance(
-                event.start_registration_at, datetime
-            ):
-                value = int(event.start_registration_at.timestamp())
-                if value != cached_start_time:
-                    cache_registration_start_time(event_id, value)
-
-            registration = super().perform_create(
-                serializer, event=event, user=request.user
-            )
+        registration = self._create_with_seat_ledger(
+            serializer, event_id, request.user, cached_start_time
+        ) or self._create_with_event_lock(
+            serializer, event_id, request.user, cached_start_time
+        )
+        event = registration.event
 
         try:
             start_payment_countdown(event, registration)
@@ -125,6 +123,58 @@ class RegistrationViewSet(APIRegistrationErrorsMixin, BaseViewSet):
 
         return Response(registration_serializer.data, status=status.HTTP_201_CREATED)
 
+    def _create_with_event_lock(self, serializer, event_id, user, cached_start_time):
+        """Admits the registration while holding the lock on the event row"""
+        with transaction.atomic():
+            event = Event.objects.select_for_update().get(pk=event_id)
+            self._cache_start_time(event, cached_start_time)
+            return super().perform_create(serializer, event=event, user=user)
+
+    @staticmethod
+    def _cache_start_time(event, cached_start_time):
+        # Only cache the start time if it is a datetime object
+        if event.start_registration_at is not None and isinstance(
+            event.start_registration_at, datetime
+        ):
+            value = int(event.start_registration_at.timestamp())
+            if value != cached_start_time:
+                cache_registration_start_time(event.pk, value)
+
+    def _create_with_seat_ledger(self, serializer, event_id, user, cached_start_time):
+        """
+        Admits the registration through the seat ledger in Redis, without locking
+        the event row. Returns None if the ledger can not be used for the event.
+        """
+        if not SeatLedger.is_enabled():
+            return None
+
+        event = Event.objects.get(pk=event_id)
+        ledger = SeatLedger(event)
+        if not ledger.supports_event():
+            return None
+        self._cache_start_time(event, cached_start_time)
+
+        seat_reserved = ledger.reserve(user.user_id)
+        if seat_reserved is None:
+            return None
+
+        registration = Registration(**serializer.validated_data, event=event, user=user)
+        registration.seat_reserved = seat_reserved
+        if event.is_paid_event and seat_reserved:
+            registration.payment_expiredate = get_payment_expiredate(event)
+
+        try:
+            with transaction.atomic():
+                registration.save()
+        except BaseException:
+            if seat_reserved:
+                ledger.release()
+            raise
+
+        serializer.instance = registration
+        self._log_on_create(serializer)
+        return registration
+
     def update(self, request, *args, **kwargs):
         registration = self.get_object()
         serializer = self.get_serializer(data=request.data)
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status
@@ -33,6 +34,16 @@ class StrikeViewSet(BaseViewSet):
         "user__email",
     ]
 
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .prefetch_related(
+                Prefetch("user", queryset=User.objects.with_profile()),
+                Prefetch("creator", queryset=User.objects.with_profile()),
+            )
+        )
+
     def update(self, request, *args, **kwargs):
         return Response(
             {"detail": "Endepunktet ikke støttet"},
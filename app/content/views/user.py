@@ -56,6 +56,17 @@ class UserViewSet(BaseViewSet, ActionMixin):
     filterset_class = UserFilter
     search_fields = ["user_id", "first_name", "last_name", "email"]
 
+    def get_queryset(self):
+        if hasattr(self, "action") and self.action == "list":
+            return super().get_queryset().with_profile()
+        return super().get_queryset()
+
+    def get_cursor_ordering(self):
+        if hasattr(self, "action") and self.action == "list":
+            # The cursor is positioned on the first field only, so it must be unique
+            return ("user_id",)
+        return None
+
     def get_serializer_class(self):
         if hasattr(self, "action") and self.action == "list":
             if is_admin_user(self.request):
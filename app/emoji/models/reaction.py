@@ -1,10 +1,14 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from app.common.enums import Groups
 from app.common.permissions import BasePermissionModel
 from app.content.models.user import User
+from app.content.util.event_response_cache import bump_event_version
+from app.emoji.enums import ContentTypes
 from app.util.models import BaseModel
 
 
@@ -34,3 +38,13 @@ class Reaction(BaseModel, BasePermissionModel):
         return self.user == request.user and super().has_object_write_permission(
             request
         )
+
+
+@receiver(post_save, sender=Reaction)
+@receiver(post_delete, sender=Reaction)
+def invalidate_event_responses(sender, instance, **_kwargs):
+    if instance.content_type_id is None or instance.object_id is None:
+        return
+    content_type = ContentType.objects.get_for_id(instance.content_type_id)
+    if content_type.model == ContentTypes.EVENT:
+        bump_event_version(instance.object_id)
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status
 from rest_framework.response import Response
@@ -5,6 +6,7 @@ from rest_framework.response import Response
 from app.common.pagination import BasePagination
 from app.common.permissions import BasicViewPermission
 from app.common.viewsets import BaseViewSet
+from app.content.models import User
 from app.feedback.models.assignee import Assignee
 from app.feedback.serializers import (
     AssigneeCreateUpdateDeleteSerializer,
@@ -14,13 +16,20 @@ from app.feedback.serializers import (
 
 class AssigneeViewSet(BaseViewSet):
     serializer_class = AssigneeSerializer
-    queryset = Assignee.objects.select_related("user", "feedback")
+    queryset = Assignee.objects.select_related("feedback")
     pagination_class = BasePagination
     permission_classes = [BasicViewPermission]
 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     search_fields = ["user__first_name", "user__last_name", "feedback__title"]
 
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .prefetch_related(Prefetch("user", queryset=User.objects.with_profile()))
+        )
+
     def create(self, request, *_args, **_kwargs):
         data = request.data
         data["user_id"] = request.user.id
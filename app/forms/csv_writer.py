@@ -1,10 +1,82 @@
 import csv
-from collections import OrderedDict
-
-from django.http.response import HttpResponse
+import re
+import zipfile
+from tempfile import SpooledTemporaryFile
+from xml.sax.saxutils import escape
+
+from django.db.models import Prefetch
+from django.http.response import FileResponse, StreamingHttpResponse
+
+from app.content.models import User
+from app.forms.models.forms import Answer, Field
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Characters which are not allowed in XML, even when escaped
+ILLEGAL_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Svar" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+class Echo:
+    """A file-like object which returns what is written, for writing CSV rows to a stream"""
+
+    def write(self, value):
+        return value
+
+
+def get_column_letter(index):
+    """Returns the spreadsheet column name of the zero-based index, like A, Z or AA"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
 
 
 class SubmissionsCsvWriter:
+    """
+    Exports the submissions of a form with a column per field of the form, in the order
+    of the fields. The submissions are loaded in chunks and written as they are loaded,
+    so the memory used does not grow with the number of submissions.
+    """
+
     base_field_names = [
         "first_name",
         "last_name",
@@ -13,63 +85,102 @@ class SubmissionsCsvWriter:
         "study",
         "studyyear",
     ]
+    chunk_size = 500
 
-    def __init__(self, queryset=None):
-        if queryset is None:
-            queryset = []
+    def __init__(self, queryset, form_id):
         self.queryset = queryset
-        self.field_names = self.base_field_names.copy()
+        self.fields = list(
+            Field.objects.filter(form_id=form_id)
+            .order_by("order")
+            .values_list("id", "title")
+        )
 
     def write_csv(self):
-        response = HttpResponse(content_type="text/csv")
+        writer = csv.writer(Echo(), quoting=csv.QUOTE_ALL)
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in self.get_rows()),
+            content_type="text/csv",
+        )
         response["Content-Disposition"] = 'attachment; filename="export.csv"'
-        result = []
-
-        for submission in self.queryset:
-            self.create_row(result, submission)
-
-        self.write_rows(response, result)
-
         return response
 
-    def create_row(self, result, submission):
-        user = submission.user
-        row = OrderedDict(
-            first_name=user.first_name,
-            last_name=user.last_name,
-            full_name=f"{user.first_name} {user.last_name}",
-            email=user.email,
-            study=user.study.group.name,
-            studyyear=user.studyyear.group.name,
+    def write_xlsx(self):
+        """
+        Writes the rows to a spreadsheet, which is kept in memory until it grows large
+        and then on disk, as the archive can't be sent before it is complete
+        """
+        file = SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, content in XLSX_PARTS.items():
+                archive.writestr(name, content)
+            with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+                self.write_sheet(sheet)
+
+        file.seek(0)
+        return FileResponse(
+            file,
+            as_attachment=True,
+            filename="export.xlsx",
+            content_type=XLSX_CONTENT_TYPE,
         )
-        for answer in submission.answers.all().prefetch_related(
-            "selected_options", "field"
-        ):
-            self.create_column(answer, row)
-
-        result.append(row)
 
-    def create_column(self, answer, content):
-        answer_text = self.get_answer_text(answer)
-        field_name = answer.field.title
+    def write_sheet(self, sheet):
+        sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            b"<sheetData>"
+        )
+        for row_number, row in enumerate(self.get_rows(), start=1):
+            cells = "".join(
+                f'<c r="{get_column_letter(column)}{row_number}" t="inlineStr">'
+                f"<is><t>{escape(ILLEGAL_XML_CHARACTERS.sub('', value))}</t></is></c>"
+                for column, value in enumerate(row)
+            )
+            sheet.write(f'<row r="{row_number}">{cells}</row>'.encode())
+        sheet.write(b"</sheetData></worksheet>")
+
+    def get_submissions(self):
+        return (
+            self.queryset.prefetch_related(None)
+            .prefetch_related(
+                Prefetch("user", queryset=User.objects.with_profile()),
+                Prefetch(
+                    "answers",
+                    queryset=Answer.objects.prefetch_related("selected_options"),
+                ),
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
 
-        if field_name not in self.field_names:
-            self.field_names.append(field_name)
+    def get_rows(self):
+        yield self.base_field_names + [title for _, title in self.fields]
+        for submission in self.get_submissions():
+            yield self.create_row(submission)
 
-        content[field_name] = answer_text
+    def create_row(self, submission):
+        user = submission.user
+        answers = {
+            self.get_field_id(answer): self.get_answer_text(answer)
+            for answer in submission.answers.all()
+        }
+        return [
+            user.first_name,
+            user.last_name,
+            f"{user.first_name} {user.last_name}",
+            user.email,
+            user.study.group.name if user.study else "",
+            user.studyyear.group.name if user.studyyear else "",
+        ] + [answers.get(field_id, "") for field_id, _ in self.fields]
+
+    def get_field_id(self, answer):
+        """Like Answer.get_field, but from the prefetched options"""
+        if answer.field_id is None and answer.selected_options.all():
+            return answer.selected_options.all()[0].field_id
+        return answer.field_id
 
     def get_answer_text(self, answer):
-        if answer.selected_options.exists():
-            answer_text = map(
-                lambda option: option.title, answer.selected_options.all()
-            )
-            return ", ".join(answer_text)
+        selected_options = answer.selected_options.all()
+        if selected_options:
+            return ", ".join(option.title for option in selected_options)
 
         return answer.answer_text.replace("\n", " ").replace("\r", " ")
-
-    def write_rows(self, response, result):
-        writer = csv.DictWriter(
-            response, fieldnames=self.field_names, quoting=csv.QUOTE_ALL
-        )
-        writer.writeheader()
-        writer.writerows(result)
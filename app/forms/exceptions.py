@@ -27,3 +27,12 @@ class APIGroupFormOnlyForMembersException(APIException):
 
 class GroupFormOnlyForMembers(ValueError):
     default_detail = "Spørreskjemaet er kun åpent for medlemmer av gruppen"
+
+
+class APIInvalidAnswerException(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Svaret hører ikke til et spørsmål i spørreskjemaet"
+
+
+class InvalidAnswer(ValueError):
+    default_detail = "Svaret hører ikke til et spørsmål i spørreskjemaet"
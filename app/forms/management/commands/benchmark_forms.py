@@ -0,0 +1,103 @@
+from statistics import mean
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from app.forms.enums import NativeFormFieldType as FormFieldType
+from app.forms.models import Field, Form, Option
+
+
+def add_fields_one_by_one(form, fields):
+    """How fields were added before Form.add_fields inserted them in bulk"""
+    for field_data in fields:
+        field_data = dict(field_data)
+        options = field_data.pop("options", None)
+        field = Field.objects.create(form=form, **field_data)
+        for option in options or []:
+            Option.objects.create(field=field, **option)
+
+
+def timed(run):
+    """Runs the function and returns its latency in ms and query count"""
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        start = perf_counter()
+        run()
+        latency = (perf_counter() - start) * 1000
+
+    return latency, len(queries)
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds forms of increasing size from a definition, one field and option "
+        "at a time and in bulk, and reports the latency and queries of each. "
+        "Creates and deletes its own data, do not run it against production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 30, 100],
+            help="Number of fields in each form",
+        )
+        parser.add_argument(
+            "--options", type=int, default=5, help="Number of options per field"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Number of forms per size"
+        )
+
+    def handle(self, *args, **options):
+        forms = []
+        try:
+            for size in options["sizes"]:
+                definition = self.get_definition(size, options["options"])
+
+                def build(add):
+                    form = Form.objects.create(title="Benchmark form")
+                    forms.append(form)
+                    with transaction.atomic():
+                        add(form)
+
+                runs = {
+                    "one by one": lambda form: add_fields_one_by_one(form, definition),
+                    "add_fields": lambda form: form.add_fields(definition),
+                }
+                for name, add in runs.items():
+                    results = [
+                        timed(lambda: build(add)) for _ in range(options["repeat"])
+                    ]
+                    self.report(size, options["options"], name, results)
+        finally:
+            Form.objects.filter(id__in=[form.id for form in forms]).delete()
+
+    def get_definition(self, size, option_amount):
+        return [
+            {
+                "title": f"Question {number}",
+                "type": FormFieldType.MULTIPLE_SELECT,
+                "options": [
+                    {"title": f"Option {option}"} for option in range(option_amount)
+                ],
+            }
+            for number in range(size)
+        ]
+
+    def report(self, size, option_amount, name, results):
+        latencies = [latency for latency, _ in results]
+        query_counts = [query_count for _, query_count in results]
+
+        self.stdout.write(
+            f"{size} fields with {option_amount} options, {name}: "
+            f"latency mean {mean(latencies):.1f}ms, max {max(latencies):.1f}ms, "
+            f"queries {max(query_counts)}"
+        )
@@ -2,9 +2,11 @@ from app.forms.exceptions import (
     APIDuplicateSubmissionException,
     APIFormNotOpenForSubmissionException,
     APIGroupFormOnlyForMembersException,
+    APIInvalidAnswerException,
     DuplicateSubmission,
     FormNotOpenForSubmission,
     GroupFormOnlyForMembers,
+    InvalidAnswer,
 )
 from app.util.mixins import APIErrorsMixin
 
@@ -17,4 +19,5 @@ class APIFormErrorsMixin(APIErrorsMixin):
             DuplicateSubmission: APIDuplicateSubmissionException,
             FormNotOpenForSubmission: APIFormNotOpenForSubmissionException,
             GroupFormOnlyForMembers: APIGroupFormOnlyForMembersException,
+            InvalidAnswer: APIInvalidAnswerException,
         }
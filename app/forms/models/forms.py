@@ -1,23 +1,61 @@
 import uuid
 
 from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
 from ordered_model.models import OrderedModel
 from polymorphic.models import PolymorphicModel
+from sentry_sdk import capture_exception
 
 from app.common.enums import AdminGroup, Groups
-from app.common.permissions import BasePermissionModel, check_has_access
+from app.common.permissions import (
+    BasePermissionModel,
+    check_has_access,
+    get_group_access,
+    get_request_cached,
+)
 from app.content.models.event import Event
 from app.content.models.user import User
+from app.content.util.event_response_cache import bump_event_version
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.forms.enums import NativeFormFieldType as FormFieldType
 from app.forms.exceptions import (
     DuplicateSubmission,
     FormNotOpenForSubmission,
     GroupFormOnlyForMembers,
+    InvalidAnswer,
 )
 from app.group.models import Group
 from app.util.models import BaseModel
+from app.util.utils import bump_cache_version, get_cache_version
+
+
+def get_statistics_version_key(form_id):
+    return f"form:{form_id}:statistics_version"
+
+
+def bump_statistics_version(form_id):
+    """
+    Bumps the version once the transaction commits, so statistics read from rows
+    which are not committed yet are never cached under the new version
+    """
+    transaction.on_commit(
+        lambda: bump_cache_version(get_statistics_version_key(form_id))
+    )
+
+
+def set_orders(objs, next_order):
+    """
+    Sets the orders which are not given like OrderedModel.save would, after the
+    highest order so far, starting at next_order, so the objects can be inserted
+    together. OrderedModel's own bulk_create replaces the given orders, and
+    queries the next order of each parent.
+    """
+    for obj in objs:
+        if obj.order is None:
+            obj.order = next_order
+        next_order = max(next_order, obj.order + 1)
 
 
 class Form(PolymorphicModel, BasePermissionModel):
@@ -41,13 +79,30 @@ class Form(PolymorphicModel, BasePermissionModel):
     def website_url(self):
         return f"/sporreskjema/{self.id}/"
 
-    def add_fields(self, fields):
-        for field in fields:
-            options = field.pop("options", None)
-            field = Field.objects.create(form=self, **field)
+    def get_statistics_version(self):
+        """
+        Returns a number which changes whenever a submission to the form, or the
+        options of its answers, change. Used to key the cached statistics.
+        """
+        return get_cache_version(get_statistics_version_key(self.id))
 
-            if options:
-                field.add_options(options)
+    @transaction.atomic
+    def add_fields(self, fields):
+        """Creates the fields, and their options, with one insert for each"""
+        new_fields = []
+        new_options = []
+        for field_data in fields:
+            field_data = dict(field_data)
+            options = field_data.pop("options", None) or []
+            field = Field(form=self, **field_data)
+            field_options = [Option(field=field, **option) for option in options]
+            set_orders(field_options, 0)
+            new_fields.append(field)
+            new_options.extend(field_options)
+
+        set_orders(new_fields, self.fields.get_next_order())
+        models.QuerySet(Field).bulk_create(new_fields)
+        models.QuerySet(Option).bulk_create(new_options)
 
     @classmethod
     def is_event_form(cls, request):
@@ -130,7 +185,7 @@ class EventForm(Form):
         return (
             event
             and event.has_object_write_permission(request)
-            or request.user.memberships_with_events_access.exists()
+            or get_group_access(request).has_events_access()
         )
 
     @classmethod
@@ -174,15 +229,25 @@ class GroupForm(Form):
     def has_write_permission(cls, request):
         if request.method == "POST":
             group_slug = request.data.get("group")
-            group = Group.objects.filter(slug=group_slug).first()
+            group = get_request_cached(
+                request,
+                (Group, group_slug),
+                lambda: Group.objects.filter(slug=group_slug).first(),
+            )
         else:
             form_id = request.parser_context.get("kwargs", {}).get("pk", None)
-            form = GroupForm.objects.filter(id=form_id).first()
+            form = get_request_cached(
+                request,
+                (GroupForm, form_id),
+                lambda: GroupForm.objects.select_related("group")
+                .filter(id=form_id)
+                .first(),
+            )
             group = form.group if form else None
         return (
             (group and group.has_object_group_form_permission(request))
             or check_has_access(cls.write_access, request)
-            or request.user.is_leader
+            or get_group_access(request).is_leader_of_any()
         )
 
     @classmethod
@@ -200,7 +265,7 @@ class GroupForm(Form):
         if not self.is_open_for_submissions:
             return False
         if self.only_for_group_members:
-            return request.user.is_member_of(self.group)
+            return get_group_access(request).is_member(self.group_id)
         return True
 
     def has_object_write_permission(self, request):
@@ -223,8 +288,9 @@ class Field(OrderedModel):
         return self.title
 
     def add_options(self, options):
-        for option in options:
-            Option.objects.create(field=self, **option)
+        new_options = [Option(field=self, **option) for option in options]
+        set_orders(new_options, self.options.get_next_order())
+        models.QuerySet(Option).bulk_create(new_options)
 
     class Meta(OrderedModel.Meta):
         pass
@@ -270,13 +336,61 @@ class Submission(BaseModel, BasePermissionModel):
             "Nytt spørreskjema svar",
         )
 
+    def queue_group_form_submission_email(self):
+        from app.forms.tasks import send_group_form_submission_email
+
+        try:
+            send_group_form_submission_email.delay(str(self.id))
+        except Exception as enqueue_error:
+            capture_exception(enqueue_error)
+            self.send_group_form_submission_email()
+
     @transaction.atomic
     def save(self, *args, **kwargs):
         self.full_clean()
         if isinstance(self.form, GroupForm) and self.form.email_receiver_on_submit:
-            self.send_group_form_submission_email()
+            # Sent in the background, and only if the submission is stored
+            transaction.on_commit(self.queue_group_form_submission_email)
         super().save(*args, **kwargs)
 
+    @transaction.atomic
+    def add_answers(self, answers):
+        """
+        Creates the answers, and their selected options, with one insert for each.
+        The field and option ids of the answers are checked against the form,
+        which is read in a single query, so the number of queries does not
+        grow with the number of answers.
+        """
+        field_options = {}
+        for field_id, option_id in Field.objects.filter(
+            form_id=self.form_id
+        ).values_list("id", "options__id"):
+            field_options.setdefault(field_id, set()).add(option_id)
+
+        new_answers = []
+        selected_options = []
+        for answer_data in answers:
+            answer_data = dict(answer_data)
+            field_id = answer_data.pop("field")
+            option_ids = dict.fromkeys(answer_data.pop("selected_options", None) or [])
+            if field_id not in field_options or not field_options[field_id].issuperset(
+                option_ids
+            ):
+                raise InvalidAnswer(InvalidAnswer.default_detail)
+
+            answer = Answer(submission=self, field_id=field_id, **answer_data)
+            new_answers.append(answer)
+            selected_options.extend(
+                Answer.selected_options.through(answer=answer, option_id=option_id)
+                for option_id in option_ids
+            )
+
+        Answer.objects.bulk_create(new_answers)
+        Answer.selected_options.through.objects.bulk_create(selected_options)
+        # Bulk inserts send no m2m_changed signal
+        if selected_options:
+            bump_statistics_version(self.form_id)
+
     def clean(self):
         self.check_multiple_submissions()
         if isinstance(self.form, GroupForm):
@@ -323,7 +437,9 @@ class Submission(BaseModel, BasePermissionModel):
     def _get_form_from_request(cls, request):
         form_id = request.parser_context.get("kwargs", {}).get("form_id", None)
         if form_id:
-            return Form.objects.get(id=form_id)
+            return get_request_cached(
+                request, (Form, form_id), lambda: Form.objects.get(id=form_id)
+            )
 
         return None
 
@@ -354,8 +470,7 @@ class Submission(BaseModel, BasePermissionModel):
 
     @classmethod
     def _is_own_permission(cls, request):
-        form_id = request.parser_context["kwargs"]["form_id"]
-        form = Form.objects.get(id=form_id)
+        form = cls._get_form_from_request(request)
 
         submission_id = request.parser_context["kwargs"]["pk"]
         submission = form.submissions.get(id=submission_id)
@@ -397,3 +512,25 @@ class Answer(BaseModel):
 
     def __str__(self):
         return f"Answer to {self.submission}"
+
+
+@receiver(post_save, sender=EventForm)
+@receiver(post_delete, sender=EventForm)
+def invalidate_event_responses_on_form(sender, instance, **_kwargs):
+    """The survey and evaluation of an event are part of its response"""
+    bump_event_version(instance.event_id)
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def invalidate_form_statistics(sender, instance, **_kwargs):
+    bump_statistics_version(instance.form_id)
+
+
+@receiver(m2m_changed, sender=Answer.selected_options.through)
+def invalidate_form_statistics_on_answer(sender, instance, action, reverse, **_kwargs):
+    """The options of an answer are set after its submission is saved"""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    form_id = instance.field.form_id if reverse else instance.submission.form_id
+    bump_statistics_version(form_id)
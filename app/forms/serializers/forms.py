@@ -7,7 +7,7 @@ from app.common.mixins import OrderedModelSerializerMixin
 from app.common.serializers import BaseModelSerializer
 from app.content.serializers import EventListSerializer
 from app.forms.models import EventForm, Field, Form, Option
-from app.forms.models.forms import GroupForm
+from app.forms.models.forms import GroupForm, bump_statistics_version
 from app.group.serializers import SimpleGroupSerializer
 
 
@@ -81,6 +81,9 @@ class FormSerializer(BaseModelSerializer):
     def update(self, instance, validated_data):
         validated_fields = validated_data.pop("fields", None)
         super().update(instance, validated_data)
+        # Fields and options are updated in bulk without signals, so the cached
+        # statistics are invalidated here
+        bump_statistics_version(instance.id)
 
         # Must explicitly check if is None, because "[]" evaluates to falsy but should be looped
         if validated_fields is None:
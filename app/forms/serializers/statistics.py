@@ -1,3 +1,4 @@
+from django.db.models import Count
 from rest_framework import serializers
 from rest_framework.fields import SerializerMethodField
 
@@ -19,11 +20,11 @@ class OptionStatisticsSerializer(BaseModelSerializer):
         fields = ("id", "title", "answer_amount", "answer_percentage")
 
     def get_answer_amount(self, obj):
-        return Answer.objects.filter(selected_options=obj).count()
+        return self.context["answer_amounts"].get(obj.id, 0)
 
     def get_answer_percentage(self, obj):
         amount = self.get_answer_amount(obj)
-        total = obj.field.form.submissions.count()
+        total = self.context["submission_amount"]
         return round(amount / total * 100 if total > 0 else 0, 2)
 
 
@@ -48,11 +49,31 @@ class FormStatisticsSerializer(BaseModelSerializer):
         )
 
     def get_statistics(self, obj):
-        fields = Field.objects.filter(form=obj).exclude(type=FormFieldType.TEXT_ANSWER)
+        fields = (
+            Field.objects.filter(form=obj)
+            .exclude(type=FormFieldType.TEXT_ANSWER)
+            .prefetch_related("options")
+        )
         return FieldStatisticsSerializer(
-            fields, many=True, required=False, allow_null=True
+            fields,
+            many=True,
+            required=False,
+            allow_null=True,
+            context={
+                "answer_amounts": self.get_answer_amounts(obj),
+                "submission_amount": obj.submissions.count(),
+            },
         ).data
 
+    def get_answer_amounts(self, obj):
+        """Counts the answers of every option of the form in a single query"""
+        return dict(
+            Answer.selected_options.through.objects.filter(option__field__form=obj)
+            .values("option_id")
+            .annotate(amount=Count("answer_id"))
+            .values_list("option_id", "amount")
+        )
+
 
 class EventStatisticsFormSerializer(FormStatisticsSerializer):
     class Meta:
@@ -1,9 +1,10 @@
+from django.db.transaction import atomic
 from rest_framework import serializers
 from rest_framework.exceptions import MethodNotAllowed
 
 from app.common.serializers import BaseModelSerializer
 from app.content.serializers.user import DefaultUserSerializer
-from app.forms.models import Answer, Field, Option, Submission
+from app.forms.models import Answer, Submission
 from app.forms.serializers import (
     FieldInAnswerSerializer,
     FormPolymorphicSerializer,
@@ -41,30 +42,27 @@ class SubmissionSerializer(BaseSubmissionSerializer):
         model = BaseSubmissionSerializer.Meta.model
         fields = BaseSubmissionSerializer.Meta.fields + ("user",)
 
-    def __create_answer_for_submission(self, submission, answer_data):
-        field_id = answer_data.pop("field").get("id")
-        selected_options_data = answer_data.pop("selected_options", None)
-
-        answer = Answer.objects.create(
-            submission=submission, field=Field.objects.get(id=field_id), **answer_data
-        )
-
-        if selected_options_data:
-            selected_options_ids = [
-                option.get("id") for option in selected_options_data
-            ]
-            selected_options = Option.objects.filter(id__in=selected_options_ids)
-            answer.selected_options.set(selected_options)
-
-        return answer
-
+    @staticmethod
+    def __get_answer(answer_data):
+        return {
+            **answer_data,
+            "field": answer_data["field"].get("id"),
+            "selected_options": [
+                option.get("id") for option in answer_data.get("selected_options", [])
+            ],
+        }
+
+    @atomic
     def __create_submission(self, user, form_id, answers_data):
         submission = Submission.objects.create(user=user, form_id=form_id)
-
-        for answer_data in answers_data:
-            self.__create_answer_for_submission(submission, answer_data)
-
-        return submission
+        submission.add_answers(
+            self.__get_answer(answer_data) for answer_data in answers_data
+        )
+        return (
+            Submission.objects.select_related("user")
+            .prefetch_related("answers__field", "answers__selected_options")
+            .get(id=submission.id)
+        )
 
     def create(self, validated_data):
         form_id = self.context.get("form_id")
@@ -0,0 +1,17 @@
+from app.celery import app
+from app.util.tasks import BaseTask
+
+
+@app.task(bind=True, base=BaseTask)
+def send_group_form_submission_email(self, submission_id, *_args, **_kwargs):
+    from app.forms.models import Submission
+
+    submission = (
+        Submission.objects.select_related("user").filter(id=submission_id).first()
+    )
+    # The submission may have been deleted before the task was run
+    if submission is None:
+        return
+
+    submission.send_group_form_submission_email()
+    self.logger.info(f"Sent the email about submission {submission_id}")
@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from app.forms.enums import NativeFormFieldType as FormFieldType
+from app.forms.tests.form_factories import FieldFactory, FormFactory
+
+
+def _get_form_definition(amount=3):
+    return [
+        {
+            "title": f"Field {number}",
+            "type": FormFieldType.SINGLE_SELECT,
+            "options": [{"title": "Yes"}, {"title": "No"}],
+        }
+        for number in range(amount)
+    ]
+
+
+@pytest.mark.django_db
+def test_add_fields_orders_fields_and_options_in_the_given_order():
+    form = FormFactory(fields=None)
+
+    form.add_fields(_get_form_definition())
+
+    fields = list(form.fields.all())
+    assert [(field.title, field.order) for field in fields] == [
+        ("Field 0", 0),
+        ("Field 1", 1),
+        ("Field 2", 2),
+    ]
+    assert [(option.title, option.order) for option in fields[0].options.all()] == [
+        ("Yes", 0),
+        ("No", 1),
+    ]
+
+
+@pytest.mark.django_db
+def test_add_fields_continues_after_the_existing_and_given_orders():
+    form = FormFactory(fields=None)
+    FieldFactory(form=form, options=None)
+
+    form.add_fields(
+        [{"title": "Given", "order": 5}, {"title": "Next"}, {"title": "Last"}]
+    )
+
+    assert list(form.fields.values_list("title", "order")) == [
+        (form.fields.first().title, 0),
+        ("Given", 5),
+        ("Next", 6),
+        ("Last", 7),
+    ]
+
+
+@pytest.mark.django_db
+def test_add_fields_uses_a_fixed_number_of_queries(django_assert_num_queries):
+    form = FormFactory(fields=None)
+    with CaptureQueriesContext(connection) as queries:
+        form.add_fields(_get_form_definition(amount=1))
+
+    with django_assert_num_queries(len(queries)):
+        form.add_fields(_get_form_definition(amount=30))
+
+    assert form.fields.count() == 31
+
+
+@pytest.mark.django_db
+def test_add_options_continues_after_the_existing_options():
+    field = FieldFactory(form=FormFactory(fields=None))
+
+    field.add_options([{"title": "First"}, {"title": "Second"}])
+
+    assert list(field.options.values_list("title", "order"))[1:] == [
+        ("First", 1),
+        ("Second", 2),
+    ]
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -12,6 +13,10 @@ from app.forms.serializers.forms import (
 )
 from app.forms.serializers.statistics import FormStatisticsSerializer
 
+# Submissions and form updates bump the statistics version, so this only evicts
+# statistics of forms which are no longer viewed
+STATISTICS_CACHE_TIMEOUT = 60 * 5
+
 
 class FormViewSet(APIFormErrorsMixin, BaseViewSet):
     serializer_class = FormPolymorphicSerializer
@@ -54,5 +59,9 @@ class FormViewSet(APIFormErrorsMixin, BaseViewSet):
     @action(detail=True, methods=["get"], url_path="statistics")
     def statistics(self, _request, *_args, **_kwargs):
         form = self.get_object()
-        serializer = FormStatisticsSerializer(form)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        cache_key = f"form:{form.id}:statistics:{form.get_statistics_version()}"
+        statistics = cache.get(cache_key)
+        if statistics is None:
+            statistics = FormStatisticsSerializer(form).data
+            cache.set(cache_key, statistics, STATISTICS_CACHE_TIMEOUT)
+        return Response(statistics, status=status.HTTP_200_OK)
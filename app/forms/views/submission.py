@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db.models import Prefetch
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
@@ -11,6 +12,7 @@ from rest_framework_csv.renderers import CSVRenderer
 from app.common.pagination import BasePagination
 from app.common.permissions import BasicViewPermission
 from app.common.viewsets import BaseViewSet
+from app.content.models import User
 from app.forms.csv_writer import SubmissionsCsvWriter
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.forms.mixins import APIFormErrorsMixin
@@ -43,8 +45,9 @@ class SubmissionViewSet(APIFormErrorsMixin, BaseViewSet):
             super()
             .get_queryset()
             .filter(form__id=form_id)
-            .select_related("user")
-            .prefetch_related("answers")
+            .prefetch_related(
+                Prefetch("user", queryset=User.objects.with_profile()), "answers"
+            )
         )
         if hasattr(self, "action") and self.action in ["list", "download"]:
             form = get_object_or_404(Form, id=form_id)
@@ -73,9 +76,15 @@ class SubmissionViewSet(APIFormErrorsMixin, BaseViewSet):
         return super().create(request, *args, **kwargs)
 
     @action(detail=False, methods=["get"], url_path="download")
-    def download(self, _request, *_args, **_kwargs):
-        """To return the response as csv, include header 'Accept: text/csv."""
-        return SubmissionsCsvWriter(self.get_queryset()).write_csv()
+    def download(self, request, *_args, **kwargs):
+        """
+        To return the response as csv, include header 'Accept: text/csv.
+        Add ?file_type=xlsx to return it as a spreadsheet instead.
+        """
+        writer = SubmissionsCsvWriter(self.get_queryset(), kwargs["form_id"])
+        if request.query_params.get("file_type") == "xlsx":
+            return writer.write_xlsx()
+        return writer.write_csv()
 
     @action(detail=False, methods=["delete"], url_path="delete-all")
     def delete_all(self, _request, *args, **kwargs):
@@ -1,9 +1,17 @@
 from django_filters.rest_framework import FilterSet
 
-from app.group.models import Fine
+from app.group.models import Fine, FineLedger
 
 
 class FineFilter(FilterSet):
     class Meta:
         model = Fine
         fields = ["payed", "approved", "starred"]
+
+
+class FineLedgerFilter(FilterSet):
+    """Filters the fine ledger with the same parameters as FineFilter"""
+
+    class Meta:
+        model = FineLedger
+        fields = FineFilter.Meta.fields
@@ -0,0 +1,104 @@
+import uuid
+from statistics import mean
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app.common.enums import NativeGroupType as GroupType
+from app.communication.models.mail import Mail
+from app.content.management.commands.benchmark_registrations import (
+    timed_request,
+)
+from app.content.models import User
+from app.group.models import Fine, Group, Membership
+
+
+class Command(BaseCommand):
+    help = (
+        "Issues a fine to groups of increasing size in a single request, as when a "
+        "whole group is fined, and reports the latency and queries per request. "
+        "Creates and deletes its own data, do not run it against production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 40, 80, 160],
+            help="Number of users fined in each request",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Number of requests per size"
+        )
+
+    def handle(self, *args, **options):
+        group, users = self.seed(max(options["sizes"]))
+        try:
+            client = APIClient()
+            client.credentials(
+                HTTP_X_CSRF_TOKEN=Token.objects.create(user=users[0]).key
+            )
+            url = reverse("fine-list", kwargs={"slug": group.slug})
+
+            for size in options["sizes"]:
+                user_ids = [user.user_id for user in users[:size]]
+                results = [
+                    timed_request(
+                        lambda: client.post(
+                            url,
+                            {
+                                "amount": 1,
+                                "description": "Benchmark",
+                                "user": user_ids,
+                            },
+                            format="json",
+                        )
+                    )
+                    for _ in range(options["repeat"])
+                ]
+                self.report(size, results)
+        finally:
+            self.clean_up(group, users)
+
+    def seed(self, size):
+        prefix = uuid.uuid4().hex[:6]
+        group = Group.objects.create(
+            name=f"Fine benchmark {prefix}",
+            slug=f"fine-benchmark-{prefix}",
+            type=GroupType.INTERESTGROUP,
+            fines_activated=True,
+        )
+        users = User.objects.bulk_create(
+            User(
+                user_id=f"fb{prefix}{number}",
+                first_name="Benchmark",
+                last_name=str(number),
+                email=f"fb{prefix}{number}@example.com",
+            )
+            for number in range(size)
+        )
+        Membership.objects.bulk_create(
+            Membership(user=user, group=group) for user in users
+        )
+        return group, users
+
+    def report(self, size, results):
+        status_codes = {status_code for status_code, _, _ in results}
+        latencies = [latency for _, latency, _ in results]
+        query_counts = [query_count for _, _, query_count in results]
+
+        self.stdout.write(
+            f"{size} users: latency mean {mean(latencies):.1f}ms, "
+            f"max {max(latencies):.1f}ms, queries per request {max(query_counts)}, "
+            f"status codes {sorted(status_codes)}"
+        )
+
+    def clean_up(self, group, users):
+        user_ids = [user.user_id for user in users]
+        Fine.objects.filter(group=group).delete()
+        Mail.objects.filter(users__in=user_ids).delete()
+        group.delete()
+        User.objects.filter(user_id__in=user_ids).delete()
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from app.group.models import Fine, FineLedger
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the fine ledger, which holds the fine totals per user and group, from the fines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--group",
+            help="Slug of the group to rebuild, instead of the whole ledger",
+        )
+
+    def handle(self, *args, **options):
+        if options["group"]:
+            FineLedger.rebuild(Fine.objects.filter(group_id=options["group"]))
+            rows = FineLedger.objects.filter(group_id=options["group"])
+        else:
+            FineLedger.rebuild()
+            rows = FineLedger.objects.all()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the fine ledger with {rows.count()} row(s)")
+        )
@@ -0,0 +1,83 @@
+# Generated by Django 5.1.1 on 2026-10-18 18:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def build_fine_ledger(apps, schema_editor):
+    Fine = apps.get_model("group", "Fine")
+    FineLedger = apps.get_model("group", "FineLedger")
+    totals = (
+        Fine.objects.order_by()
+        .values("group_id", "user_id", "approved", "payed", "starred")
+        .annotate(total=Sum("amount"))
+    )
+    FineLedger.objects.bulk_create(
+        (
+            FineLedger(
+                group_id=total["group_id"],
+                user_id=total["user_id"],
+                approved=total["approved"],
+                payed=total["payed"],
+                starred=total["starred"],
+                amount=total["total"],
+            )
+            for total in totals.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("group", "0027_group_subtype_check_constraint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FineLedger",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("approved", models.BooleanField()),
+                ("payed", models.BooleanField()),
+                ("starred", models.BooleanField()),
+                ("amount", models.IntegerField(default=0)),
+                (
+                    "group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fine_ledger",
+                        to="group.group",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fine_ledger",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("group", "user", "approved", "payed", "starred")},
+            },
+        ),
+        migrations.RunPython(
+            build_fine_ledger, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -1,4 +1,5 @@
+from app.group.models.fine import Fine
+from app.group.models.fine_ledger import FineLedger
 from app.group.models.group import Group
-from app.group.models.membership import Membership, MembershipHistory
 from app.group.models.law import Law
-from app.group.models.fine import Fine
+from app.group.models.membership import Membership, MembershipHistory
@@ -1,11 +1,18 @@
 import uuid
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from app.common.enums import AdminGroup
-from app.common.permissions import BasePermissionModel, check_has_access
+from app.common.permissions import (
+    BasePermissionModel,
+    check_has_access,
+    get_group_access,
+)
 from app.content.models.user import User
 from app.group.exceptions import UserIsNotInGroup
+from app.group.models.fine_ledger import LEDGER_STATE_FIELDS, FineLedger
 from app.group.models.group import Group
 from app.util.models import BaseModel, OptionalImage
 
@@ -42,9 +49,49 @@ class Fine(BaseModel, OptionalImage, BasePermissionModel):
 
     def clean(self):
         if not self.user.is_member_of(self.group):
-            raise UserIsNotInGroup(
-                f"{self.user.first_name} {self.user.last_name} er ikke medlem i gruppen"
-            )
+            raise self._get_user_is_not_in_group_error(self.user)
+
+    @staticmethod
+    def _get_user_is_not_in_group_error(user):
+        return UserIsNotInGroup(
+            f"{user.first_name} {user.last_name} er ikke medlem i gruppen"
+        )
+
+    @classmethod
+    def create_for_users(cls, users, group, created_by, **fields):
+        """
+        Creates the same fine for each of the users, who must all be members of the group.
+        The memberships are checked in a single query and the fines inserted in bulk,
+        instead of cleaning and saving each fine by itself.
+        """
+        users = list(users)
+        member_ids = set(
+            group.memberships.filter(user__in=users).values_list("user_id", flat=True)
+        )
+        for user in users:
+            if user.user_id not in member_ids:
+                raise cls._get_user_is_not_in_group_error(user)
+
+        fines = cls.objects.bulk_create(
+            cls(group=group, created_by=created_by, user=user, **fields)
+            for user in users
+        )
+        entries = [FineLedger.get_entry(fine) for fine in fines]
+        FineLedger.apply(added=entries)
+        for fine, entry in zip(fines, entries):
+            fine._ledger_entry = entry
+        return fines
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembers what the fine added to the ledger, to move it when the fine changes
+        if all(
+            field in field_names
+            for field in ("group_id", "user_id", "amount", *LEDGER_STATE_FIELDS)
+        ):
+            instance._ledger_entry = FineLedger.get_entry(instance)
+        return instance
 
     def save(self, *args, **kwargs):
         self.full_clean()
@@ -57,7 +104,7 @@ class Fine(BaseModel, OptionalImage, BasePermissionModel):
             return check_has_access(cls.access, request)
         return request.user and (
             check_has_access(cls.access, request)
-            or request.user.is_member_of(
+            or get_group_access(request).is_member(
                 Group.get_group_from_permission_context(request)
             )
         )
@@ -66,9 +113,9 @@ class Fine(BaseModel, OptionalImage, BasePermissionModel):
     def has_create_permission(cls, request):
         if not Group.check_context(request):
             return check_has_access(cls.access, request)
-        return check_has_access(cls.access, request) or request.user.is_member_of(
-            Group.get_group_from_permission_context(request)
-        )
+        return check_has_access(cls.access, request) or get_group_access(
+            request
+        ).is_member(Group.get_group_from_permission_context(request))
 
     @classmethod
     def has_update_permission(cls, request):
@@ -92,3 +139,25 @@ class Fine(BaseModel, OptionalImage, BasePermissionModel):
 
     def has_object_update_defense_permission(self, request):
         return self.user == request.user
+
+
+@receiver(post_save, sender=Fine)
+def update_fine_ledger(sender, instance, created, **_kwargs):
+    entry = FineLedger.get_entry(instance)
+    previous_entry = getattr(instance, "_ledger_entry", None)
+    if created or previous_entry is not None:
+        FineLedger.apply(
+            added=[entry], removed=[previous_entry] if previous_entry else []
+        )
+    else:
+        # What the fine used to add to the ledger is unknown, so its rows are recomputed
+        FineLedger.rebuild(Fine.objects.filter(pk=instance.pk))
+    instance._ledger_entry = entry
+
+
+@receiver(post_delete, sender=Fine)
+def remove_from_fine_ledger(sender, instance, **_kwargs):
+    entry = getattr(instance, "_ledger_entry", None)
+    if entry is None:
+        entry = FineLedger.get_entry(instance)
+    FineLedger.apply(removed=[entry])
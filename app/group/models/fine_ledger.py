@@ -0,0 +1,128 @@
+from functools import reduce
+from operator import or_
+
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Sum, Value, When
+
+from app.content.models.user import User
+from app.group.models.group import Group
+from app.util.models import BaseModel
+
+LEDGER_STATE_FIELDS = ("approved", "payed", "starred")
+
+
+class FineLedger(BaseModel):
+    """
+    The total amount of the fines of a user in a group, for each approved, payed
+    and starred state. It is kept up to date as fines change, so the totals of a
+    group are read from a few rows instead of summing all of its fines.
+    """
+
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name="fine_ledger"
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="fine_ledger")
+    approved = models.BooleanField()
+    payed = models.BooleanField()
+    starred = models.BooleanField()
+    amount = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("group", "user", "approved", "payed", "starred")
+
+    def __str__(self):
+        return f"{self.group_id} - {self.user_id} - {self.amount}"
+
+    @staticmethod
+    def get_entry(fine):
+        """Returns the ledger row of the fine and the amount it adds to it"""
+        key = (fine.group_id, fine.user_id) + tuple(
+            getattr(fine, field) for field in LEDGER_STATE_FIELDS
+        )
+        return key, fine.amount
+
+    @classmethod
+    def _get_filter(cls, key):
+        group_id, user_id, *state = key
+        return Q(
+            group_id=group_id, user_id=user_id, **dict(zip(LEDGER_STATE_FIELDS, state))
+        )
+
+    @classmethod
+    def apply(cls, added=(), removed=()):
+        """
+        Adds and removes ledger entries, as returned by get_entry, in at most two queries.
+        Rows are only created for added entries, so removing the fines of a user
+        or group which is being deleted does not recreate its rows.
+        """
+        deltas = {}
+        for key, amount in added:
+            deltas[key] = deltas.get(key, 0) + amount
+        for key, amount in removed:
+            deltas[key] = deltas.get(key, 0) - amount
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        new_keys = [key for key, delta in deltas.items() if delta > 0]
+        if new_keys:
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        group_id=group_id,
+                        user_id=user_id,
+                        **dict(zip(LEDGER_STATE_FIELDS, state)),
+                    )
+                    for group_id, user_id, *state in new_keys
+                ],
+                ignore_conflicts=True,
+            )
+
+        filters = {key: cls._get_filter(key) for key in deltas}
+        cls.objects.filter(reduce(or_, filters.values())).update(
+            amount=F("amount")
+            + Case(
+                *[
+                    When(filters[key], then=Value(delta))
+                    for key, delta in deltas.items()
+                ],
+                default=Value(0),
+            )
+        )
+
+    @classmethod
+    def rebuild(cls, fines=None):
+        """
+        Recomputes the ledger rows of the groups and users of the given fines,
+        or the whole ledger, from the fines. Used after updates which bypass
+        the signals of Fine, and to repair the ledger.
+        """
+        from app.group.models.fine import Fine
+
+        all_fines = Fine.objects.all()
+        rows = cls.objects.all()
+        if fines is not None:
+            pairs = set(fines.order_by().values_list("group_id", "user_id").distinct())
+            if not pairs:
+                return
+            group_ids = {group_id for group_id, _ in pairs}
+            user_ids = {user_id for _, user_id in pairs}
+            all_fines = all_fines.filter(group_id__in=group_ids, user_id__in=user_ids)
+            rows = rows.filter(group_id__in=group_ids, user_id__in=user_ids)
+
+        totals = (
+            all_fines.order_by()
+            .values("group_id", "user_id", *LEDGER_STATE_FIELDS)
+            .annotate(total=Sum("amount"))
+        )
+        with transaction.atomic():
+            rows.delete()
+            cls.objects.bulk_create(
+                cls(
+                    group_id=total["group_id"],
+                    user_id=total["user_id"],
+                    amount=total["total"],
+                    **{field: total[field] for field in LEDGER_STATE_FIELDS},
+                )
+                for total in totals
+            )
@@ -8,6 +8,8 @@ from app.common.enums import NativeInterestGroupType as InterestGroupType
 from app.common.permissions import (
     BasePermissionModel,
     check_has_access,
+    get_group_access,
+    get_request_cached,
     set_user_id,
 )
 from app.communication.enums import UserNotificationSettingType
@@ -135,36 +137,30 @@ class Group(OptionalImage, BaseModel, BasePermissionModel):
         if request.id is None:
             set_user_id(request)
         group_slug = request.parser_context["kwargs"]["slug"]
-        group = cls.objects.get(slug=group_slug)
-        membership = group.memberships.filter(
-            group__slug=group_slug, user__user_id=request.id
-        )
-        return len(membership) == 1 and membership[0].is_leader()
+        return get_group_access(request).is_leader(group_slug)
 
     @classmethod
     def check_request_user_is_member(cls, request):
         if request.id is None:
             set_user_id(request)
         group_slug = request.parser_context["kwargs"]["slug"]
-        group = cls.objects.get(slug=group_slug)
-        membership = group.memberships.filter(
-            group__slug=group_slug, user__user_id=request.id
-        )
-        return len(membership) == 1
+        return get_group_access(request).is_member(group_slug)
 
     @classmethod
     def check_user_is_fine_master(cls, request):
         group = cls.get_group_from_permission_context(request)
         return (
-            group.fines_admin
+            group.fines_admin_id is not None
             and request.user
-            and request.user.user_id == group.fines_admin.user_id
+            and request.user.user_id == group.fines_admin_id
         )
 
     @classmethod
     def get_group_from_permission_context(cls, request):
         group_slug = request.parser_context["kwargs"]["slug"]
-        return cls.objects.get(slug=group_slug)
+        return get_request_cached(
+            request, (cls, group_slug), lambda: cls.objects.get(slug=group_slug)
+        )
 
     @classmethod
     def has_write_permission(cls, request):
@@ -182,24 +178,15 @@ class Group(OptionalImage, BaseModel, BasePermissionModel):
         return check_has_access(cls.write_access, request)
 
     def has_object_write_permission(self, request):
-        from app.group.models import Membership
-
-        if request.id is None:
-            set_user_id(request)
-        try:
-            return self.memberships.get(
-                group__slug=self.slug, user__user_id=request.id
-            ).is_leader() or super().has_object_write_permission(request)
-        except Membership.DoesNotExist:
-            return super().has_object_write_permission(request)
+        return get_group_access(request).is_leader(
+            self
+        ) or super().has_object_write_permission(request)
 
     def has_object_group_form_permission(self, request):
         """Checks if a user has access to read and write to group forms is used as a serializer field"""
         return (
             request.user
-            and request.user.memberships_with_group_form_access.filter(
-                group=self
-            ).exists()
+            and get_group_access(request).has_events_access(self)
             or super().has_write_permission(request)
         )
 
@@ -4,7 +4,7 @@ from django.db.transaction import atomic
 from app.common.enums import AdminGroup
 from app.common.enums import NativeGroupType as GroupType
 from app.common.enums import NativeMembershipType as MembershipType
-from app.common.permissions import BasePermissionModel
+from app.common.permissions import BasePermissionModel, get_group_access
 from app.content.models.user import User
 from app.group.models.group import Group
 from app.util.models import BaseModel
@@ -86,9 +86,7 @@ class Membership(BaseModel, BasePermissionModel):
         assert request.parser_context["kwargs"]["slug"]
 
         group_slug = request.parser_context["kwargs"]["slug"]
-        return Membership.objects.get(
-            user__user_id=request.id, group__slug=group_slug
-        ).is_leader()
+        return get_group_access(request).is_leader(group_slug)
 
     @classmethod
     def has_read_permission(cls, request):
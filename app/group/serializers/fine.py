@@ -1,3 +1,4 @@
+from django.db.models import Q
 from django.db.models.aggregates import Sum
 from django.db.transaction import atomic
 from rest_framework import serializers
@@ -6,6 +7,7 @@ from app.common.serializers import BaseModelSerializer
 from app.content.models.user import User
 from app.content.serializers.user import DefaultUserSerializer
 from app.group.models.fine import Fine
+from app.group.models.fine_ledger import FineLedger
 from app.group.models.group import Group
 from app.group.serializers.group import SimpleGroupSerializer
 
@@ -15,21 +17,16 @@ class FineListSerializer(serializers.ListSerializer):
     def create(self, validated_data):
         validated_data = validated_data[0]
         group = Group.objects.get(slug=self.context["group_slug"])
-        users = User.objects.filter(user_id__in=self.context["user_ids"])
+        users = User.objects.with_profile().filter(user_id__in=self.context["user_ids"])
         created_by = User.objects.get(user_id=self.context["created_by"])
 
-        fines = [
-            Fine.objects.create(
-                group=group, created_by=created_by, user=user, **validated_data
-            )
-            for user in users
-        ]
-        return fines
+        return Fine.create_for_users(users, group, created_by, **validated_data)
 
     @atomic
     def update(self, instance, validated_data):
         validated_data = self.context["data"]
         instance.update(**validated_data)
+        FineLedger.rebuild(instance)
 
         return instance
 
@@ -154,15 +151,27 @@ class FineStatisticsSerializer(BaseModelSerializer):
 
         fields = ("payed", "approved_and_not_payed", "not_approved")
 
-    def get_sum(self, obj, *args, **kwargs):
-        sum = obj.fines.filter(*args, **kwargs).aggregate(sum=Sum("amount"))["sum"]
+    def get_sums(self, obj):
+        """Sums the fines of the group from its ledger, in a single query"""
+        if not hasattr(self, "_sums"):
+            self._sums = obj.fine_ledger.aggregate(
+                payed_sum=Sum("amount", filter=Q(payed=True)),
+                approved_and_not_payed_sum=Sum(
+                    "amount", filter=Q(payed=False, approved=True)
+                ),
+                not_approved_sum=Sum("amount", filter=Q(approved=False)),
+            )
+        return self._sums
+
+    def get_sum(self, obj, name):
+        sum = self.get_sums(obj)[f"{name}_sum"]
         return sum if sum else 0
 
     def get_payed(self, obj):
-        return self.get_sum(obj, payed=True)
+        return self.get_sum(obj, "payed")
 
     def get_approved_and_not_payed(self, obj):
-        return self.get_sum(obj, payed=False, approved=True)
+        return self.get_sum(obj, "approved_and_not_payed")
 
     def get_not_approved(self, obj):
-        return self.get_sum(obj, approved=False)
+        return self.get_sum(obj, "not_approved")
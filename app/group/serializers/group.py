@@ -1,9 +1,8 @@
 from rest_framework import serializers
 
-from dry_rest_permissions.generics import DRYPermissionsField
-
 from app.common.enums import NativeGroupType as GroupType
 from app.common.enums import NativeMembershipType as MembershipType
+from app.common.permissions import PermissionsField, get_group_access
 from app.common.serializers import BaseModelSerializer
 from app.content.models.user import User
 from app.content.serializers.user import DefaultUserSerializer
@@ -31,7 +30,7 @@ class SimpleGroupSerializer(BaseModelSerializer):
     def get_viewer_is_member(self, obj):
         request = self.context.get("request", None)
         if request and request.user:
-            return request.user.is_member_of(obj)
+            return get_group_access(request).is_member(obj)
         return False
 
 
@@ -59,7 +58,7 @@ class GroupListSerializer(SimpleGroupSerializer):
 
 
 class GroupSerializer(GroupListSerializer):
-    permissions = DRYPermissionsField(
+    permissions = PermissionsField(
         actions=["write", "read", "group_form"], object_only=True
     )
     fines_admin = DefaultUserSerializer(read_only=True)
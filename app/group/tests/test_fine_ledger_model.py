@@ -0,0 +1,100 @@
+import pytest
+
+from app.content.factories import UserFactory
+from app.group.factories import GroupFactory, MembershipFactory
+from app.group.factories.fine_factory import FineFactory
+from app.group.models import Fine, FineLedger
+
+
+@pytest.fixture()
+def group():
+    return GroupFactory()
+
+
+@pytest.fixture()
+def users(group):
+    users = UserFactory.create_batch(2)
+    for user in users:
+        MembershipFactory(user=user, group=group)
+    return users
+
+
+def get_ledger(group):
+    return {
+        (row.user_id, row.approved, row.payed, row.starred): row.amount
+        for row in FineLedger.objects.filter(group=group)
+        if row.amount
+    }
+
+
+def get_rebuilt_ledger(group):
+    FineLedger.rebuild()
+    return get_ledger(group)
+
+
+@pytest.mark.django_db
+def test_creating_fines_adds_them_to_the_ledger(group, users):
+    FineFactory(group=group, user=users[0], amount=2)
+    FineFactory(group=group, user=users[0], amount=3)
+    FineFactory(group=group, user=users[1], amount=1, approved=True)
+
+    assert get_ledger(group) == {
+        (users[0].user_id, False, False, False): 5,
+        (users[1].user_id, True, False, False): 1,
+    }
+
+
+@pytest.mark.django_db
+def test_creating_fines_for_users_adds_them_to_the_ledger(group, users):
+    Fine.create_for_users(users, group, UserFactory(), amount=2)
+
+    assert get_ledger(group) == {
+        (users[0].user_id, False, False, False): 2,
+        (users[1].user_id, False, False, False): 2,
+    }
+
+
+@pytest.mark.django_db
+def test_updating_a_fine_moves_it_in_the_ledger(group, users):
+    FineFactory(group=group, user=users[0], amount=2)
+    fine = FineFactory(group=group, user=users[0], amount=3)
+
+    fine = Fine.objects.get(id=fine.id)
+    fine.approved = True
+    fine.amount = 4
+    fine.save()
+
+    assert get_ledger(group) == {
+        (users[0].user_id, False, False, False): 2,
+        (users[0].user_id, True, False, False): 4,
+    }
+    assert get_ledger(group) == get_rebuilt_ledger(group)
+
+
+@pytest.mark.django_db
+def test_deleting_a_fine_removes_it_from_the_ledger(group, users):
+    FineFactory(group=group, user=users[0], amount=2)
+    fine = FineFactory(group=group, user=users[0], amount=3)
+
+    Fine.objects.get(id=fine.id).delete()
+
+    assert get_ledger(group) == {(users[0].user_id, False, False, False): 2}
+
+
+@pytest.mark.django_db
+def test_deleting_a_user_with_fines_deletes_their_ledger(group, users):
+    FineFactory(group=group, user=users[0], amount=2)
+
+    users[0].delete()
+
+    assert not FineLedger.objects.filter(user_id=users[0].user_id).exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_repairs_a_drifted_ledger(group, users):
+    FineFactory(group=group, user=users[0], amount=2)
+    Fine.objects.filter(group=group).update(payed=True)
+
+    FineLedger.rebuild(Fine.objects.filter(group=group))
+
+    assert get_ledger(group) == {(users[0].user_id, False, True, False): 2}
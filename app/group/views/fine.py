@@ -1,4 +1,4 @@
-from django.db.models import Subquery
+from django.db.models import Prefetch, Subquery
 from django.db.models.aggregates import Coalesce, Sum
 from django.db.models.expressions import OuterRef
 from django_filters.rest_framework import DjangoFilterBackend
@@ -12,9 +12,10 @@ from app.common.permissions import BasicViewPermission
 from app.common.viewsets import BaseViewSet
 from app.communication.enums import UserNotificationSettingType
 from app.content.models.user import User
-from app.group.filters.fine import FineFilter
+from app.group.filters.fine import FineFilter, FineLedgerFilter
 from app.group.mixins import APIFineErrorsMixin
 from app.group.models.fine import Fine
+from app.group.models.fine_ledger import FineLedger
 from app.group.models.group import Group
 from app.group.serializers.fine import (
     FineNoUserSerializer,
@@ -30,19 +31,26 @@ from app.group.serializers.fine import (
 class FineViewSet(APIFineErrorsMixin, BaseViewSet, ActionMixin):
     serializer_class = FineSerializer
     permission_classes = [BasicViewPermission]
-    queryset = Fine.objects.select_related(
-        "created_by",
-        "user",
-    )
+    queryset = Fine.objects.all()
     filter_backends = [DjangoFilterBackend]
     filterset_class = FineFilter
     pagination_class = BasePagination
 
     def get_queryset(self):
-        return self.filter_queryset(self.queryset).filter(
-            group__slug=self.kwargs["slug"], group__fines_activated=True
+        return (
+            self.filter_queryset(self.queryset)
+            .filter(group__slug=self.kwargs["slug"], group__fines_activated=True)
+            .prefetch_related(
+                Prefetch("created_by", queryset=User.objects.with_profile()),
+                Prefetch("user", queryset=User.objects.with_profile()),
+            )
         )
 
+    def get_cursor_ordering(self):
+        if self.action in ("list", "get_user_fines"):
+            return ("-created_at", "id")
+        return None
+
     # noinspection PyShadowingNames
     def create(self, request, *args, **kwargs):
         context = {
@@ -61,7 +69,7 @@ class FineViewSet(APIFineErrorsMixin, BaseViewSet, ActionMixin):
 
             if len(fines):
                 fine = fines[0]
-                users = list(map(lambda fine: fine.user, fines))
+                users = [fine.user for fine in fines]
 
                 from app.communication.notifier import Notify
 
@@ -74,7 +82,7 @@ class FineViewSet(APIFineErrorsMixin, BaseViewSet, ActionMixin):
                 ).add_link(
                     "Gå til bøter",
                     f"{fine.group.website_url}boter/",
-                ).send()
+                ).send_async()
 
             return Response(data=serializer.data, status=status.HTTP_200_OK)
         return Response(
@@ -90,11 +98,7 @@ class FineViewSet(APIFineErrorsMixin, BaseViewSet, ActionMixin):
     def get_user_fines(self, _request, *_args, **kwargs):
         """Get the fines of a specific user in a group"""
 
-        fines = (
-            self.get_queryset()
-            .select_related("created_by")
-            .filter(user__user_id=kwargs["user_id"])
-        )
+        fines = self.get_queryset().filter(user__user_id=kwargs["user_id"])
         return self.paginate_response(data=fines, serializer=FineNoUserSerializer)
 
     @action(detail=False, methods=["get"], url_path="users")
@@ -104,20 +108,22 @@ class FineViewSet(APIFineErrorsMixin, BaseViewSet, ActionMixin):
         return self.paginate_response(data=users, serializer=UserFineSerializer)
 
     def get_fine_filter_query(self):
+        ledger = FineLedger.objects.filter(
+            user=OuterRef("pk"),
+            group=self.kwargs["slug"],
+            group__fines_activated=True,
+        )
         fines_amount = (
-            self.get_queryset()
-            .filter(
-                user=OuterRef("pk"),
-                group=self.kwargs["slug"],
-                group__fines_activated=True,
-            )
-            .order_by()
+            FineLedgerFilter(self.request.query_params, queryset=ledger)
+            .qs.order_by()
             .values("user")
             .annotate(count=Sum("amount"))
             .values("count")
         )
-        return User.objects.filter(memberships__group=self.kwargs["slug"]).annotate(
-            fines_amount=Coalesce(Subquery(fines_amount), 0)
+        return (
+            User.objects.filter(memberships__group=self.kwargs["slug"])
+            .with_profile()
+            .annotate(fines_amount=Coalesce(Subquery(fines_amount), 0))
         )
 
     @action(detail=False, methods=["put"], url_path="batch-update")
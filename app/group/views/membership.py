@@ -1,4 +1,5 @@
 from django.core.exceptions import ValidationError
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
@@ -24,7 +25,7 @@ from app.group.serializers.membership import (
 class MembershipViewSet(BaseViewSet):
 
     serializer_class = MembershipSerializer
-    queryset = Membership.objects.select_related("group", "user")
+    queryset = Membership.objects.select_related("group")
     permission_classes = [BasicViewPermission]
     pagination_class = BasePagination
     filter_backends = [DjangoFilterBackend]
@@ -32,7 +33,12 @@ class MembershipViewSet(BaseViewSet):
     lookup_field = "user_id"
 
     def get_queryset(self):
-        return super().get_queryset().filter(group__slug=self.kwargs["slug"])
+        return (
+            super()
+            .get_queryset()
+            .filter(group__slug=self.kwargs["slug"])
+            .prefetch_related(Prefetch("user", queryset=User.objects.with_profile()))
+        )
 
     def get_serializer_class(self):
         if is_admin_user(self.request) or IsLeader().has_permission(
@@ -1,9 +1,11 @@
+from django.db.models import Prefetch
 from rest_framework import status
 from rest_framework.response import Response
 
 from app.common.pagination import BasePagination
 from app.common.permissions import BasicViewPermission
 from app.common.viewsets import BaseViewSet
+from app.content.models import User
 from app.group.models import MembershipHistory
 from app.group.serializers import MembershipHistorySerializer
 
@@ -16,7 +18,13 @@ class MembershipHistoryViewSet(BaseViewSet):
     pagination_class = BasePagination
 
     def get_queryset(self):
-        return super().get_queryset().filter(group__slug=self.kwargs["slug"])
+        return (
+            super()
+            .get_queryset()
+            .filter(group__slug=self.kwargs["slug"])
+            .select_related("group")
+            .prefetch_related(Prefetch("user", queryset=User.objects.with_profile()))
+        )
 
     def destroy(self, request, *args, **kwargs):
         super().destroy(request, *args, **kwargs)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payment", "0003_alter_order_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="status_checked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
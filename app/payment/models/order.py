@@ -1,15 +1,19 @@
 import uuid
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from app.common.enums import AdminGroup, Groups
 from app.common.permissions import (
     BasePermissionModel,
     check_has_access,
+    get_group_access,
     is_admin_user,
 )
 from app.content.models.event import Event
 from app.content.models.user import User
+from app.content.util.registration_utils import bump_registration_version
 from app.group.models.membership import Membership
 from app.payment.enums import OrderStatus
 from app.util.models import BaseModel
@@ -32,6 +36,8 @@ class Order(BaseModel, BasePermissionModel):
         choices=OrderStatus.choices, default=OrderStatus.INITIATE, max_length=16
     )
     payment_link = models.URLField(max_length=2000)
+    # When the status was last confirmed by Vipps, through a callback or by polling
+    status_checked_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         verbose_name_plural = "Orders"
@@ -72,7 +78,7 @@ class Order(BaseModel, BasePermissionModel):
         return (
             check_has_access(cls.read_access, request)
             or is_admin_user(request)
-            or request.user.memberships_with_events_access.exists()
+            or get_group_access(request).has_events_access()
         )
 
     @classmethod
@@ -82,7 +88,7 @@ class Order(BaseModel, BasePermissionModel):
 
         return (
             check_has_access(cls.read_access, request)
-            or request.user.memberships_with_events_access.exists()
+            or get_group_access(request).has_events_access()
         )
 
     @classmethod
@@ -110,16 +116,21 @@ class Order(BaseModel, BasePermissionModel):
         organizer = self.event.organizer
 
         return (
-            self.check_request_user_has_access_through_organizer(
-                request.user, organizer
-            )
+            self.check_request_user_has_access_through_organizer(request, organizer)
             or is_admin_user(request)
             or self.user == request.user
         )
 
-    def check_request_user_has_access_through_organizer(self, user, organizer):
+    def check_request_user_has_access_through_organizer(self, request, organizer):
         # All memberships that have access to events will also have access to orders
         if not organizer:
             return False
 
-        return user.memberships_with_events_access.filter(group=organizer).exists()
+        return get_group_access(request).has_events_access(organizer)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_registration_version(sender, instance, **_kwargs):
+    if instance.event_id:
+        bump_registration_version(instance.event_id)
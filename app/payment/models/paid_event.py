@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from app.common.enums import AdminGroup
 from app.content.models.event import Event
+from app.content.util.event_response_cache import bump_event_version
 from app.util.models import BaseModel
 
 
@@ -24,3 +27,9 @@ class PaidEvent(BaseModel):
         return (
             f"Event: {self.event.title} - Price: {self.price} - Paytime: {self.paytime}"
         )
+
+
+@receiver(post_save, sender=PaidEvent)
+@receiver(post_delete, sender=PaidEvent)
+def invalidate_event_responses(sender, instance, **_kwargs):
+    bump_event_version(instance.event_id)
@@ -1,3 +1,6 @@
+from time import perf_counter
+
+from django.db.models import F
 from django.utils import timezone
 
 from sentry_sdk import capture_exception
@@ -5,9 +8,11 @@ from sentry_sdk import capture_exception
 from app.celery import app
 from app.content.models.event import Event
 from app.content.models.registration import Registration
+from app.payment.enums import OrderStatus
 from app.payment.models.order import Order
 from app.payment.util.order_utils import (
     has_paid_order,
+    poll_order_statuses,
     reconcile_orders_from_vipps,
 )
 from app.util.tasks import BaseTask
@@ -55,3 +60,39 @@ def sweep_expired_unpaid_registrations(_self):
                 registration.move_to_waiting_list_for_nonpayment()
             except Exception as e:
                 capture_exception(e)
+
+
+ORDER_RECONCILE_BATCH_SIZE = 200
+
+
+@app.task(bind=True, base=BaseTask)
+def reconcile_order_statuses(self, *_args, **_kwargs):
+    """Poll Vipps for the non-final orders of events which have not ended,
+    the orders with the oldest local status first, so the payment checks
+    and the registration lists can rely on the local status."""
+    orders = list(
+        Order.objects.filter(
+            status=OrderStatus.INITIATE, event__end_date__gt=timezone.now()
+        ).order_by(
+            F("status_checked_at").asc(nulls_first=True), "event_id", "created_at"
+        )[
+            :ORDER_RECONCILE_BATCH_SIZE
+        ]
+    )
+    if not orders:
+        return None
+
+    stale_seconds = max(
+        (timezone.now() - (order.status_checked_at or order.created_at)).total_seconds()
+        for order in orders
+    )
+    start = perf_counter()
+    metrics = poll_order_statuses(orders)
+    latency_ms = (perf_counter() - start) * 1000
+
+    self.logger.info(
+        f"Reconciled {metrics['checked']}/{len(orders)} orders in {latency_ms:.0f}ms, "
+        f"{metrics['changed']} changed and {metrics['failed']} failed. "
+        f"The oldest local status was {stale_seconds:.0f}s old"
+    )
+    return {**metrics, "stale_seconds": stale_seconds, "latency_ms": latency_ms}
@@ -9,6 +9,7 @@ from app.payment.enums import OrderStatus
 from app.payment.factories import OrderFactory
 from app.payment.tasks import (
     check_if_has_paid,
+    reconcile_order_statuses,
     sweep_expired_unpaid_registrations,
 )
 from app.payment.util.order_utils import check_if_order_is_paid, is_expired
@@ -368,3 +369,69 @@ def test_reconcile_skips_final_state_orders(event, registration, mock_vipps_stat
     check_if_has_paid(event.id, registration.registration_id)
 
     mock_vipps_status.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_check_if_has_paid_uses_recently_checked_status(
+    event, registration, mock_vipps_status
+):
+    """An order status which Vipps confirmed recently should not be re-queried."""
+
+    OrderFactory(event=event, user=registration.user, status_checked_at=timezone.now())
+
+    check_if_has_paid(event.id, registration.registration_id)
+
+    registration.refresh_from_db()
+
+    mock_vipps_status.assert_not_called()
+    assert registration.is_on_wait
+
+
+@pytest.mark.django_db
+def test_reconcile_order_statuses_updates_non_final_orders(event, mock_vipps_status):
+    """The reconciler should store the Vipps status and when it was checked."""
+
+    initiated_order = OrderFactory(event=event)
+    cancelled_order = OrderFactory(event=event, status=OrderStatus.CANCEL)
+    mock_vipps_status.return_value = OrderStatus.SALE
+
+    metrics = reconcile_order_statuses()
+
+    initiated_order.refresh_from_db()
+    cancelled_order.refresh_from_db()
+
+    assert initiated_order.status == OrderStatus.SALE
+    assert initiated_order.status_checked_at is not None
+    assert cancelled_order.status == OrderStatus.CANCEL
+    assert metrics["checked"] == 1
+    assert metrics["changed"] == 1
+    mock_vipps_status.assert_called_once_with(initiated_order.order_id)
+
+
+@pytest.mark.django_db
+def test_reconcile_order_statuses_ignores_orders_of_ended_events(mock_vipps_status):
+    event = EventFactory(
+        start_date=timezone.now() - timezone.timedelta(days=2),
+        end_date=timezone.now() - timezone.timedelta(days=1),
+    )
+    OrderFactory(event=event)
+
+    reconcile_order_statuses()
+
+    mock_vipps_status.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_reconcile_order_statuses_keeps_local_status_when_vipps_fails(
+    event, mock_vipps_status
+):
+    order = OrderFactory(event=event)
+    mock_vipps_status.side_effect = Exception("Vipps unavailable")
+
+    metrics = reconcile_order_statuses()
+
+    order.refresh_from_db()
+
+    assert order.status == OrderStatus.INITIATE
+    assert order.status_checked_at is None
+    assert metrics["failed"] == 1
@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
 from django.db.models import (
     BooleanField,
     Case,
@@ -12,11 +15,16 @@ from django.utils import timezone
 
 from sentry_sdk import capture_exception
 
+from app.content.util.registration_utils import bump_registration_version
 from app.payment.enums import OrderStatus
 from app.payment.util.payment_utils import get_payment_order_status
 
 PAID_ORDER_STATUSES = (OrderStatus.SALE, OrderStatus.CAPTURE, OrderStatus.RESERVED)
 
+# A local status older than this is checked with Vipps before a registration is waitlisted
+ORDER_STATUS_MAX_AGE = timedelta(minutes=10)
+ORDER_STATUS_POLL_WORKERS = 8
+
 
 def annotate_suspicious_payment(queryset):
     from app.payment.models import Order
@@ -109,29 +117,75 @@ def check_if_order_is_paid(order):
     return False
 
 
-def reconcile_orders_from_vipps(orders):
-    """For each non-final order, fetch the authoritative status from Vipps
-    and persist it. Returns True if any order is now paid.
+def is_order_status_stale(order):
+    """Checks if the order is not final and Vipps has not confirmed its status recently"""
+    return order.status == OrderStatus.INITIATE and (
+        order.status_checked_at is None
+        or order.status_checked_at < timezone.now() - ORDER_STATUS_MAX_AGE
+    )
+
+
+def poll_order_statuses(orders):
+    """Fetch the status of the non-final orders from Vipps in parallel and
+    persist it. Returns how many orders were checked, changed and failed.
 
-    Final states (SALE, CAPTURE, RESERVED, REFUND, CANCEL, VOID) are left
-    untouched so a stale Vipps response can never overwrite a settled order.
-    Per-order failures are sent to Sentry and the loop continues, so a Vipps
-    outage degrades to the local view rather than breaking the caller.
+    An order is only moved out of INITIATE, so a stale Vipps response can
+    never overwrite an order which was settled by a callback in the meantime.
+    Per-order failures are sent to Sentry, and the order keeps its local status.
     """
+    from app.payment.models import Order
+
+    orders = [order for order in orders if order.status == OrderStatus.INITIATE]
+    metrics = {"checked": 0, "changed": 0, "failed": 0}
     if not orders:
-        return False
+        return metrics
 
-    for order in orders:
-        if order.status != OrderStatus.INITIATE:
-            continue
+    def fetch_status(order):
         try:
-            vipps_status = get_payment_order_status(order.order_id)
-            if vipps_status and vipps_status != order.status:
-                order.status = vipps_status
-                order.save()
+            return get_payment_order_status(order.order_id)
         except Exception as e:
             capture_exception(e)
+            return None
+
+    with ThreadPoolExecutor(
+        max_workers=min(ORDER_STATUS_POLL_WORKERS, len(orders))
+    ) as executor:
+        vipps_statuses = list(executor.map(fetch_status, orders))
+
+    checked_at = timezone.now()
+    for order, vipps_status in zip(orders, vipps_statuses):
+        if not vipps_status:
+            metrics["failed"] += 1
+            continue
+
+        Order.objects.filter(
+            order_id=order.order_id, status=OrderStatus.INITIATE
+        ).update(
+            status=vipps_status, status_checked_at=checked_at, updated_at=checked_at
+        )
+        metrics["checked"] += 1
+        if vipps_status != order.status:
+            metrics["changed"] += 1
+            if order.event_id:
+                bump_registration_version(order.event_id)
+        order.status = vipps_status
+        order.status_checked_at = checked_at
+
+    return metrics
+
+
+def reconcile_orders_from_vipps(orders):
+    """Check the orders whose local status is stale with Vipps, and
+    return True if any order is now paid.
+
+    The reconcile_order_statuses task keeps the local statuses fresh, so
+    Vipps is normally not called here. Final states are never re-queried.
+    """
+    if not orders:
+        return False
 
+    orders = list(orders)
+    poll_order_statuses([order for order in orders if is_order_status_stale(order)])
     return has_paid_order(orders)
 
 
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status
 from rest_framework.decorators import action
@@ -25,6 +26,7 @@ class OrderViewSet(BaseViewSet, ActionMixin):
     permission_classes = [BasicViewPermission]
     serializer_class = OrderListSerializer
     pagination_class = BasePagination
+    cursor_ordering = ("-created_at", "order_id")
     queryset = Order.objects.all()
 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -37,6 +39,14 @@ class OrderViewSet(BaseViewSet, ActionMixin):
         "user__user_id",
     ]
 
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .select_related("event")
+            .prefetch_related(Prefetch("user", queryset=User.objects.with_profile()))
+        )
+
     def retrieve(self, request, pk):
         try:
             order = self.get_object()
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -31,6 +32,7 @@ class VippsViewSet(BaseViewSet):
             if transaction_info:
                 new_status = transaction_info["status"]
                 order.status = new_status
+                order.status_checked_at = timezone.now()
                 order.save()
 
             return Response(status=status.HTTP_200_OK)
@@ -208,6 +208,10 @@ CACHES = (
     }
 )
 
+# Admit event registrations through a seat counter in Redis instead of locking
+# the event row. Falls back to the lock when the cache is not Redis.
+REGISTRATION_SEAT_LEDGER = os.environ.get("REGISTRATION_SEAT_LEDGER") is not None
+
 AUTH_USER_MODEL = "content.User"
 
 AUTH_PASSWORD_VALIDATORS = [
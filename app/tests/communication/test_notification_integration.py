@@ -2,6 +2,7 @@ from rest_framework import status
 
 import pytest
 
+from app.communication.factories import NotificationFactory
 from app.util.test_utils import get_api_client
 
 NOTIFICATION_URL = "/notifications/"
@@ -151,3 +152,49 @@ def test_destroy_notification_as_owner(notification):
     response = client.delete(url)
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_list_notifications_with_cursor_returns_every_notification_once(user):
+    """A user should be able to page through all their notifications with a cursor"""
+    notifications = NotificationFactory.create_batch(30, user=user)
+    client = get_api_client(user=user)
+
+    response = client.get(f"{NOTIFICATION_URL}?pagination=cursor")
+    first_page = response.json()
+    response = client.get(f"{NOTIFICATION_URL}?cursor={first_page['next']}")
+    second_page = response.json()
+
+    ids = [
+        notification["id"]
+        for notification in first_page["results"] + second_page["results"]
+    ]
+    assert len(first_page["results"]) == 25
+    assert first_page["count"] is None
+    assert first_page["previous"] is None
+    assert second_page["next"] is None
+    assert second_page["previous"] is not None
+    assert sorted(ids) == sorted(notification.id for notification in notifications)
+
+
+@pytest.mark.django_db
+def test_list_notifications_with_cursor_counts_when_asked(user):
+    """The count should only be computed when it is asked for"""
+    NotificationFactory.create_batch(3, user=user)
+    client = get_api_client(user=user)
+
+    response = client.get(f"{NOTIFICATION_URL}?pagination=cursor&count=true")
+
+    assert response.json()["count"] == 3
+
+
+@pytest.mark.django_db
+def test_list_notifications_without_cursor_uses_page_numbers(user):
+    """Clients which have not opted in should still get page numbers"""
+    NotificationFactory.create_batch(30, user=user)
+    client = get_api_client(user=user)
+
+    response = client.get(NOTIFICATION_URL)
+
+    assert response.json()["count"] == 30
+    assert response.json()["next"] == 2
@@ -1,5 +1,7 @@
 from datetime import timedelta
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 
@@ -10,10 +12,13 @@ from app.common.enums import NativeGroupType as GroupType
 from app.common.enums import NativeMembershipType as MembershipType
 from app.content.factories import EventFactory, RegistrationFactory, UserFactory
 from app.content.models import Category, Event
+from app.emoji.factories.reaction_factory import EventReactionFactory
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.forms.tests.form_factories import EventFormFactory
 from app.group.factories import GroupFactory
 from app.group.models import Group
+from app.payment.enums import OrderStatus
+from app.payment.factories import OrderFactory, PaidEventFactory
 from app.tests.conftest import _add_user_to_group
 from app.util import now
 from app.util.test_utils import (
@@ -274,6 +279,32 @@ def test_list_expired_events_as_anonymous_user(default_client, event):
     assert response.json().get("count") == 1
 
 
+@pytest.mark.django_db
+def test_list_expired_events_with_cursor_as_anonymous_user(default_client):
+    """
+    Expired events should be paged through with a cursor, most recent first.
+    """
+
+    events = [
+        EventFactory(
+            start_date=now() - timedelta(days=days + 1),
+            end_date=now() - timedelta(days=days),
+        )
+        for days in range(1, 4)
+    ]
+
+    response = default_client.get(
+        f"{API_EVENTS_BASE_URL}?expired=true&pagination=cursor"
+    )
+
+    assert response.status_code == 200
+    assert response.json()["count"] is None
+    assert response.json()["next"] is None
+    assert [event["id"] for event in response.json()["results"]] == [
+        event.id for event in events
+    ]
+
+
 @pytest.mark.django_db
 def test_list_expired_activities_as_anonymous_user(default_client, event):
     """
@@ -1100,3 +1131,237 @@ def test_prioritized_users_always_ahead_of_non_prioritized(
     assert all(
         p_num < min(non_prioritized_wait_numbers) for p_num in prioritized_wait_numbers
     ), "Prioritized users do not all precede non-prioritized users in the wait queue"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("group_name", [AdminGroup.HS, AdminGroup.NOK])
+def test_update_event_checks_access_without_querying_memberships(user, group_name):
+    """
+    The memberships of the user are loaded once per token, so the repeated access
+    checks of an update should not query the memberships.
+    """
+    client = get_api_client(user=user, group_name=group_name)
+    organizer = Group.objects.get(name=group_name)
+    event = EventFactory(organizer=organizer)
+    url = get_events_url_detail(event)
+    data = get_event_data(organizer=organizer.slug, limit=event.limit)
+    client.put(url, data)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.put(url, data)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not [
+        query
+        for query in context.captured_queries
+        if "group_membership" in query["sql"]
+    ]
+
+
+def _get_event_statistics_url(event):
+    return f"{get_events_url_detail(event)}statistics/"
+
+
+def _add_participant(event, study=None, studyyear=None, allergy="", **kwargs):
+    user = UserFactory(allergy=allergy)
+    if study:
+        add_user_to_group_with_name(user, study, GroupType.STUDY)
+    if studyyear:
+        add_user_to_group_with_name(user, studyyear, GroupType.STUDYYEAR)
+    return RegistrationFactory(event=event, user=user, **kwargs)
+
+
+@pytest.mark.django_db
+def test_statistics_counts_the_participants(admin_user):
+    """The statistics should only count the participants, not the waiting list."""
+    event = EventFactory(limit=3)
+    _add_participant(
+        event,
+        study="Dataingeniør",
+        studyyear="2023",
+        allergy="Nøtter",
+        has_attended=True,
+        allow_photo=False,
+    )
+    _add_participant(event, study="Dataingeniør", studyyear="2022")
+    _add_participant(event)
+    _add_participant(event, study="Dataingeniør", studyyear="2022", allergy="Gluten")
+
+    client = get_api_client(user=admin_user)
+    response = client.get(_get_event_statistics_url(event))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["list_count"] == 3
+    assert response.data["waiting_list_count"] == 1
+    assert response.data["has_attended_count"] == 1
+    assert response.data["has_allergy_count"] == 1
+    assert response.data["allow_photo_count"] == 1
+    assert response.data["has_not_paid_count"] == 0
+    assert response.data["suspicious_payment_count"] == 0
+    assert response.data["studies"] == [{"study": "Dataingeniør", "amount": 2}]
+    assert response.data["studyyears"] == [
+        {"studyyear": "2022", "amount": 1},
+        {"studyyear": "2023", "amount": 1},
+    ]
+
+
+@pytest.mark.django_db
+def test_statistics_counts_the_participants_who_have_not_paid(admin_user):
+    event = EventFactory(limit=3)
+    PaidEventFactory(event=event)
+    paid_registration = _add_participant(event)
+    OrderFactory(event=event, user=paid_registration.user, status=OrderStatus.SALE)
+    _add_participant(event)
+    _add_participant(event)
+
+    client = get_api_client(user=admin_user)
+    response = client.get(_get_event_statistics_url(event))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["has_not_paid_count"] == 2
+    assert response.data["suspicious_payment_count"] == 2
+
+
+@pytest.mark.django_db
+def test_statistics_are_cached_until_the_registrations_change(
+    admin_user, django_capture_on_commit_callbacks
+):
+    event = EventFactory(limit=10)
+    _add_participant(event, study="Dataingeniør")
+
+    client = get_api_client(user=admin_user)
+    url = _get_event_statistics_url(event)
+    client.get(url)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+
+    assert response.data["studies"] == [{"study": "Dataingeniør", "amount": 1}]
+    assert not [
+        query
+        for query in context.captured_queries
+        if "content_registration" in query["sql"]
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _add_participant(event, study="Dataingeniør")
+    response = client.get(url)
+
+    assert response.data["list_count"] == 2
+    assert response.data["studies"] == [{"study": "Dataingeniør", "amount": 2}]
+
+
+@pytest.mark.django_db
+def test_retrieve_event_returns_not_modified_for_a_matching_etag(default_client, event):
+    url = get_events_url_detail(event)
+    response = default_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"]
+    assert response["Last-Modified"]
+
+    response = default_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_retrieve_event_is_not_cached_after_a_registration(
+    default_client, event, django_capture_on_commit_callbacks
+):
+    url = get_events_url_detail(event)
+    etag = default_client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        RegistrationFactory(event=event)
+    response = default_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["list_count"] == 1
+
+
+@pytest.mark.django_db
+def test_retrieve_event_is_not_cached_after_a_reaction(
+    default_client, event, django_capture_on_commit_callbacks
+):
+    url = get_events_url_detail(event)
+    default_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        EventReactionFactory(content_object=event)
+    response = default_client.get(url)
+
+    assert len(response.data["reactions"]) == 1
+
+
+@pytest.mark.django_db
+def test_retrieve_event_keeps_the_permissions_of_each_user(member, event):
+    """The cached event should still show each user their own permissions."""
+    admin_client = get_api_client(user=UserFactory(), group_name=AdminGroup.INDEX)
+    event.organizer = Group.objects.get(name=AdminGroup.INDEX)
+    event.save()
+    url = get_events_url_detail(event)
+
+    admin_response = admin_client.get(url)
+    member_response = get_api_client(user=member).get(
+        url, HTTP_IF_NONE_MATCH=admin_response["ETag"]
+    )
+
+    assert admin_response.data["permissions"]["write"]
+    assert admin_response.data["organizer"]["viewer_is_member"]
+    assert member_response.status_code == status.HTTP_200_OK
+    assert not member_response.data["permissions"]["write"]
+    assert not member_response.data["organizer"]["viewer_is_member"]
+
+
+@pytest.mark.django_db
+def test_list_events_is_not_cached_after_an_event_changes(
+    default_client, event, django_capture_on_commit_callbacks
+):
+    response = default_client.get(API_EVENTS_BASE_URL)
+    response = default_client.get(
+        API_EVENTS_BASE_URL, HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    event.title = "Nytt navn"
+    with django_capture_on_commit_callbacks(execute=True):
+        event.save()
+    response = default_client.get(
+        API_EVENTS_BASE_URL, HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["title"] == "Nytt navn"
+
+
+@pytest.mark.django_db
+def test_list_favorite_events_shows_each_user_their_own_favorites(event):
+    first_user, second_user = UserFactory.create_batch(2)
+    event.favorite_users.add(first_user)
+    url = f"{API_EVENTS_BASE_URL}?user_favorite=true"
+
+    first_response = get_api_client(user=first_user).get(url)
+    second_client = get_api_client(user=second_user)
+    second_response = second_client.get(url)
+    event.favorite_users.add(second_user)
+    second_response_after_favorite = second_client.get(url)
+
+    assert first_response.data["count"] == 1
+    assert second_response.data["count"] == 0
+    assert second_response_after_favorite.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_retrieve_event_is_not_cached_after_a_survey_is_added(
+    default_client, event, django_capture_on_commit_callbacks
+):
+    url = get_events_url_detail(event)
+    default_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        survey = EventFormFactory(event=event, type=EventFormType.SURVEY)
+    response = default_client.get(url)
+
+    assert response.data["survey"] == survey.id
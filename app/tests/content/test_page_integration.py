@@ -194,3 +194,22 @@ def test_create_as_group_user_fails_when_no_root_exists(admin_user):
     response = client.post(url, data=data)
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_tree_uses_a_fixed_number_of_queries(
+    default_client, parent_page, django_assert_num_queries
+):
+    """The whole tree should be loaded at once, instead of the children of each page"""
+    pages = PageFactory.create_batch(3, parent=parent_page)
+    for page in pages:
+        PageFactory.create_batch(2, parent=page)
+
+    with django_assert_num_queries(2):
+        response = default_client.get(f"{PAGE_URL}tree/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [page["slug"] for page in response.json()["children"]] == [
+        page.slug for page in pages
+    ]
+    assert all(len(page["children"]) == 2 for page in response.json()["children"])
@@ -0,0 +1,89 @@
+import json
+
+from django.core.cache import cache
+from rest_framework import status
+
+import pytest
+
+from app.content.factories import NewsFactory
+from app.content.models import News
+
+pytestmark = pytest.mark.django_db
+
+EXPORT_URL = "/migration/photon-table-export/"
+STREAM_URL = "/migration/photon-table-stream/"
+
+
+@pytest.fixture()
+def superuser(admin_user):
+    admin_user.is_superuser = True
+    admin_user.save()
+    return admin_user
+
+
+@pytest.fixture()
+def client(api_client, superuser):
+    cache.clear()
+    return api_client(user=superuser)
+
+
+def _read_stream(response):
+    return [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).decode().splitlines()
+    ]
+
+
+def test_export_pages_through_a_table_after_the_last_primary_key(client):
+    NewsFactory.create_batch(5)
+    ids = list(News.objects.order_by("id").values_list("id", flat=True))
+
+    first_page = client.get(EXPORT_URL, {"table": "content_news", "limit": 3})
+    second_page = client.get(
+        EXPORT_URL,
+        {
+            "table": "content_news",
+            "limit": 3,
+            "after": json.dumps(first_page.data["next"]),
+        },
+    )
+    id_index = first_page.data["columns"].index("id")
+
+    assert first_page.data["next"] == [ids[2]]
+    assert [row[id_index] for row in first_page.data["rows"]] == ids[:3]
+    assert [row[id_index] for row in second_page.data["rows"]] == ids[3:]
+    assert second_page.data["next"] is None
+    assert second_page.data["count"] == 5
+
+
+def test_export_with_an_invalid_after_is_a_bad_request(client):
+    response = client.get(EXPORT_URL, {"table": "content_news", "after": "[1, 2]"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_stream_returns_the_columns_and_every_row_as_ndjson(client):
+    NewsFactory.create_batch(3)
+
+    response = client.get(STREAM_URL, {"table": "content_news"})
+    header, *rows = _read_stream(response)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert header["table"] == "content_news"
+    assert len(rows) == News.objects.count()
+    assert all(len(row) == len(header["columns"]) for row in rows)
+
+
+def test_stream_leaves_out_excluded_columns(client):
+    response = client.get(STREAM_URL, {"table": "content_user"})
+    header, *_rows = _read_stream(response)
+
+    assert "user_id" in header["columns"]
+    assert "password" not in header["columns"]
+
+
+def test_stream_requires_a_superuser(api_client, admin_user):
+    response = api_client(user=admin_user).get(STREAM_URL, {"table": "content_user"})
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
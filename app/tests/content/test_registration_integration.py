@@ -1,5 +1,8 @@
 from datetime import timedelta
+from unittest.mock import patch
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 import pytest
@@ -8,11 +11,21 @@ from app.common.enums import AdminGroup, Groups
 from app.common.enums import NativeGroupType as GroupType
 from app.common.enums import NativeMembershipType as MembershipType
 from app.common.enums import NativeUserStudy as StudyType
-from app.content.factories import EventFactory, RegistrationFactory, UserFactory
+from app.content.factories import (
+    EventFactory,
+    RegistrationFactory,
+    StrikeFactory,
+    UserFactory,
+)
 from app.content.factories.priority_pool_factory import PriorityPoolFactory
 from app.content.models.registration import Registration
+from app.content.serializers import RegistrationSerializer
 from app.forms.enums import NativeEventFormType as EventFormType
-from app.forms.tests.form_factories import EventFormFactory, SubmissionFactory
+from app.forms.tests.form_factories import (
+    AnswerFactory,
+    EventFormFactory,
+    SubmissionFactory,
+)
 from app.group.factories import GroupFactory
 from app.payment.enums import OrderStatus
 from app.payment.factories import OrderFactory
@@ -1313,13 +1326,9 @@ def test_filter_participants_paid_event(
 
 
 @pytest.mark.django_db
-def test_filter_has_suspicious_payment(new_admin_user, event, paid_event, monkeypatch):
+def test_filter_has_suspicious_payment(new_admin_user, event, paid_event):
     """has_suspicious_payment surfaces registrations that are double-paid or
     that have no usable Vipps payment link, and excludes normal cases."""
-    monkeypatch.setattr(
-        "app.content.serializers.registration.get_payment_order_status",
-        lambda order_id: OrderStatus.INITIATE,
-    )
     paid_event.event = event
     paid_event.save()
 
@@ -1367,3 +1376,130 @@ def test_filter_has_suspicious_payment(new_admin_user, event, paid_event, monkey
         ).values_list("registration_id", flat=True)
     )
     assert clean_ids == expected_clean
+
+
+@pytest.mark.django_db
+def test_create_with_seat_ledger_falls_back_to_event_lock(member, event, settings):
+    """A registration should be created through the event lock when the cache is not Redis."""
+    settings.REGISTRATION_SEAT_LEDGER = True
+    client = get_api_client(user=member)
+
+    response = client.post(_get_registration_url(event=event))
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert not response.data["is_on_wait"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("seat_reserved", [True, False])
+def test_create_with_seat_ledger_uses_reserved_seat(
+    member, event, settings, monkeypatch, seat_reserved
+):
+    """The seat ledger should decide if a new registration is put on the waiting list."""
+    settings.REGISTRATION_SEAT_LEDGER = True
+    monkeypatch.setattr(
+        "app.content.util.seat_ledger.SeatLedger.reserve",
+        lambda ledger, user_id: seat_reserved,
+    )
+    event.limit = 10
+    event.save()
+    client = get_api_client(user=member)
+
+    response = client.post(_get_registration_url(event=event))
+    event.refresh_from_db()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["is_on_wait"] is not seat_reserved
+    assert event.list_count == int(seat_reserved)
+    assert event.waiting_list_count == int(not seat_reserved)
+
+
+@pytest.mark.django_db
+def test_list_registrations_for_paid_event_does_not_call_vipps(
+    new_admin_user, event, paid_event
+):
+    """The registration list should show the local order status, which is kept
+    up to date by the Vipps callback and the order status reconciliation."""
+    paid_event.event = event
+    paid_event.save()
+
+    for _ in range(3):
+        registration = RegistrationFactory(event=event)
+        OrderFactory(event=event, user=registration.user, status=OrderStatus.INITIATE)
+
+    client = get_api_client(user=new_admin_user)
+    with patch(
+        "app.payment.util.order_utils.get_payment_order_status"
+    ) as mock_vipps_status:
+        response = client.get(_get_registration_url(paid_event))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any(
+        registration["has_paid_order"] for registration in response.data["results"]
+    )
+    mock_vipps_status.assert_not_called()
+
+
+def _add_registrations_with_details(event, survey, evaluation, count):
+    """Adds registrations with everything the registration list shows for each row"""
+    for _ in range(count):
+        user = UserFactory()
+        AnswerFactory(
+            submission=SubmissionFactory(form=survey, user=user), field__form=survey
+        )
+        RegistrationFactory(event=event, user=user, has_attended=True)
+        add_user_to_group_with_name(user, "Dataingeniør", GroupType.STUDY)
+        add_user_to_group_with_name(user, "2023", GroupType.STUDYYEAR)
+        StrikeFactory(user=user, strike_size=1)
+        OrderFactory(event=event, user=user, status=OrderStatus.SALE)
+        SubmissionFactory(form=evaluation, user=user)
+
+
+@pytest.mark.django_db
+def test_list_registrations_uses_a_fixed_number_of_queries(
+    new_admin_user, django_assert_num_queries
+):
+    """Listing registrations should cost the same number of queries for any page size."""
+    event = EventFactory(limit=1)
+    survey = EventFormFactory(event=event, type=EventFormType.SURVEY)
+    evaluation = EventFormFactory(event=event, type=EventFormType.EVALUATION)
+    _add_registrations_with_details(event, survey, evaluation, 2)
+
+    client = get_api_client(user=new_admin_user)
+    url = _get_registration_url(event)
+    # Authenticates and caches the user before the queries are counted
+    client.get(url)
+    with CaptureQueriesContext(connection) as few_registrations:
+        client.get(url)
+
+    _add_registrations_with_details(event, survey, evaluation, 10)
+
+    with django_assert_num_queries(len(few_registrations)):
+        response = client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 12
+
+
+@pytest.mark.django_db
+def test_list_registrations_matches_the_registration_details(new_admin_user):
+    """The annotated registration list should show the same data as each registration."""
+    event = EventFactory(limit=2)
+    survey = EventFormFactory(event=event, type=EventFormType.SURVEY)
+    evaluation = EventFormFactory(event=event, type=EventFormType.EVALUATION)
+    _add_registrations_with_details(event, survey, evaluation, 3)
+    user_without_details = UserFactory()
+    SubmissionFactory(form=survey, user=user_without_details)
+    RegistrationFactory(event=event, user=user_without_details, has_attended=True)
+
+    client = get_api_client(user=new_admin_user)
+    response = client.get(_get_registration_url(event))
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.data["results"]
+    assert len(results) == 4
+    for result in results:
+        registration = Registration.objects.get(
+            registration_id=result["registration_id"]
+        )
+        assert result == RegistrationSerializer(registration).data
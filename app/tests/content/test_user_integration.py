@@ -1,5 +1,7 @@
 from datetime import timedelta
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.utils.text import slugify
 from rest_framework import status
@@ -303,6 +305,42 @@ def test_list_as_member_of_admin_group(admin_user, api_client):
     assert response.status_code == status.HTTP_200_OK
 
 
+def _add_users_with_profile(count):
+    users = UserFactory.create_batch(count)
+    for user in users:
+        add_user_to_group_with_name(user, "Dataingeniør", GroupType.STUDY)
+        add_user_to_group_with_name(user, "2023", GroupType.STUDYYEAR)
+        StrikeFactory(user=user, strike_size=1)
+    return users
+
+
+def test_list_as_member_of_admin_group_uses_a_fixed_number_of_queries(
+    admin_user, api_client, django_assert_num_queries
+):
+    """Listing users should not query the study, studyyear or strikes of each user."""
+    client = api_client(user=admin_user)
+    # Authenticates and caches the user before the queries are counted
+    client.get(API_USER_BASE_URL)
+
+    _add_users_with_profile(2)
+    with CaptureQueriesContext(connection) as few_users:
+        client.get(API_USER_BASE_URL)
+
+    user_ids = {user.user_id for user in _add_users_with_profile(10)}
+    with django_assert_num_queries(len(few_users)):
+        response = client.get(API_USER_BASE_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    listed_users = [
+        user for user in response.data["results"] if user["user_id"] in user_ids
+    ]
+    assert len(listed_users) == 10
+    for user in listed_users:
+        assert user["study"]["group"]["type"] == GroupType.STUDY
+        assert user["studyyear"]["group"]["type"] == GroupType.STUDYYEAR
+        assert user["number_of_strikes"] == 1
+
+
 def test_update_user_as_anonymous(default_client, user):
     """An anonymous user should not be able to update a user."""
     data = _get_user_put_data()
@@ -575,3 +613,19 @@ def test_list_expired_user_events_with_no_query_params(member, api_client):
     registrations = response.json().get("results")
     for registration in registrations:
         assert not registration.get("expired")
+
+
+@pytest.mark.django_db
+def test_list_users_with_cursor_returns_users_with_the_same_name_once(
+    api_client, admin_user
+):
+    UserFactory.create_batch(30, first_name="Ola")
+    client = api_client(user=admin_user)
+
+    first_page = client.get(f"{API_USER_BASE_URL}?pagination=cursor").json()
+    second_page = client.get(f"{API_USER_BASE_URL}?cursor={first_page['next']}").json()
+    user_ids = [
+        user["user_id"] for user in first_page["results"] + second_page["results"]
+    ]
+
+    assert user_ids == sorted(User.objects.values_list("user_id", flat=True))
@@ -1,10 +1,20 @@
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 import pytest
 
 from app.common.enums import AdminGroup
+from app.forms.enums import NativeFormFieldType as FormFieldType
 from app.forms.models.forms import Field
-from app.forms.tests.form_factories import FieldFactory, FormFactory
+from app.forms.tests.form_factories import (
+    AnswerFactory,
+    FieldFactory,
+    FormFactory,
+    OptionFactory,
+    SubmissionFactory,
+)
 from app.util.test_utils import add_user_to_group_with_name, get_api_client
 
 pytestmark = pytest.mark.django_db
@@ -570,3 +580,110 @@ def test_update_form_field_ordering_reorders_fields(api_client, admin_user, form
 
     assert first_field_in_order.order == second_in_order
     assert second_field_in_order.order == first_in_order
+
+
+def _get_form_statistics_url(form):
+    return f"{_get_form_detail_url(form)}statistics/"
+
+
+def _add_answer_with_option(form, option):
+    answer = AnswerFactory(submission=SubmissionFactory(form=form), field=None)
+    answer.selected_options.add(option)
+
+
+def test_form_statistics_counts_the_answers_of_each_option(admin_user):
+    form = FormFactory(fields__type=FormFieldType.SINGLE_SELECT)
+    field = form.fields.first()
+    chosen_option = field.options.first()
+    other_option = OptionFactory(field=field)
+    for _ in range(3):
+        _add_answer_with_option(form, chosen_option)
+    SubmissionFactory(form=form)
+
+    client = get_api_client(user=admin_user)
+    response = client.get(_get_form_statistics_url(form)).json()
+    options = {option["id"]: option for option in response["statistics"][0]["options"]}
+
+    assert options[str(chosen_option.id)]["answer_amount"] == 3
+    assert options[str(chosen_option.id)]["answer_percentage"] == 75
+    assert options[str(other_option.id)]["answer_amount"] == 0
+    assert options[str(other_option.id)]["answer_percentage"] == 0
+
+
+def test_form_statistics_uses_a_fixed_number_of_queries(
+    admin_user, django_assert_num_queries
+):
+    form = FormFactory(fields__type=FormFieldType.SINGLE_SELECT)
+    _add_answer_with_option(form, form.fields.first().options.first())
+    client = get_api_client(user=admin_user)
+    client.get(_get_form_statistics_url(form))
+
+    for _ in range(5):
+        field = FieldFactory(form=form, type=FormFieldType.MULTIPLE_SELECT)
+        OptionFactory(field=field)
+        _add_answer_with_option(form, field.options.first())
+    cache.clear()
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(_get_form_statistics_url(form))
+    cache.clear()
+
+    with django_assert_num_queries(len(queries)):
+        client.get(_get_form_statistics_url(form))
+
+
+def test_form_statistics_are_updated_when_a_submission_is_added(
+    admin_user, django_capture_on_commit_callbacks
+):
+    form = FormFactory(fields__type=FormFieldType.SINGLE_SELECT)
+    option = form.fields.first().options.first()
+    client = get_api_client(user=admin_user)
+    client.get(_get_form_statistics_url(form))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _add_answer_with_option(form, option)
+    response = client.get(_get_form_statistics_url(form)).json()
+
+    assert response["statistics"][0]["options"][0]["answer_amount"] == 1
+
+
+def test_form_statistics_are_updated_when_an_option_is_renamed(
+    admin_user, django_capture_on_commit_callbacks
+):
+    form = FormFactory(fields__type=FormFieldType.SINGLE_SELECT)
+    field = form.fields.first()
+    option = field.options.first()
+    client = get_api_client(user=admin_user)
+    client.get(_get_form_statistics_url(form))
+
+    data = {
+        "resource_type": "Form",
+        "title": form.title,
+        "fields": [
+            {
+                "id": str(field.id),
+                "title": field.title,
+                "type": field.type,
+                "options": [{"id": str(option.id), "title": "Renamed"}],
+            }
+        ],
+    }
+    with django_capture_on_commit_callbacks(execute=True):
+        client.put(_get_form_detail_url(form), data)
+    response = client.get(_get_form_statistics_url(form)).json()
+
+    assert response["statistics"][0]["options"][0]["title"] == "Renamed"
+
+
+def test_form_statistics_version_is_kept_when_a_submission_is_rolled_back(
+    django_capture_on_commit_callbacks,
+):
+    form = FormFactory(fields__type=FormFieldType.SINGLE_SELECT)
+    version = form.get_statistics_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(ValueError), transaction.atomic():
+            _add_answer_with_option(form, form.fields.first().options.first())
+            raise ValueError
+
+    assert form.get_statistics_version() == version
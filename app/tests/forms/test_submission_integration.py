@@ -1,14 +1,23 @@
+import csv
+import io
+import zipfile
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 import pytest
 
 from app.common.enums import NativeMembershipType as MembershipType
 from app.content.factories import RegistrationFactory
+from app.forms.csv_writer import XLSX_CONTENT_TYPE
 from app.forms.enums import NativeEventFormType as EventFormType
 from app.forms.models import Answer, Submission
 from app.forms.tests.form_factories import (
     AnswerFactory,
     EventFormFactory,
+    FieldFactory,
     GroupFormFactory,
     SubmissionFactory,
 )
@@ -332,3 +341,152 @@ def test_create_group_form_member_can_view_submission(membership):
     response = client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
+
+
+def _get_download_submissions_url(form):
+    return f"/forms/{form.id}/submissions/download/"
+
+
+def test_download_submissions_as_csv_has_a_column_per_field_in_order(
+    api_client, admin_user
+):
+    form = GroupFormFactory()
+    first_field = form.fields.first()
+    second_field = FieldFactory(form=form, title="Second", order=first_field.order + 1)
+    submission = SubmissionFactory(form=form)
+    AnswerFactory(submission=submission, field=second_field, answer_text="Svar\nher")
+
+    client = api_client(user=admin_user)
+    response = client.get(_get_download_submissions_url(form))
+    rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert rows[0][-2:] == [first_field.title, "Second"]
+    assert rows[1][:2] == [submission.user.first_name, submission.user.last_name]
+    assert rows[1][-2:] == ["", "Svar her"]
+    assert len(rows) == 2
+
+
+def test_download_submissions_as_csv_uses_a_fixed_number_of_queries(
+    api_client, admin_user
+):
+    form = GroupFormFactory()
+    client = api_client(user=admin_user)
+
+    def download():
+        with CaptureQueriesContext(connection) as queries:
+            b"".join(client.get(_get_download_submissions_url(form)).streaming_content)
+        return len(queries)
+
+    # Warms up the lookups which are cached between requests
+    download()
+    for _ in range(2):
+        AnswerFactory(
+            submission=SubmissionFactory(form=form), field=form.fields.first()
+        )
+    query_count = download()
+
+    for _ in range(5):
+        AnswerFactory(
+            submission=SubmissionFactory(form=form), field=form.fields.first()
+        )
+
+    assert download() == query_count
+
+
+def test_download_submissions_as_xlsx(api_client, admin_user):
+    form = GroupFormFactory()
+    field = form.fields.first()
+    AnswerFactory(
+        submission=SubmissionFactory(form=form), field=field, answer_text="<Svar>"
+    )
+
+    client = api_client(user=admin_user)
+    response = client.get(f"{_get_download_submissions_url(form)}?file_type=xlsx")
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+    sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == XLSX_CONTENT_TYPE
+    assert field.title in sheet
+    assert "&lt;Svar&gt;" in sheet
+
+
+def test_create_submission_uses_a_fixed_number_of_queries(member_client):
+    group_form = GroupFormFactory(can_submit_multiple=True)
+    url = _get_submission_url(group_form)
+
+    def get_submission_data():
+        return {
+            "answers": [
+                {
+                    "field": {"id": str(field.id)},
+                    "selected_options": [{"id": str(field.options.first().id)}],
+                }
+                for field in group_form.fields.all()
+            ]
+        }
+
+    submission_data = get_submission_data()
+    member_client.post(url, submission_data)
+    with CaptureQueriesContext(connection) as queries:
+        member_client.post(url, submission_data)
+
+    for _ in range(10):
+        FieldFactory(form=group_form)
+    submission_data = get_submission_data()
+
+    with CaptureQueriesContext(connection) as more_answers_queries:
+        response = member_client.post(url, submission_data)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(more_answers_queries) == len(queries)
+    assert Answer.objects.filter(submission__form=group_form).count() == 2 + 11
+
+
+def test_create_submission_with_option_of_another_field_is_not_permitted(
+    member_client,
+):
+    group_form = GroupFormFactory()
+    other_field = FieldFactory(form=group_form)
+    url = _get_submission_url(group_form)
+    submission_data = _create_submission_data_with_selected_options(
+        group_form.fields.first(), other_field.options.first()
+    )
+
+    response = member_client.post(url, submission_data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Submission.objects.filter(form=group_form).exists()
+
+
+def test_create_submission_to_field_of_another_form_is_not_permitted(member_client):
+    group_form = GroupFormFactory()
+    other_form = GroupFormFactory()
+    url = _get_submission_url(group_form)
+
+    response = member_client.post(
+        url, _create_submission_data_with_text_answer(other_form.fields.first(), "Hei")
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Submission.objects.filter(form=group_form).exists()
+
+
+def test_create_group_form_submission_queues_email_after_commit(
+    member_client, django_capture_on_commit_callbacks
+):
+    group_form = GroupFormFactory(email_receiver_on_submit="leder@tihlde.org")
+    url = _get_submission_url(group_form)
+
+    with patch(
+        "app.forms.tasks.send_group_form_submission_email.delay"
+    ) as mock_delay, django_capture_on_commit_callbacks(execute=True):
+        response = member_client.post(
+            url, _create_submission_data(group_form.fields.first())
+        )
+        mock_delay.assert_not_called()
+
+    submission = Submission.objects.get(form=group_form)
+    assert response.status_code == status.HTTP_201_CREATED
+    mock_delay.assert_called_once_with(str(submission.id))
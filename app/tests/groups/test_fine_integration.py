@@ -1,13 +1,17 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 import pytest
 
 from app.common.enums import AdminGroup
 from app.common.enums import NativeMembershipType as MembershipType
+from app.communication.models import Notification
 from app.content.factories.user_factory import UserFactory
 from app.group.factories.fine_factory import FineFactory
 from app.group.factories.group_factory import GroupFactory
 from app.group.factories.membership_factory import MembershipFactory
+from app.group.models import Fine
 from app.util.test_utils import add_user_to_group_with_name, get_api_client
 
 GROUP_URL = "/groups/"
@@ -221,3 +225,92 @@ def test_delete_as_member(user):
     url = _get_fine_url(group, fine)
     response = client.delete(url)
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def _add_members(group, amount):
+    users = UserFactory.create_batch(amount)
+    for user in users:
+        MembershipFactory(user=user, group=group)
+    return users
+
+
+def _get_fine_data_for_users(users):
+    return {
+        "amount": 2,
+        "description": "Test",
+        "user": [user.user_id for user in users],
+    }
+
+
+@pytest.mark.django_db
+def test_create_for_group_uses_a_fixed_number_of_queries(
+    group, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    """Fining every member of a group should not run queries per member"""
+    client = get_api_client(user=UserFactory(), group_name=AdminGroup.HS)
+    url = _get_fine_url(group)
+    few_users = _add_members(group, 2)
+    # Authenticates and caches the user before the queries are counted
+    client.post(url, data=_get_fine_data_for_users(few_users))
+
+    with CaptureQueriesContext(
+        connection
+    ) as few_fines, django_capture_on_commit_callbacks(execute=True):
+        client.post(url, data=_get_fine_data_for_users(few_users))
+
+    users = _add_members(group, 10)
+    with django_assert_num_queries(len(few_fines)), django_capture_on_commit_callbacks(
+        execute=True
+    ):
+        response = client.post(url, data=_get_fine_data_for_users(users))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == 10
+    assert Fine.objects.filter(group=group, user__in=users, amount=2).count() == 10
+    assert Notification.objects.filter(user__in=users).count() == 10
+
+
+@pytest.mark.django_db
+def test_create_for_users_not_in_group_creates_no_fines(group):
+    """No fines should be created if any of the users are not members of the group"""
+    client = get_api_client(user=UserFactory(), group_name=AdminGroup.HS)
+    users = [*_add_members(group, 2), UserFactory()]
+
+    response = client.post(_get_fine_url(group), data=_get_fine_data_for_users(users))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Fine.objects.filter(group=group).exists()
+
+
+@pytest.mark.django_db
+def test_statistics_and_users_follow_batch_updates(group):
+    """The totals should be updated when fines are approved and payed in a batch"""
+    group.fines_activated = True
+    group.save()
+    client = get_api_client(user=UserFactory(), group_name=AdminGroup.HS)
+    users = _add_members(group, 2)
+    fines = [
+        FineFactory(group=group, user=users[0], amount=2),
+        FineFactory(group=group, user=users[0], amount=3),
+        FineFactory(group=group, user=users[1], amount=4),
+    ]
+
+    response = client.put(
+        f"{_get_fine_url(group)}batch-update/",
+        data={
+            "fine_ids": [fines[0].id, fines[2].id],
+            "data": {"approved": True, "payed": True},
+        },
+        format="json",
+    )
+    statistics = client.get(f"{_get_fine_url(group)}statistics/").json()
+    fines_amounts = {
+        fine_user["user"]["user_id"]: fine_user["fines_amount"]
+        for fine_user in client.get(f"{_get_fine_url(group)}users/?payed=false").json()[
+            "results"
+        ]
+    }
+
+    assert response.status_code == status.HTTP_200_OK
+    assert statistics == {"payed": 6, "approved_and_not_payed": 0, "not_approved": 3}
+    assert fines_amounts == {users[0].user_id: 3, users[1].user_id: 0}
@@ -4,8 +4,9 @@ import pytest
 
 from app.common.enums import AdminGroup
 from app.common.enums import NativeGroupType as GroupType
+from app.common.enums import NativeMembershipType as MembershipType
 from app.group.factories import GroupFactory
-from app.util.test_utils import get_api_client
+from app.util.test_utils import add_user_to_group_with_name, get_api_client
 
 GROUP_URL = "/groups/"
 
@@ -197,3 +198,26 @@ def test_create_new_group_with_invalid_group_type_as_index(group_type, index_mem
 
     print(response)
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_update_as_group_leader_checks_access_without_querying_memberships(
+    user, django_assert_max_num_queries
+):
+    """
+    The memberships of the user are loaded once per token, so checking that the
+    user leads the group should not add queries to the update.
+    """
+    group = add_user_to_group_with_name(
+        user, "Leader group", membership_type=MembershipType.LEADER
+    )
+    client = get_api_client(user=user)
+    url = _get_group_url(group)
+    data = _get_group_put_data(group=group)
+    client.put(url, data=data)
+
+    # Saving the group, the admin log and the leader and members in the response
+    with django_assert_max_num_queries(9):
+        response = client.put(url, data=data)
+
+    assert response.status_code == status.HTTP_200_OK
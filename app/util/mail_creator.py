@@ -1,5 +1,15 @@
+from functools import lru_cache
+
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.template.loader import get_template
+
+MAIL_TEMPLATE = "mail_creator.html"
+
+
+@lru_cache(maxsize=None)
+def get_mail_template():
+    """The compiled mail template, looked up once per process"""
+    return get_template(MAIL_TEMPLATE)
 
 
 class MailCreator:
@@ -47,8 +57,11 @@ class MailCreator:
         """
         Generate a string which can be sent in the email
         """
-        return render_to_string(
-            "mail_creator.html",
+        # The template is looked up on every render while debugging, so changes are picked up
+        template = (
+            get_template(MAIL_TEMPLATE) if settings.DEBUG else get_mail_template()
+        )
+        return template.render(
             context={
                 "content": self.content,
                 "title": self.title,
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from functools import wraps
 
 from django.conf import settings
+from django.core.cache import cache
 
 from pytz import timezone as pytz_timezone
 
@@ -26,12 +27,13 @@ def tomorrow():
 
 
 def datetime_format(date_time):
-    from django.template import Context, Template
+    from django.utils.formats import localize
+    from django.utils.html import conditional_escape
+    from django.utils.timezone import template_localtime
 
-    # Using Django Template to format as it formats dates with both localization and timezone automatically
-    return Template("{{ date_to_format }}").render(
-        Context(dict(date_to_format=date_time))
-    )
+    # Formats the same way as rendering "{{ date_time }}" in a Django Template, with both
+    # localization and timezone, without compiling a template on every call
+    return conditional_escape(localize(template_localtime(date_time)))
 
 
 def midday(date_time):
@@ -85,3 +87,16 @@ def chunk_list(lst, n):
     lst = list(lst)
     for i in range(0, len(lst), n):
         yield lst[i : i + n]
+
+
+def get_cache_version(key):
+    """Returns the version stored under the key, which is 0 until it is bumped"""
+    return cache.get(key, 0)
+
+
+def bump_cache_version(key):
+    """Changes the version stored under the key, so caches keyed on it are missed"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)